@@ -0,0 +1,124 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""量化基准测试：在实际语料的向量上对比各量化方式的 recall@k、单次查询延迟与常驻内存。"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from higoalutils.database.vector_store.enums import VectorQuantization
+from higoalutils.database.vector_store.quantization import approximate_scores, quantize, top_indices
+from higoalutils.database.vector_store.utils import normalize_vectors
+
+
+@dataclass
+class QuantizationResult:
+    quantization: VectorQuantization
+    rerank_factor: int
+    recall: float
+    """与 float32 精确检索相比的 recall@k"""
+    mean_ms: float
+    p95_ms: float
+    memory_bytes: int
+    """生成候选所需的常驻内存（编码，或不量化时的 float32 矩阵）"""
+
+
+def run_quantization_benchmark(
+    vectors: np.ndarray,
+    num_queries: int = 200,
+    top_k: int = 10,
+    rerank_factors: Sequence[int] = (1, 4, 10),
+    seed: int = 0,
+) -> List[QuantizationResult]:
+    """从 vectors 中随机留出 num_queries 条作为查询，其余作为语料，逐条查询测量各量化方式"""
+    vectors = normalize_vectors(vectors)
+    rng = np.random.default_rng(seed)
+    num_queries = min(num_queries, len(vectors) // 2)
+    is_query = np.zeros(len(vectors), dtype=bool)
+    is_query[rng.choice(len(vectors), num_queries, replace=False)] = True
+    queries, corpus = vectors[is_query], vectors[~is_query]
+    truth, _ = top_indices(queries @ corpus.T, top_k)
+
+    results = [_measure(VectorQuantization.NONE, 1, corpus, queries, truth, top_k)]
+    for quantization in (VectorQuantization.INT8, VectorQuantization.BINARY):
+        encoded = quantize(corpus, quantization)
+        for rerank_factor in rerank_factors:
+            results.append(_measure(quantization, rerank_factor, corpus, queries, truth, top_k, encoded))
+    return results
+
+
+def _measure(
+    quantization: VectorQuantization,
+    rerank_factor: int,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    top_k: int,
+    encoded: dict | None = None,
+) -> QuantizationResult:
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        t1 = time.perf_counter()
+        if encoded is None:
+            top, _ = top_indices(query[None] @ corpus.T, top_k)
+            found = top[0]
+        else:
+            approx = approximate_scores(quantization, encoded["codes"], query[None], corpus.shape[1], encoded.get("scale"))
+            pool, _ = top_indices(approx, top_k * rerank_factor)
+            rerank, _ = top_indices((corpus[pool[0]] @ query)[None], top_k)
+            found = pool[0][rerank[0]]
+        latencies.append(time.perf_counter() - t1)
+        hits += len(np.intersect1d(found, expected))
+
+    memory_bytes = corpus.nbytes if encoded is None else sum(array.nbytes for array in encoded.values())
+    return QuantizationResult(
+        quantization=quantization,
+        rerank_factor=rerank_factor,
+        recall=hits / truth.size,
+        mean_ms=float(np.mean(latencies)) * 1000,
+        p95_ms=float(np.percentile(latencies, 95)) * 1000,
+        memory_bytes=memory_bytes,
+    )
+
+
+def print_quantization_benchmark(
+    vectors: np.ndarray,
+    num_queries: int = 200,
+    top_k: int = 10,
+    rerank_factors: Sequence[int] = (1, 4, 10),
+) -> None:
+    console = Console()
+    console.print(f"Benchmarking {len(vectors)} vectors of {vectors.shape[1]} dims, {num_queries} held-out queries, top_k={top_k}")
+    table = Table(title="Quantization: recall vs latency vs memory")
+    for name in ("quantization", "rerank factor", f"recall@{top_k}", "mean (ms)", "p95 (ms)", "memory (MB)", "bytes / vector"):
+        table.add_column(name, justify="left" if name == "quantization" else "right")
+    results = run_quantization_benchmark(vectors, num_queries, top_k, rerank_factors)
+    num_corpus = len(vectors) - min(num_queries, len(vectors) // 2)
+    for result in results:
+        table.add_row(
+            result.quantization.value,
+            str(result.rerank_factor) if result.quantization != VectorQuantization.NONE else "-",
+            f"{result.recall:.3f}",
+            f"{result.mean_ms:.2f}",
+            f"{result.p95_ms:.2f}",
+            f"{result.memory_bytes / 2**20:.1f}",
+            f"{result.memory_bytes / max(1, num_corpus):.0f}",
+        )
+    console.print(table)
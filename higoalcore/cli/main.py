@@ -17,15 +17,10 @@ import asyncio
 from typing import Annotated
 import typer
 
-from higoalcore.index.workflow.extract_docs import extract_docs
-from higoalcore.config.load_config import get_core_config
-from higoalutils.config.load_config import get_config
-from higoalutils.callbacks.record_query_callbacks import RecordQueryCallbacks
 from higoalcore.config.enums.query_enums import SearchMethod
-from higoalcore.query.query import basic_search
-from higoalutils.language_model.tokenizer.get_tokenizer import get_tokenizer
-from higoalutils.logger.factory import LoggerFactory
-from higoalutils.logger.types import LoggerType
+
+# 各命令依赖的模块（嵌入模型、向量库、LLM客户端等）导入开销较大，在命令函数内按需导入，
+# 使 --help 与其它命令不为用不到的依赖付出启动时间
 
 
 app = typer.Typer(
@@ -33,13 +28,43 @@ app = typer.Typer(
     no_args_is_help=True,
 )
 
+
+def _profile_startup(value: bool):
+    if value:
+        from higoalcore.cli.profile_startup import print_startup_profile
+        print_startup_profile()
+        raise typer.Exit()
+
+
+@app.callback()
+def _main(
+    profile_startup: Annotated[
+        bool, typer.Option(
+            "--profile-startup",
+            help="Report the import time of each module loaded by the CLI commands and exit.",
+            callback=_profile_startup,
+            is_eager=True,
+        )
+    ] = False,
+):
+    """HiGoalRAG: A graph-based retrieval-augmented generation (RAG) system."""
+
 @app.command("index")
 def _index_cli(
     logger: Annotated[
         bool, typer.Option(help="The progress logger to use.")
-    ] =  True
+    ] =  True,
+    incremental: Annotated[
+        bool, typer.Option(help="Only re-index new, changed and removed input files.")
+    ] = False
 ):
     """Build a knowledge graph index."""
+    from higoalcore.config.load_config import get_core_config
+    from higoalcore.index.workflow.extract_docs import extract_docs
+    from higoalutils.config.load_config import get_config
+    from higoalutils.logger.factory import LoggerFactory
+    from higoalutils.logger.types import LoggerType
+
     core_cfg = get_core_config()
     sys_config = get_config()
     progress_logger = LoggerFactory.create_logger(LoggerType.RICH) if logger else None
@@ -47,10 +72,54 @@ def _index_cli(
         extract_docs(
             sys_config=sys_config,
             core_config=core_cfg,
-            progress_reporter=progress_logger
+            progress_reporter=progress_logger,
+            incremental=incremental
         )
     )
 
+@app.command("optimize")
+def _optimize_cli(
+    reindex: Annotated[
+        bool, typer.Option(help="Rebuild the vector index instead of updating it incrementally.")
+    ] = False
+):
+    """Compact the vector tables and update their vector index."""
+    from higoalcore.config.enums.index_enums import VectorTable
+    from higoalutils.database.vector_store.factory import VectorStoreFactory
+
+    store = VectorStoreFactory().get_store()
+    for table in VectorTable:
+        store.optimize(store.get_full_table_name(table.value), reindex=reindex)
+
+@app.command("benchmark-quantization")
+def _benchmark_quantization_cli(
+    queries: Annotated[
+        int, typer.Option(help="Number of chunk vectors held out as queries.")
+    ] = 200,
+    top_k: Annotated[
+        int, typer.Option(help="The k of recall@k.")
+    ] = 10,
+    rerank_factor: Annotated[
+        list[int], typer.Option(help="Re-rank top_k * rerank_factor candidates with float32 vectors (repeatable).")
+    ] = [1, 4, 10],
+    max_rows: Annotated[
+        int, typer.Option(help="Read at most this many chunk vectors from the vector store.")
+    ] = 200_000,
+):
+    """Report recall@k, latency and memory of int8 / binary quantization on the indexed chunks."""
+    from higoalcore.cli.benchmark_quantization import print_quantization_benchmark
+    from higoalcore.config.enums.index_enums import VectorTable
+    from higoalutils.database.vector_store.factory import VectorStoreFactory
+
+    store = VectorStoreFactory().get_store()
+    try:
+        vectors = store.sample_vectors(store.get_full_table_name(VectorTable.CHUNKS.value), limit=max_rows)
+    except NotImplementedError as e:
+        raise typer.BadParameter(f"The configured vector store cannot read vectors back for benchmarking: {e}") from e
+    if len(vectors) < 2:
+        raise typer.BadParameter("The chunk vector table is empty, run the index command first.")
+    print_quantization_benchmark(vectors, num_queries=queries, top_k=top_k, rerank_factors=rerank_factor)
+
 @app.command("query")
 def _query_cli(
     query: Annotated[
@@ -64,6 +133,10 @@ def _query_cli(
     ] = "deepseek-chat"
 ):
     """A knowledge graph RAG 检索"""
+    from higoalcore.query.query import basic_search
+    from higoalutils.callbacks.record_query_callbacks import RecordQueryCallbacks
+    from higoalutils.config.load_config import get_config
+    from higoalutils.language_model.tokenizer.get_tokenizer import get_tokenizer
 
     sys_cfg = get_config()
     tokenizer = get_tokenizer(sys_cfg.language_model_config.default_encoding_model)
@@ -0,0 +1,93 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""启动耗时分析：在子进程中以 -X importtime 导入各命令的入口模块，按模块统计导入耗时。"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from rich.console import Console
+from rich.table import Table
+
+# 各CLI命令实际执行时会导入的入口模块
+DEFAULT_MODULES = (
+    "higoalcore.cli.main",
+    "higoalcore.index.workflow.extract_docs",
+    "higoalcore.query.query",
+)
+
+
+@dataclass
+class ImportCost:
+    module: str
+    self_us: int
+    """模块自身的导入耗时（微秒）"""
+    cumulative_us: int
+    """包含其依赖模块在内的导入耗时（微秒）"""
+    depth: int
+
+
+def measure_import_costs(modules: Sequence[str] = DEFAULT_MODULES) -> tuple[List[ImportCost], float]:
+    """在全新的解释器中导入 modules，返回各模块的导入耗时及总耗时（秒）"""
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    costs = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        # 导入失败时仍然报告失败之前的耗时
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        Console(stderr=True).print("\n".join(errors[-5:]), style="red")
+    total = sum(cost.cumulative_us for cost in costs if cost.depth == 0) / 1e6
+    return costs, total
+
+
+def parse_importtime(output: str) -> List[ImportCost]:
+    """解析 `python -X importtime` 的输出（格式：import time: self | cumulative | package）"""
+    costs = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        costs.append(ImportCost(
+            module=stripped,
+            self_us=int(parts[0]),
+            cumulative_us=int(parts[1]),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return costs
+
+
+def print_startup_profile(modules: Sequence[str] = DEFAULT_MODULES, top: int = 25) -> None:
+    """打印导入耗时最高的模块（按累计耗时与自身耗时各列一张表）"""
+    costs, total = measure_import_costs(modules)
+    console = Console()
+    console.print(f"Total import time of {', '.join(modules)}: [bold]{total:.2f}s[/bold]")
+
+    for title, key in (("cumulative", "cumulative_us"), ("self", "self_us")):
+        table = Table(title=f"Top {top} modules by {title} import time")
+        table.add_column("module")
+        table.add_column("self (ms)", justify="right")
+        table.add_column("cumulative (ms)", justify="right")
+        for cost in sorted(costs, key=lambda c: getattr(c, key), reverse=True)[:top]:
+            table.add_row(cost.module, f"{cost.self_us / 1000:.1f}", f"{cost.cumulative_us / 1000:.1f}")
+        console.print(table)
@@ -13,8 +13,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass
-from pydantic import Field
-from typing import List
+from typing import Tuple
 
 from higoalcore.config.enums.index_enums import ChunkStrategyType
 from higoalutils.config.enums.model_enums import TokenizerType
@@ -28,5 +27,6 @@ class ChunkingConfigDefaults:
     strategy = ChunkStrategyType.TOKENS
     prepend_metadata: bool = False
     chunk_size_includes_metadata: bool = False
-    group_by_columns: List[str] = Field(default_factory=lambda: ["id"])
-    default_encoding_model: TokenizerType = TokenizerType.DeepSeekTokenizer
\ No newline at end of file
+    group_by_columns: Tuple[str, ...] = ("id",)
+    default_encoding_model: TokenizerType = TokenizerType.DeepSeekTokenizer
+    num_workers: int = 1
\ No newline at end of file
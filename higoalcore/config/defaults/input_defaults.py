@@ -29,6 +29,7 @@ class InputConfigDefaults:
     csv_file_pattern: str = InputFileType.csv_file_pattern
     text_column: str = "text"
     title_column: Optional[str]= None
+    manifest_file: str = "index_manifest.json"
 
     
     
@@ -0,0 +1,23 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from higoalcore.config.enums.query_enums import RetrievalMode
+
+
+class RetrievalDefaults:
+    mode: RetrievalMode = RetrievalMode.VECTOR
+    bm25_index_dir: str = "appdata/database/bm25"
+    candidate_factor: int = 3
+    rrf_k: int = 60
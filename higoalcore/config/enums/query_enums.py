@@ -23,6 +23,18 @@ class SearchMethod(str, Enum):
         """Return the string representation of the enum value."""
         return self.value
 
+class RetrievalMode(str, Enum):
+    """文本块的检索方式"""
+
+    VECTOR = "vector"
+    """仅向量检索"""
+    HYBRID = "hybrid"
+    """向量检索 + BM25全文检索，按RRF融合"""
+
+    def __str__(self):
+        """Return the string representation of the enum value."""
+        return self.value
+
 class PromptFileType(str, Enum):
     """Prompt存储的文件格式枚举类"""
 
@@ -36,9 +36,13 @@ class ChunkingConfig(BaseModel):
     )
     group_by_columns: List[str] = Field(
         description="The chunk by columns to use.",
-        default=ChunkingConfigDefaults.group_by_columns,
+        default_factory=lambda: list(ChunkingConfigDefaults.group_by_columns),
     )
     default_encoding_model: TokenizerType = Field(
         description="The default encoding model to use.",
         default=ChunkingConfigDefaults.default_encoding_model,
-    )
\ No newline at end of file
+    )
+    num_workers: int = Field(
+        description="Number of worker processes used to chunk input files in parallel (1 = in-process, 0 = one per CPU core).",
+        default=ChunkingConfigDefaults.num_workers,
+    )
@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from higoalcore.config.models.input_config import InputConfig
 from higoalcore.config.models.chunking_config import ChunkingConfig
+from higoalcore.config.models.pipeline_config import IndexPipelineConfig
+from higoalcore.config.models.retrieval_config import RetrievalConfig
 
 
 class CoreConfig(BaseModel):
     input_config: InputConfig
     chunk_config: ChunkingConfig
+    pipeline_config: IndexPipelineConfig = Field(default_factory=IndexPipelineConfig)
+    retrieval_config: RetrievalConfig = Field(default_factory=RetrievalConfig)
     
\ No newline at end of file
@@ -60,6 +60,11 @@ class InputConfig(BaseModel):
         description="CSV文件中的标题列列名"
     )
 
+    manifest_file: str = Field(
+        default=InputConfigDefaults.manifest_file,
+        description="增量索引清单文件，相对于root_dir"
+    )
+
     @property
     def text_pattern(self) -> Pattern[str]:
         return re.compile(self.text_file_pattern)
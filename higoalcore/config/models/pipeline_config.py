@@ -0,0 +1,32 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from higoalcore.config.defaults.pipeline_defaults import IndexPipelineDefaults
+
+
+class IndexPipelineConfig(BaseModel):
+    """流式索引流水线配置"""
+    model_config = ConfigDict(extra="ignore")
+
+    batch_size: int = Field(
+        default=IndexPipelineDefaults.batch_size,
+        description="每个流水线批次的chunk数（按文档边界切分，单个文档不会跨批次）"
+    )
+    queue_size: int = Field(
+        default=IndexPipelineDefaults.queue_size,
+        description="相邻阶段之间最多缓冲的批次数，队列满时上游等待（背压）"
+    )
@@ -0,0 +1,41 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from higoalcore.config.defaults.retrieval_defaults import RetrievalDefaults
+from higoalcore.config.enums.query_enums import RetrievalMode
+
+
+class RetrievalConfig(BaseModel):
+    """文本块检索配置"""
+    model_config = ConfigDict(extra="ignore")
+
+    mode: RetrievalMode = Field(
+        default=RetrievalDefaults.mode,
+        description="检索方式：vector 仅向量检索；hybrid 向量检索与BM25全文检索并发执行后按RRF融合"
+    )
+    bm25_index_dir: str = Field(
+        default=RetrievalDefaults.bm25_index_dir,
+        description="BM25全文索引目录，每张向量表一个sqlite文件（hybrid 模式下索引时写入）"
+    )
+    candidate_factor: int = Field(
+        default=RetrievalDefaults.candidate_factor,
+        description="混合检索时每一路召回 top_k * candidate_factor 个候选参与融合"
+    )
+    rrf_k: int = Field(
+        default=RetrievalDefaults.rrf_k,
+        description="RRF融合的平滑常数：得分 = Σ 1 / (rrf_k + 排名)"
+    )
@@ -14,8 +14,14 @@
 
 """向量存储入口模块"""
 
+from pathlib import Path
+
+from higoalcore.config.enums.index_enums import VectorTable
+from higoalcore.config.enums.query_enums import RetrievalMode
+from higoalcore.config.load_config import get_core_config
 from higoalcore.database.vector_store import ChunkOperator
 from higoalutils.config.models.embedding_config import EmbeddingConfig
+from higoalutils.database.vector_store.bm25_index import get_bm25_index
 from higoalutils.database.vector_store.factory import VectorStoreFactory
 from higoalutils.language_model.llm.embedding_model_singleton import EmbeddingModelSingleton 
 
@@ -23,11 +29,27 @@ from higoalutils.language_model.llm.embedding_model_singleton import EmbeddingMo
 class KGVectorStore:
     """向量存储统一入口"""
     def __init__(self, embedding_config: EmbeddingConfig):
+        self.embedding_config = embedding_config
         self.embedder = EmbeddingModelSingleton.get_instance(embedding_config)
         self._init_components()
     
     def _init_components(self):
         """初始化各组件"""
         adapter = VectorStoreFactory().get_store()
-        self.chunk_operator = ChunkOperator(adapter, self.embedder)
+        model_cfg = self.embedding_config.active_model_config
+        retrieval_cfg = get_core_config().retrieval_config
+        lexical_index = None
+        if retrieval_cfg.mode == RetrievalMode.HYBRID:
+            # 全文索引与向量表一一对应，按完整表名存放
+            table_name = adapter.get_full_table_name(VectorTable.CHUNKS.value)
+            lexical_index = get_bm25_index(str(Path(retrieval_cfg.bm25_index_dir) / f"{table_name}.sqlite3"))
+        self.chunk_operator = ChunkOperator(
+            adapter,
+            self.embedder,
+            batch_size=model_cfg.batch_size,
+            batch_max_tokens=model_cfg.batch_max_tokens,
+            query_cache=EmbeddingModelSingleton.get_query_cache(),
+            lexical_index=lexical_index,
+            retrieval_config=retrieval_cfg,
+        )
     
\ No newline at end of file
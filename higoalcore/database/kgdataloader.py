@@ -29,4 +29,7 @@ class KGDataLoader:
 
     async def write_all(self, documents: List[dict], chunks: List[dict]):
         await self.loader.load_documents(documents, cleanup_empty=True)
-        await self.loader.load_chunks(chunks, cleanup_existing=True)
\ No newline at end of file
+        await self.loader.load_chunks(chunks, cleanup_existing=True)
+
+    async def delete_all(self, document_ids: List[str]):
+        return await self.loader.delete_documents(document_ids)
\ No newline at end of file
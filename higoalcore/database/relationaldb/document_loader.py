@@ -229,6 +229,30 @@ class DocumentLoader:
             }
 
 
+    async def delete_documents(
+        self,
+        document_ids: List[str]
+    ) -> Dict[str, int]:
+        """删除文档及其全部文本块"""
+        if not document_ids:
+            return {'deleted_documents': 0, 'deleted_chunks': 0}
+
+        async with self.sql_pool() as session:
+            # 不依赖外键级联（sqlite默认不启用），先删chunks再删文档
+            chunk_result = await session.execute(
+                delete(KGChunk).where(KGChunk.source_doc_id.in_(document_ids))
+            )
+            doc_result = await session.execute(
+                delete(KGDocument).where(KGDocument.id.in_(document_ids))
+            )
+            await session.commit()
+
+            return {
+                'deleted_documents': doc_result.rowcount,
+                'deleted_chunks': chunk_result.rowcount
+            }
+
+
     async def _check_document_exists(
         self,
         session: AsyncSession,
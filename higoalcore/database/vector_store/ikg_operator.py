@@ -14,11 +14,16 @@
 
 """Knowledge Graph Elements vector store 接口模块"""
 
+import asyncio
 from abc import abstractmethod
 from typing import List, Dict
 
+import numpy as np
+
 from higoalcore.config.enums.index_enums import VectorTable
+from higoalutils.cache.query_cache import QueryEmbeddingCache
 from higoalutils.database.vector_store.base import VectorStoreBase, FilterColumn, VectorStoreSearchResult
+from higoalutils.database.vector_store.filters import FieldFilter
 from higoalutils.language_model.llm.base import BaseTextEmbedding
 
 
@@ -27,9 +32,15 @@ class IKGOperator():
     命名实体操作模块，纯业务逻辑，不依赖具体数据库
     """
     
-    def __init__(self, adapter: VectorStoreBase, embedder: BaseTextEmbedding):
+    def __init__(
+        self,
+        adapter: VectorStoreBase,
+        embedder: BaseTextEmbedding,
+        query_cache: QueryEmbeddingCache | None = None
+    ):
         self.adapter = adapter
         self.embedder = embedder
+        self.query_cache = query_cache
     
     @abstractmethod
     async def upsert(
@@ -59,7 +70,9 @@ class IKGOperator():
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_ids: List[str] | None = None
+        filter_ids: List[str] | None = None,
+        filters: List[FieldFilter] | None = None,
+        query_vector: List[float] | None = None
     ) -> List[Dict]:
         """
         语义检索
@@ -70,15 +83,72 @@ class IKGOperator():
             similarity_threshold: 相似度阈值,默认为空（即取系统配置的默认值）
             filter_column: 过滤字段,默认为空（可以是id或doc_id）
             filter_ids: 过滤字段值列表,默认为空（即取系统配置的默认值）
+            filters: 结构化过滤条件（与 filter_column / filter_ids 为 AND 关系）,如 metadata.creation_date 的范围
+            query_vector: 预先计算好的查询向量,默认为空（即嵌入query）
         returns:
             List[Dict]: 检索结果
         """
+        full_table_name, params = self._search_target(simple_table_name, filter_column, filter_ids, filters)
+
+        if query_vector is None:
+            query_vector = await self.embed_query(query)
+
+        results = await self.adapter.asimilarity_search_by_vector(
+            vector=query_vector,
+            table_name=full_table_name,
+            top_k=top_k,
+            similarity_threshold=similarity_threshold,
+            **params
+        )
+        return self._process_search_results(results)
+
+    async def _semantic_search_many(
+        self,
+        queries: List[str],
+        simple_table_name: VectorTable,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_ids: List[str] | None = None,
+        filters: List[FieldFilter] | None = None,
+        query_vectors: List[List[float]] | None = None
+    ) -> List[List[Dict]]:
+        """
+        批量语义检索，参数含义同 _semantic_search
+        args:
+            queries: 检索的文本列表
+            query_vectors: 预先计算好的查询向量（与queries一一对应）,默认为空（即批量嵌入queries）
+        returns:
+            List[List[Dict]]: 与queries一一对应的检索结果
+        """
+        full_table_name, params = self._search_target(simple_table_name, filter_column, filter_ids, filters)
+
+        if query_vectors is None:
+            query_vectors = await self.embed_queries(queries)
+        if not query_vectors:
+            return []
+
+        results = await self.adapter.abatch_similarity_search(
+            vectors=np.asarray(query_vectors, dtype=np.float32),
+            table_name=full_table_name,
+            top_k=top_k,
+            similarity_threshold=similarity_threshold,
+            **params
+        )
+        return [self._process_search_results(result) for result in results]
+
+    def _search_target(
+        self,
+        simple_table_name: VectorTable,
+        filter_column: str | None,
+        filter_ids: List[str] | None,
+        filters: List[FieldFilter] | None = None
+    ) -> tuple[str, Dict]:
+        """校验检索的表名与过滤条件，返回完整表名与过滤参数"""
         if not simple_table_name or simple_table_name not in set(VectorTable):
             raise ValueError(f"Invalid table_name: {simple_table_name}. Table name must be one of {set(VectorTable)}")
         
         table_name = simple_table_name.value if isinstance(simple_table_name, VectorTable) else simple_table_name
-        
-        query_vector = self.embedder.embed(query)[0]
 
         # 参数处理
         params = {}
@@ -87,20 +157,35 @@ class IKGOperator():
                 raise ValueError(f"Invalid filter_column: {filter_column}")
             params["filter_column"] = filter_column
             params["filter_values"] = filter_ids
+        if filters:
+            params["filters"] = filters
 
         full_table_name = self.adapter.get_full_table_name(
             simple_name=table_name
         )
-
-        results = self.adapter.similarity_search_by_vector(
-            vector=query_vector,
-            table_name=full_table_name,
-            top_k=top_k,
-            similarity_threshold=similarity_threshold,
-            **params
-        )
-        return self._process_search_results(results)
+        return full_table_name, params
     
+    async def embed_query(self, query: str) -> List[float]:
+        """嵌入查询文本，优先读取查询向量缓存；同步的嵌入调用在线程中执行，不阻塞事件循环"""
+        if self.query_cache is None:
+            return await self._embed_query(query)
+        return await self.query_cache.get_or_embed(query, self._embed_query)
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """批量嵌入查询文本：命中查询向量缓存的直接读取，其余去重后一次批量嵌入"""
+        vectors = [self.query_cache.get(query) if self.query_cache else None for query in queries]
+        missing = list(dict.fromkeys(query for query, vector in zip(queries, vectors) if vector is None))
+        if missing:
+            embedded = dict(zip(missing, await self.embedder.aembed_many(missing)))
+            if self.query_cache:
+                for query, vector in embedded.items():
+                    self.query_cache.set(query, vector)
+            vectors = [vector if vector is not None else embedded[query] for query, vector in zip(queries, vectors)]
+        return vectors # type: ignore
+
+    async def _embed_query(self, query: str) -> List[float]:
+        return (await asyncio.to_thread(self.embedder.embed_batch, [query]))[0]
+
     def _process_search_results(self, results: List[VectorStoreSearchResult]) -> List[Dict]:
         """处理搜索结果"""
         processed = []
@@ -13,23 +13,58 @@
 # limitations under the License.
 
 """业务层操作模块"""
+import asyncio
 import logging
-from typing import List, Dict
+import time
+from typing import Iterator, List, Dict
 
 from higoalcore.config.enums.index_enums import VectorTable
+from higoalcore.config.enums.query_enums import RetrievalMode
+from higoalcore.config.models.retrieval_config import RetrievalConfig
 from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalcore.database.vector_store.ikg_operator import IKGOperator
-from higoalutils.database.vector_store.base import VectorStoreBase, VectorStoreDocument
+from higoalutils.cache.query_cache import QueryEmbeddingCache
+from higoalutils.database.vector_store.base import (
+    FilterColumn, VectorStoreBase, VectorStoreDocument, VectorStoreSearchResult
+)
+from higoalutils.database.vector_store.bm25_index import BM25Index
+from higoalutils.database.vector_store.filters import FieldFilter
 from higoalutils.language_model.llm.base import BaseTextEmbedding
 
 
 log = logging.getLogger(__name__)
 
+DEFAULT_EMBED_BATCH_SIZE = 32
+DEFAULT_EMBED_BATCH_MAX_TOKENS = 32_768
+
 class ChunkOperator(IKGOperator):
     """文本块操作模块"""
     
-    def __init__(self, adapter: VectorStoreBase, embedder: BaseTextEmbedding):
-        super().__init__(adapter, embedder)
+    def __init__(
+        self,
+        adapter: VectorStoreBase,
+        embedder: BaseTextEmbedding,
+        batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        batch_max_tokens: int = DEFAULT_EMBED_BATCH_MAX_TOKENS,
+        query_cache: QueryEmbeddingCache | None = None,
+        lexical_index: BM25Index | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+    ):
+        """
+        args:
+            adapter: 向量数据库适配器
+            embedder: 文本嵌入模型
+            batch_size: 每个嵌入批次的最大chunk数
+            batch_max_tokens: 每个嵌入批次的最大token数
+            query_cache: 查询向量缓存，为空时每次检索都重新嵌入查询
+            lexical_index: 文本块的BM25全文索引，为空时不写入全文索引，也不能混合检索
+            retrieval_config: 检索方式与混合检索参数，为空时取默认值（仅向量检索）
+        """
+        super().__init__(adapter, embedder, query_cache)
+        self.batch_size = max(1, batch_size)
+        self.batch_max_tokens = max(1, batch_max_tokens)
+        self.lexical_index = lexical_index
+        self.retrieval_config = retrieval_config or RetrievalConfig()
     
     async def upsert_chunk(self, 
         chunks: List[ChunkText] | List[Dict], 
@@ -49,8 +84,15 @@ class ChunkOperator(IKGOperator):
                 log.error(f"Failed to convert chunks to ChunkText: {e}")
                 raise e
     
-        docs = [self._chunk_to_vector_doc(chunk) for chunk in chunks] # type: ignore
-        
+        docs = await self.embed_chunks(chunks) # type: ignore
+        return await self.aload_vector_docs(docs, overwrite=overwrite)
+
+    async def embed_chunks(self, chunks: List[ChunkText]) -> List[VectorStoreDocument]:
+        """嵌入文本块并转换为向量文档（不写入）"""
+        return await self._chunks_to_vector_docs(chunks)
+
+    def load_vector_docs(self, docs: List[VectorStoreDocument], overwrite: bool = True) -> int:
+        """将已嵌入的向量文档写入文本块表"""
         table_name = self.adapter.get_full_table_name(
             simple_name=VectorTable.CHUNKS.value,
         )
@@ -60,43 +102,220 @@ class ChunkOperator(IKGOperator):
             overwrite=overwrite,
             table_name=table_name
         )
+        if self.lexical_index is not None:
+            self.lexical_index.add_documents(docs, overwrite=overwrite)
+        log.info(f"Upserted {len(docs)} chunks to {table_name}")
+        return len(docs)
+
+    async def aload_vector_docs(self, docs: List[VectorStoreDocument], overwrite: bool = True) -> int:
+        """load_vector_docs 的异步版本，写入不阻塞事件循环"""
+        table_name = self.adapter.get_full_table_name(
+            simple_name=VectorTable.CHUNKS.value,
+        )
+
+        writes = [self.adapter.aload_documents(
+            documents=docs,
+            overwrite=overwrite,
+            table_name=table_name
+        )]
+        if self.lexical_index is not None:
+            writes.append(asyncio.to_thread(self.lexical_index.add_documents, docs, overwrite))
+        await asyncio.gather(*writes)
         log.info(f"Upserted {len(docs)} chunks to {table_name}")
         return len(docs)
     
+    async def delete_chunks_by_doc_ids(self, doc_ids: List[str]) -> None:
+        """删除指定文档的全部文本块向量"""
+        if not doc_ids:
+            return
+        table_name = self.adapter.get_full_table_name(
+            simple_name=VectorTable.CHUNKS.value,
+        )
+        await self.adapter.adelete_documents(
+            table_name=table_name,
+            filter_column=FilterColumn.DOCID.value,
+            filter_values=doc_ids
+        )
+        if self.lexical_index is not None:
+            await asyncio.to_thread(self.lexical_index.delete_documents, FilterColumn.DOCID.value, doc_ids)
+        log.info(f"Deleted chunks of {len(doc_ids)} documents from {table_name}")
+
     async def semantic_search(
         self,
         query: str,
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_ids: List[str] | None = None
+        filter_ids: List[str] | None = None,
+        filters: List[FieldFilter] | None = None,
+        query_vector: List[float] | None = None,
+        mode: RetrievalMode | None = None
     ) -> List[Dict]:
-        """语义搜索关系"""
+        """语义搜索文本块；mode 为空时取检索配置，hybrid 模式下融合向量与BM25检索的结果"""
+        if (mode or self.retrieval_config.mode) == RetrievalMode.HYBRID:
+            results, timings = await self.hybrid_search(
+                query=query,
+                top_k=top_k,
+                similarity_threshold=similarity_threshold,
+                filter_column=filter_column,
+                filter_ids=filter_ids,
+                filters=filters,
+                query_vector=query_vector
+            )
+            log.info("Hybrid search timings: " + ", ".join(f"{stage} {t * 1000:.1f}ms" for stage, t in timings.items()))
+            return results
         return await self._semantic_search(
             query=query,
             simple_table_name=VectorTable.CHUNKS,
             top_k=top_k,
             similarity_threshold=similarity_threshold,
             filter_column=filter_column,
-            filter_ids=filter_ids
+            filter_ids=filter_ids,
+            filters=filters,
+            query_vector=query_vector
         )
     
-    def _chunk_to_vector_doc(self, chunk: ChunkText) -> VectorStoreDocument:
-            """将单个ChunkText转换为VectorStoreDocument"""
-            # 使用embedder生成向量
-            vector = None
-            if chunk.text:
-                vector = self.embedder.embed(chunk.text)[0]
-            
-            # 构建metadata
-            metadata = chunk.attributes.copy()
-            if chunk.filename:
-                metadata["filename"] = chunk.filename
-            
-            return VectorStoreDocument(
-                id=chunk.id,
-                source_doc_id=chunk.source_doc_id,
-                text=chunk.text,
+    async def hybrid_search(
+        self,
+        query: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_ids: List[str] | None = None,
+        filters: List[FieldFilter] | None = None,
+        query_vector: List[float] | None = None
+    ) -> tuple[List[Dict], Dict[str, float]]:
+        """
+        混合检索：向量检索（含查询嵌入）与BM25全文检索并发执行，各召回 top_k * candidate_factor 个候选，
+        按RRF融合后返回前 top_k 条。相似度阈值只作用于向量检索，全文检索命中的结果不受其限制
+        returns:
+            融合后的结果（score 为RRF得分，vector_score / bm25_score 为各路的原始得分，未召回时为空）
+            及各阶段耗时（秒）：embed、vector、bm25、fusion、total
+        """
+        if self.lexical_index is None:
+            raise ValueError("Hybrid search requires a BM25 index, set retrieval_config.mode to hybrid and rebuild the index")
+        t_start = time.perf_counter()
+        top_k = top_k or self.adapter.top_k
+        num_candidates = top_k * max(1, self.retrieval_config.candidate_factor)
+        full_table_name, params = self._search_target(VectorTable.CHUNKS, filter_column, filter_ids, filters)
+        timings: Dict[str, float] = dict.fromkeys(("embed", "vector", "bm25", "fusion", "total"), 0.0)
+
+        async def vector_search() -> List[VectorStoreSearchResult]:
+            t1 = time.perf_counter()
+            vector = query_vector if query_vector is not None else await self.embed_query(query)
+            t2 = time.perf_counter()
+            results = await self.adapter.asimilarity_search_by_vector(
                 vector=vector,
-                metadata=metadata
-            )
\ No newline at end of file
+                table_name=full_table_name,
+                top_k=num_candidates,
+                similarity_threshold=similarity_threshold,
+                **params
+            )
+            timings["embed"], timings["vector"] = t2 - t1, time.perf_counter() - t2
+            return results
+
+        async def bm25_search() -> List[VectorStoreSearchResult]:
+            t1 = time.perf_counter()
+            results = await asyncio.to_thread(self.lexical_index.search, query, num_candidates, **params) # type: ignore
+            timings["bm25"] = time.perf_counter() - t1
+            return results
+
+        vector_results, bm25_results = await asyncio.gather(vector_search(), bm25_search())
+        t1 = time.perf_counter()
+        results = self._fuse_results({"vector": vector_results, "bm25": bm25_results}, top_k)
+        timings["fusion"] = time.perf_counter() - t1
+        timings["total"] = time.perf_counter() - t_start
+        return results, timings
+
+    def _fuse_results(self, ranked: Dict[str, List[VectorStoreSearchResult]], top_k: int) -> List[Dict]:
+        """倒数排名融合（RRF）：得分 = Σ 1 / (rrf_k + 排名)，同一文本块的字段取先出现的一路"""
+        fused: Dict[str, Dict] = {}
+        for name, results in ranked.items():
+            for rank, item in enumerate(self._process_search_results(results), start=1):
+                entry = fused.get(item["id"])
+                if entry is None:
+                    entry = fused[item["id"]] = {**item, "score": 0.0, **{f"{n}_score": None for n in ranked}}
+                entry["score"] += 1 / (self.retrieval_config.rrf_k + rank)
+                entry[f"{name}_score"] = item["score"]
+        return sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)[:top_k]
+
+    async def semantic_search_many(
+        self,
+        queries: List[str],
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_ids: List[str] | None = None,
+        filters: List[FieldFilter] | None = None,
+        query_vectors: List[List[float]] | None = None
+    ) -> List[List[Dict]]:
+        """批量语义搜索文本块，返回与queries一一对应的结果"""
+        return await self._semantic_search_many(
+            queries=queries,
+            simple_table_name=VectorTable.CHUNKS,
+            top_k=top_k,
+            similarity_threshold=similarity_threshold,
+            filter_column=filter_column,
+            filter_ids=filter_ids,
+            filters=filters,
+            query_vectors=query_vectors
+        )
+
+    async def _chunks_to_vector_docs(self, chunks: List[ChunkText]) -> List[VectorStoreDocument]:
+        """按token批次并发嵌入所有chunk（并发与限流由embedder控制），并转换为VectorStoreDocument"""
+        batches = list(self._iter_embedding_batches(chunks))
+        batch_vectors = await asyncio.gather(*[
+            self.embedder.aembed_many([chunk.text for chunk in batch]) # type: ignore
+            for batch in batches
+        ])
+        docs = []
+        for batch, vectors in zip(batches, batch_vectors):
+            docs.extend(
+                self._chunk_to_vector_doc(chunk, vector or None)
+                for chunk, vector in zip(batch, vectors)
+            )
+        # 空文本的chunk不需要嵌入
+        docs.extend(self._chunk_to_vector_doc(chunk, None) for chunk in chunks if not chunk.text)
+        return docs
+
+    def _iter_embedding_batches(self, chunks: List[ChunkText]) -> Iterator[List[ChunkText]]:
+        """将非空chunk分组，每组不超过batch_size条且不超过batch_max_tokens个token"""
+        batch: List[ChunkText] = []
+        batch_tokens = 0
+        for chunk in chunks:
+            if not chunk.text:
+                continue
+            tokens = self._estimate_tokens(chunk)
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_tokens + tokens > self.batch_max_tokens
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(chunk)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _estimate_tokens(chunk: ChunkText) -> int:
+        """切片时已记录chunk_size（token数），缺失时退化为字符数"""
+        chunk_size = chunk.attributes.get("chunk_size")
+        if isinstance(chunk_size, int) and chunk_size > 0:
+            return chunk_size
+        return len(chunk.text or "")
+
+    def _chunk_to_vector_doc(self, chunk: ChunkText, vector: List[float] | None) -> VectorStoreDocument:
+        """将单个ChunkText及其向量转换为VectorStoreDocument"""
+        # 构建metadata
+        metadata = chunk.attributes.copy()
+        if chunk.filename:
+            metadata["filename"] = chunk.filename
+        
+        return VectorStoreDocument(
+            id=chunk.id,
+            source_doc_id=chunk.source_doc_id,
+            text=chunk.text,
+            vector=vector,
+            metadata=metadata
+        )
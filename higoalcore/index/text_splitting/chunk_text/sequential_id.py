@@ -12,25 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""生成连续性ID的生成器，带文件锁和进程锁机制，全局唯一实例控制。用于切片等ID生成场景。支持多key=value对"""
+"""
+生成连续性ID的生成器，带文件锁和进程锁机制，全局唯一实例控制。用于切片等ID生成场景。支持多key=value对
 
+计数器文件是唯一的事实来源：每次在文件锁内一次性预留一段连续ID（读取-递增-原子替换），
+预留到的区间在进程内无锁分配，因此多个进程、多个并发的 index 任务共享同一个 datavolume 时也不会产生重复ID。
+进程退出时未用完的区间会被丢弃（ID可能不连续，但保证唯一）。
+"""
+
+import itertools
 import time
 import os
 import sys
-import atexit
 from threading import RLock
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import pytz
-from datetime import datetime
+from datetime import datetime, timedelta
 from contextlib import contextmanager
 
+from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
+
 
 # 根据操作系统选择文件锁定方式
 if sys.platform == "win32":
     import msvcrt
-    LOCK_EX = 0x1  # 独占锁
-    LOCK_UN = 0x0  # 解锁
+    LOCK_EX = msvcrt.LK_LOCK  # 独占锁（阻塞重试）
+    LOCK_UN = msvcrt.LK_UNLCK  # 解锁
 else:
     import fcntl
     LOCK_EX = fcntl.LOCK_EX
@@ -38,9 +46,39 @@ else:
 
 DEFAULT_STORAGE_PATH = "datavolume/config/sequential_id.dat"
 DEFAULT_TIMEZONE = "Asia/Shanghai"
+MAX_SEQUENCE = 999_999_999
 _SINGLETON_INSTANCE: Optional['DailySequentialIDGenerator'] = None
 _SINGLETON_LOCK = RLock()
 
+
+class IDBlock:
+    """一段已在计数器文件中预留的连续ID [start, end)，区间内分配无需加锁"""
+
+    def __init__(self, date_str: str, start: int, end: int, expires_at: float):
+        self.date_str = date_str
+        self.start = start
+        self.end = end
+        self.expires_at = expires_at
+        # itertools.count 的 next() 在CPython中是原子的，多线程共享同一区间也不会重复
+        self._next = itertools.count(start)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def take(self) -> Optional[str]:
+        """取下一个ID，区间用完或已跨天时返回None"""
+        if time.time() >= self.expires_at:
+            return None
+        seq = next(self._next)
+        if seq >= self.end:
+            return None
+        return f"{self.date_str}{seq:09d}"
+
+    def all_ids(self) -> List[str]:
+        """区间内的全部ID（用于一次性预留恰好N个ID的场景）"""
+        return [f"{self.date_str}{seq:09d}" for seq in range(self.start, self.end)]
+
+
 class DailySequentialIDGenerator:
     def __init__(self, 
                 storage_path: str = DEFAULT_STORAGE_PATH,
@@ -52,29 +90,26 @@ class DailySequentialIDGenerator:
         
         :param storage_path: 存储文件路径
         :param time_zone: 时区(如"Asia/Shanghai")
-        :param auto_persist_every: 自动持久化间隔(每N次)
-        :param min_persist_interval: 最小持久化间隔(秒)
+        :param auto_persist_every: generate_id 每次从文件预留的ID数量
+        :param min_persist_interval: 已废弃，保留以兼容旧参数（每次预留都会立即落盘）
         """
         self._storage = Path(storage_path)
-        self._counters: Dict[str, int] = {}
-        self._last_dates: Dict[str, str] = {}
+        self._lockfile = self._storage.with_suffix('.lock')
         self._lock = RLock()
         self._time_zone = pytz.timezone(time_zone)
-        self._auto_persist_every = auto_persist_every
-        self._min_persist_interval = min_persist_interval
-        self._last_persist_time = 0.0
+        self._block_size = max(1, auto_persist_every)
+        self._blocks: Dict[str, IDBlock] = {}
         
-        self._init_counters()
-        atexit.register(self._safe_persist)
+        self._init_storage()
 
     @staticmethod
     def _file_lock(file):
-        """跨平台文件锁定"""
+        """跨平台文件锁定（阻塞等待其它进程释放）"""
         try:
             if sys.platform == "win32":
                 msvcrt.locking(file.fileno(), LOCK_EX, 1)
             else:
-                fcntl.flock(file, LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(file, LOCK_EX)
         except (OSError, IOError) as e:
             raise RuntimeError(f"文件锁定失败: {str(e)}")
 
@@ -84,6 +119,7 @@ class DailySequentialIDGenerator:
         try:
             if sys.platform == "win32":
                 if os.path.exists(file.name):  # 检查文件是否存在
+                    file.seek(0)
                     msvcrt.locking(file.fileno(), LOCK_UN, 1)
             else:
                 fcntl.flock(file, LOCK_UN)
@@ -102,136 +138,145 @@ class DailySequentialIDGenerator:
 
         with _SINGLETON_LOCK:
             if _SINGLETON_INSTANCE is None:
-                lockfile = Path(storage_path).with_suffix('.lock')
-                lockfile.parent.mkdir(parents=True, exist_ok=True)
-                
                 try:
-                    with open(lockfile, 'wb+') as f:  # 使用二进制模式避免编码问题
-                        try:
-                            cls._file_lock(f)
-                            _SINGLETON_INSTANCE = cls(storage_path, **kwargs)
-                        finally:
-                            cls._file_unlock(f)
+                    _SINGLETON_INSTANCE = cls(storage_path, **kwargs)
                 except Exception as e:
                     raise RuntimeError(f"初始化ID生成器失败: {str(e)}")
         
         return _SINGLETON_INSTANCE
 
-    def _init_counters(self):
-        """初始化计数器"""
+    def _init_storage(self):
+        """确保计数器文件与锁文件所在目录存在"""
         try:
-            if not self._storage.exists():
-                self._storage.parent.mkdir(parents=True, exist_ok=True)
-                with open(self._storage, 'w'):
-                    return
-            
-            with open(self._storage, 'rb+') as f:  # 二进制模式读取
-                self._file_lock(f)
-                try:
-                    content = f.read().decode('utf-8').strip()
-                    if content:
-                        for item in content.split(","):
-                            if "=" in item:
-                                key, values = item.split("=")
-                                date_str, counter_str = values.split("|")
-                                self._counters[key] = int(counter_str)
-                                self._last_dates[key] = date_str
-                finally:
-                    self._file_unlock(f)
+            self._storage.parent.mkdir(parents=True, exist_ok=True)
+            self._lockfile.touch(exist_ok=True)
         except Exception as e:
             raise RuntimeError(f"初始化计数器失败: {str(e)}")
 
-    def _do_persist(self):
-        """执行持久化(假设已持有锁)"""
-        current_time = time.time()
-        if current_time - self._last_persist_time < self._min_persist_interval:
-            return
-        
-        try:
-            temp_path = self._storage.with_suffix('.tmp')
+    def _read_counters(self) -> Dict[str, Tuple[str, int]]:
+        """读取计数器文件：key -> (日期, 已分配的最大序列号)（假设已持有文件锁）"""
+        counters: Dict[str, Tuple[str, int]] = {}
+        if not self._storage.exists():
+            return counters
+        content = self._storage.read_bytes().decode('utf-8').strip()
+        if content:
+            for item in content.split(","):
+                if "=" in item:
+                    key, values = item.split("=")
+                    date_str, counter_str = values.split("|")
+                    counters[key] = (date_str, int(counter_str))
+        return counters
 
+    def _write_counters(self, counters: Dict[str, Tuple[str, int]]):
+        """原子写入计数器文件（假设已持有文件锁）"""
+        temp_path = self._storage.with_suffix('.tmp')
+        try:
             with open(temp_path, 'wb') as f:  # 先写入临时文件
-                items = [
-                    f"{k}={self._last_dates[k]}|{self._counters[k]}".encode('utf-8')
-                    for k in self._counters
-                ]
+                items = [f"{k}={d}|{c}".encode('utf-8') for k, (d, c) in counters.items()]
                 f.write(b",".join(items))
+                f.flush()
+                os.fsync(f.fileno())
             # 原子性替换文件
             if sys.platform == "win32":
                 # Windows需要先删除原文件
                 if self._storage.exists():
                     os.unlink(self._storage)
             temp_path.replace(self._storage)
-            
-            self._last_persist_time = current_time
         except Exception as e:
-            if temp_path.exists(): # type: ignore[union-attr]
-                temp_path.unlink() # type: ignore[union-attr]
+            if temp_path.exists():
+                temp_path.unlink()
             raise RuntimeError(f"持久化失败: {str(e)}")
 
-    def _safe_persist(self):
-        """安全的持久化方法"""
-        with self._lock:
-            try:
-                self._do_persist()
-            except Exception as e:
-                pass
+    def _now(self) -> datetime:
+        return datetime.now(self._time_zone)
 
     def _get_current_date(self) -> str:
         """获取当前日期(yyMMdd)"""
-        return datetime.now(self._time_zone).strftime("%y%m%d")
+        return self._now().strftime("%y%m%d")
+
+    def _next_midnight(self, now: datetime) -> float:
+        """当天结束（时区内次日零点）的时间戳，区间在此之后失效"""
+        tomorrow = (now + timedelta(days=1)).date()
+        midnight = self._time_zone.localize(datetime(tomorrow.year, tomorrow.month, tomorrow.day))
+        return midnight.timestamp()
+
+    def reserve_ids(self, count: int, key: str = "default") -> IDBlock:
+        """
+        在一次文件锁操作内预留 count 个连续ID
+        跨进程安全：读取-递增-写回在同一个独占文件锁内完成
+        """
+        if count <= 0:
+            raise ValueError("count 必须大于0")
+        with self._lock:
+            with open(self._lockfile, 'wb+') as lock_f:
+                self._file_lock(lock_f)
+                try:
+                    now = self._now()
+                    current_date = now.strftime("%y%m%d")
+                    counters = self._read_counters()
+                    last_date, last_counter = counters.get(key, (current_date, 0))
+                    if last_date != current_date:
+                        last_counter = 0
+
+                    start = last_counter + 1
+                    end = start + count
+                    if end - 1 > MAX_SEQUENCE:
+                        raise ValueError(f"序列号超过最大值 (key: {key}, date: {current_date})")
+
+                    counters[key] = (current_date, end - 1)
+                    self._write_counters(counters)
+                finally:
+                    self._file_unlock(lock_f)
+        return IDBlock(current_date, start, end, self._next_midnight(now))
+
+    def generate_ids(self, count: int, key: str = "default") -> List[str]:
+        """一次性生成 count 个ID（一次文件锁操作）"""
+        if count <= 0:
+            return []
+        return self.reserve_ids(count, key).all_ids()
 
     def generate_id(self, key: str = "default") -> str:
         """
-        生成唯一ID(自动持久化保障)
+        生成唯一ID：从进程内已预留的区间中无锁分配，区间用完或跨天时再预留下一段
         格式: 6位日期 + 9位序列号 = 15位
         """
+        block = self._blocks.get(key)
+        if block is not None:
+            new_id = block.take()
+            if new_id is not None:
+                return new_id
+
         with self._lock:
-            current_date = self._get_current_date()
-            
-            # 必须持久化的场景
-            must_persist = (
-                key not in self._counters or 
-                current_date != self._last_dates.get(key)
-            )
-            
-            if must_persist:
-                self._counters[key] = 0
-                self._last_dates[key] = current_date
-            
-            self._counters[key] += 1
-            
-            if self._counters[key] > 999_999_999:
-                raise ValueError(f"序列号超过最大值 (key: {key}, date: {current_date})")
-            
-            # 自动持久化条件
-            if must_persist or self._counters[key] % self._auto_persist_every == 0:
-                self._safe_persist()
-            
-            return f"{current_date}{self._counters[key]:09d}"
+            # 其它线程可能已经换了新区间
+            block = self._blocks.get(key)
+            new_id = block.take() if block is not None else None
+            while new_id is None:
+                block = self.reserve_ids(self._block_size, key)
+                self._blocks[key] = block
+                new_id = block.take()
+            return new_id
 
     @contextmanager
     def batch_mode(self):
-        """
-        批量操作上下文管理器
-        退出时自动持久化，期间减少持久化频率
-        """
-        original_interval = self._auto_persist_every
-        self._auto_persist_every = sys.maxsize
-        
-        try:
-            yield
-        finally:
-            self._auto_persist_every = original_interval
-            self._safe_persist()
+        """兼容旧接口：预留区间本身即已持久化，无需额外处理"""
+        yield
 
     def persist_now(self):
-        """立即持久化"""
-        self._safe_persist()
+        """兼容旧接口：预留区间时已立即持久化"""
+        pass
+
+
+def allocate_chunk_ids(count: int) -> List[str]:
+    """为 count 个切片分配连续ID（一次文件锁操作）"""
+    generator = DailySequentialIDGenerator.get_instance(auto_persist_every=1000)
+    return generator.generate_ids(count, key="default")
+
 
-    def __del__(self):
-        """对象销毁时自动持久化"""
-        self._safe_persist()
+def assign_chunk_ids(chunks: List[ChunkText]) -> List[ChunkText]:
+    """按顺序为一批切片分配ID（整批只预留一次）"""
+    for chunk, chunk_id in zip(chunks, allocate_chunk_ids(len(chunks))):
+        chunk.id = chunk_id
+    return chunks
 
 if __name__ == "__main__":
     try:
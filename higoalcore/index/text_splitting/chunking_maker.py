@@ -12,16 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import AsyncIterator, Collection, List, Tuple
 from pathlib import Path
 import logging
+import os
 
 from higoalcore.config.models.chunking_config import ChunkingConfig
 from higoalcore.config.models.input_config import InputConfig
 from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalutils.logger.base import ProgressLogger
 from higoalutils.logger.null_progress import NullProgressLogger
-from higoalutils.storage.pipeline_storage import PipelineStorage
 from higoalutils.storage.file_pipeline_storage import FilePipelineStorage
 from higoalcore.index.text_splitting.loaders.csv_loader import CSVChunkLoader
 from higoalcore.index.text_splitting.loaders.text_loader import TextChunkLoader
@@ -41,19 +43,60 @@ class ChunkingFactory:
         self.chunk_config = chunk_config
         self.progress = progress_reporter or NullProgressLogger()
         file_path = Path(input_config.root_dir) / input_config.base_dir
-        self.storage: PipelineStorage = FilePipelineStorage(root_dir=str(file_path))
+        self.storage = FilePipelineStorage(root_dir=str(file_path))
 
-    async def run(self) -> List[ChunkText]:
+    async def run(self, include_files: Collection[str] | None = None) -> List[ChunkText]:
+        """
+        加载并切片输入文件
+        args:
+            include_files: 只处理这些文件（storage中的key），为空时处理全部匹配文件
+        """
         chunks = []
+        async for _, file_chunks in self.iter_chunks(include_files):
+            chunks.extend(file_chunks)
+        return chunks
 
-        if InputFileType.TEXT in self.input_config.file_type:
-            text_logger = self.progress.child("📄 Text Files", transient=False) if self.progress else None
-            loader = TextChunkLoader(pattern=self.input_config.text_pattern, input_type="text")
-            chunks += await loader.load_and_chunk(self.input_config, self.chunk_config, self.storage, text_logger)
+    async def iter_chunks(
+        self,
+        include_files: Collection[str] | None = None
+    ) -> AsyncIterator[Tuple[str, List[ChunkText]]]:
+        """逐个文件产出 (文件key, chunks)，供流式索引使用；num_workers > 1 时在进程池中并行切片"""
+        num_workers = self.chunk_config.num_workers or os.cpu_count() or 1
+        executor = None
+        if num_workers > 1:
+            # spawn 避免在已有线程（嵌入、数据库客户端）的进程中 fork
+            executor = ProcessPoolExecutor(max_workers=num_workers, mp_context=get_context("spawn"))
+            log.info(f"Chunking input files with {num_workers} worker processes")
+        # 进程池时多读入一些文件，保证每个worker都有任务
+        max_pending = num_workers * 2 if executor else 1
 
-        if InputFileType.CSV in self.input_config.file_type:
-            csv_logger = self.progress.child("🧾 CSV Files", transient=False) if self.progress else None
-            loader = CSVChunkLoader(pattern=self.input_config.csv_pattern, input_type="csv")
-            chunks += await loader.load_and_chunk(self.input_config, self.chunk_config, self.storage, csv_logger)
+        try:
+            if InputFileType.TEXT in self.input_config.file_type:
+                text_logger = self.progress.child("📄 Text Files", transient=False) if self.progress else None
+                loader = TextChunkLoader(pattern=self.input_config.text_pattern, input_type="text")
+                async for item in loader.iter_chunks(
+                    self.input_config, self.chunk_config, self.storage, text_logger,
+                    include_files, executor, max_pending
+                ):
+                    yield item
 
-        return chunks
\ No newline at end of file
+            if InputFileType.CSV in self.input_config.file_type:
+                csv_logger = self.progress.child("🧾 CSV Files", transient=False) if self.progress else None
+                loader = CSVChunkLoader(pattern=self.input_config.csv_pattern, input_type="csv")
+                async for item in loader.iter_chunks(
+                    self.input_config, self.chunk_config, self.storage, csv_logger,
+                    include_files, executor, max_pending
+                ):
+                    yield item
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def find_files(self) -> List[str]:
+        """返回所有启用的文件类型下匹配的输入文件key"""
+        files: List[str] = []
+        if InputFileType.TEXT in self.input_config.file_type:
+            files += TextChunkLoader(pattern=self.input_config.text_pattern, input_type="text").find_files(self.storage)
+        if InputFileType.CSV in self.input_config.file_type:
+            files += CSVChunkLoader(pattern=self.input_config.csv_pattern, input_type="csv").find_files(self.storage)
+        return list(dict.fromkeys(files))
\ No newline at end of file
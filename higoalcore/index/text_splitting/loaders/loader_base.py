@@ -13,28 +13,148 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import List, Pattern
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+import logging
+import re
+from typing import Any, AsyncIterator, Collection, Deque, List, Pattern, Tuple
 
 from higoalcore.config.models.input_config import InputConfig
 from higoalcore.config.models.chunking_config import ChunkingConfig
 from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalutils.storage.pipeline_storage import PipelineStorage
 from higoalutils.logger.base import ProgressLogger
+from higoalutils.logger.progress import ProgressTicker
+from higoalcore.index.text_splitting.chunk_text.sequential_id import assign_chunk_ids
+from higoalcore.index.text_splitting.splitter.text_splitter import create_chunks, create_chunks_without_ids
 
 
+log = logging.getLogger(__name__)
+
 class BaseChunkLoader(ABC):
-    """每种输入类型的ChunkLoader应实现此接口，返回 List[ChunkText]"""
+    """每种输入类型的ChunkLoader应实现 _read_documents，把单个文件读取为待切片的文档"""
 
     def __init__(self, pattern: Pattern[str], input_type: str):
         self.pattern: Pattern[str] = pattern
         self.input_type = input_type
 
     @abstractmethod
+    async def _read_documents(
+        self,
+        file: str,
+        group: dict[str, Any],
+        input_config: InputConfig,
+        storage: PipelineStorage,
+    ) -> dict[str, Any] | list[dict[str, Any]]:
+        """读取单个文件，返回 create_chunks 的输入（单个文档或文档列表）"""
+        ...
+
+    async def _load_file(
+        self,
+        file: str,
+        group: dict[str, Any],
+        input_config: InputConfig,
+        chunk_config: ChunkingConfig,
+        storage: PipelineStorage,
+        executor: Executor | None = None,
+    ) -> List[ChunkText]:
+        """
+        加载并切分单个文件。
+        指定 executor（进程池）时切片在子进程中执行，返回的chunks尚未分配ID
+        """
+        docs = await self._read_documents(file, group, input_config, storage)
+        if executor is None:
+            return create_chunks(chunk_config, input=docs, ticker=None)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, create_chunks_without_ids, chunk_config, docs)
+
     async def load_and_chunk(
         self,
         input_config: InputConfig,
         chunk_config: ChunkingConfig,
         storage: PipelineStorage,
-        progress: ProgressLogger | None
+        progress: ProgressLogger | None,
+        include_files: Collection[str] | None = None
     ) -> List[ChunkText]:
-        ...
\ No newline at end of file
+        """加载并切分全部文件；include_files 不为空时只处理其中的文件（增量索引）"""
+        chunks = []
+        async for _, file_chunks in self.iter_chunks(input_config, chunk_config, storage, progress, include_files):
+            chunks.extend(file_chunks)
+        return chunks
+
+    async def iter_chunks(
+        self,
+        input_config: InputConfig,
+        chunk_config: ChunkingConfig,
+        storage: PipelineStorage,
+        progress: ProgressLogger | None,
+        include_files: Collection[str] | None = None,
+        executor: Executor | None = None,
+        max_pending: int = 1
+    ) -> AsyncIterator[Tuple[str, List[ChunkText]]]:
+        """
+        逐个文件加载并切分，按文件顺序产出 (文件key, 该文件的chunks)；加载失败的文件产出空列表
+        args:
+            executor: 切片用的进程池，为空时在当前进程中逐个切片
+            max_pending: 同时在处理中的文件数上限
+        """
+        log.info("[ChunkingFactory] Loading %s files...", self.input_type)
+        files = list(storage.find(re.compile(self.pattern), progress=progress))
+        if include_files is not None:
+            files = [(file, group) for file, group in files if file in include_files]
+        if not files:
+            log.warning(f"No {self.input_type} files found in {input_config.base_dir}")
+            return
+
+        log.info(f"Found {len(files)} {self.input_type} files in {input_config.base_dir}")
+        ticker = ProgressTicker(progress, num_total=len(files))
+
+        total_chunks = 0
+        pending: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        async def finish(file: str, future: asyncio.Future) -> List[ChunkText]:
+            file_chunks: List[ChunkText] = []
+            try:
+                file_chunks = await future
+                if executor is not None:
+                    # 在主进程中按文件顺序分配ID，保证ID唯一且与并发调度无关
+                    assign_chunk_ids(file_chunks)
+                log.info("Loaded %d chunks from %s file: %s", len(file_chunks), self.input_type, file)
+            except Exception as e:
+                log.warning("Error loading %s file %s: %s", self.input_type, file, str(e))
+            finally:
+                ticker()
+            return file_chunks
+
+        try:
+            for file, group in files:
+                future = asyncio.ensure_future(
+                    self._load_file(file, group, input_config, chunk_config, storage, executor)
+                )
+                pending.append((file, future))
+                if len(pending) < max(1, max_pending):
+                    continue
+                done_file, done_future = pending.popleft()
+                file_chunks = await finish(done_file, done_future)
+                total_chunks += len(file_chunks)
+                yield done_file, file_chunks
+
+            while pending:
+                done_file, done_future = pending.popleft()
+                file_chunks = await finish(done_file, done_future)
+                total_chunks += len(file_chunks)
+                yield done_file, file_chunks
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+        log.info(
+            "Completed loading. Total %s files: %d, total chunks: %d",
+            self.input_type, len(files), total_chunks
+        )
+        ticker.done()
+
+    def find_files(self, storage: PipelineStorage, progress: ProgressLogger | None = None) -> List[str]:
+        """返回匹配的全部文件key"""
+        return [file for file, _ in storage.find(re.compile(self.pattern), progress=progress)]
@@ -38,8 +38,14 @@ def create_chunks(
     input: dict[str, Any] | list[dict[str, Any]],
     ticker: ProgressTicker | None = None,
     encoding_model: TokenizerType | None = None,
+    assign_ids: bool = True,
 ) -> list[ChunkText]:
-    """Create chunks from input based on configured strategy and input type."""
+    """
+    Create chunks from input based on configured strategy and input type.
+
+    When assign_ids is False the chunks are returned with empty ids and the
+    caller is expected to call assign_chunk_ids (used by worker processes).
+    """
     encoding_model = encoding_model or config.default_encoding_model
     tokenizer = get_tokenizer(encoding_model)
 
@@ -62,4 +68,13 @@ def create_chunks(
     except KeyError:
         raise ValueError(f"Unsupported chunking strategy: {config.strategy}")
 
-    return split_fn(config, input, tokenizer, ticker)
\ No newline at end of file
+    return split_fn(config, input, tokenizer, ticker, assign_ids)
+
+
+def create_chunks_without_ids(
+    config: ChunkingConfig,
+    input: dict[str, Any] | list[dict[str, Any]],
+) -> list[ChunkText]:
+    """进程池中执行的切片入口（模块级函数，便于pickle）"""
+    return create_chunks(config, input, assign_ids=False)
+
@@ -21,7 +21,7 @@ from higoalutils.logger.progress import ProgressTicker
 from higoalcore.config.models.chunking_config import ChunkingConfig
 from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalutils.language_model.tokenizer.base import Tokenizer
-from higoalcore.index.text_splitting.chunk_text.sequential_id import DailySequentialIDGenerator
+from higoalcore.index.text_splitting.chunk_text.sequential_id import assign_chunk_ids
 from higoalcore.index.text_splitting.splitter.split_sentences import split_sentences
 
 
@@ -48,17 +48,16 @@ def extract_metadata(doc: dict) -> dict:
 def create_chunk(
     sentences: list[str],
     token_sizes: list[int],
-    metadata_list: list[dict],
-    generator: DailySequentialIDGenerator
+    metadata_list: list[dict]
 ) -> ChunkText:
-    """创建新的文本块"""
+    """创建新的文本块（ID在整个文档切分完成后统一分配）"""
     # 合并所有来源的title
     source_titles = list({m['title'] for m in metadata_list if m.get('title')})
     chunk_text = ''.join(sentences)
     total_size = sum(token_sizes)
     
     return ChunkText(
-        id=generator.generate_id(key="default"),
+        id="",
         text=chunk_text,
         source_doc_id=metadata_list[0]['source_doc_id'],  # 使用第一个文档的ID
         filename=metadata_list[0]['filename'],
@@ -93,7 +92,8 @@ def split_single_text_on_sentences(
     config: ChunkingConfig,
     doc: dict,
     tokenizer: Tokenizer,
-    tick: Optional[ProgressTicker] = None
+    tick: Optional[ProgressTicker] = None,
+    assign_ids: bool = True
 ) -> list[ChunkText]:
     """
     将单个文本按句子分割成块，支持重叠
@@ -103,6 +103,7 @@ def split_single_text_on_sentences(
         doc: 包含文本和元数据的字典
         tokenizer: 用于计算token长度的分词器
         tick: 进度回调（可选）
+        assign_ids: 是否分配切片ID（子进程中切片时为False，由主进程统一分配）
     
     Returns:
         List[ChunkText]: 生成的分块结果
@@ -117,16 +118,12 @@ def split_single_text_on_sentences(
         return []
     
     # 初始化
-    generator = DailySequentialIDGenerator.get_instance(
-        auto_persist_every=100,
-        min_persist_interval=0.5
-    )
     result = []
     
     try:
         # 分句并预计算token长度
         sentences = split_sentences(doc['text'], config)
-        sentence_sizes = [len(tokenizer.encode(s)) for s in sentences]
+        sentence_sizes = tokenizer.count_tokens_batch(sentences) # type: ignore
         
         current_chunk = []      # 当前块的句子列表
         current_sizes = []      # 对应句子的token长度
@@ -142,7 +139,7 @@ def split_single_text_on_sentences(
                 # 保存当前块
                 if current_chunk:
                     result.append(create_chunk(
-                        current_chunk, current_sizes, [metadata], generator
+                        current_chunk, current_sizes, [metadata]
                     ))
                     log.info(f"current chunk saved: {current_size} tokens, and next sentence size is:{sent_size},the sum {current_size+sent_size} is lagger then {config.size}")
                 
@@ -164,13 +161,17 @@ def split_single_text_on_sentences(
         # 处理最后一个块
         if current_chunk:
             result.append(create_chunk(
-                current_chunk, current_sizes, [metadata], generator
+                current_chunk, current_sizes, [metadata]
             ))
             log.info(f"Current chunk is the last chunk, saved: {current_size} tokens.")
     except Exception as e:
         log.error(f"Chunking failed: {e}", exc_info=True)
         raise
     
+    if assign_ids:
+        # 整个文档的ID一次性预留
+        assign_chunk_ids(result)
+
     if tick:
         tick(1)
     
@@ -184,7 +185,8 @@ def split_multiple_texts_on_sentences(
     config: ChunkingConfig,
     texts: list[dict], 
     tokenizer: Tokenizer, 
-    tick: ProgressTicker | None = None
+    tick: ProgressTicker | None = None,
+    assign_ids: bool = True
 ) -> list[ChunkText]:
     """
     将多个文本按句子分割成块，支持重叠和跨文本合并
@@ -194,6 +196,7 @@ def split_multiple_texts_on_sentences(
         texts: 包含多个文本和元数据的字典列表
         tokenizer: 用于计算token长度的分词器
         tick: 进度回调（可选）
+        assign_ids: 是否分配切片ID（子进程中切片时为False，由主进程统一分配）
     
     Returns:
         List[ChunkText]: 生成的分块结果
@@ -202,10 +205,6 @@ def split_multiple_texts_on_sentences(
         return []
     
     # 初始化
-    generator = DailySequentialIDGenerator.get_instance(
-        auto_persist_every=100,
-        min_persist_interval=0.5
-    )
     result = []
     
     current_chunk = []      # 当前块的句子列表
@@ -229,7 +228,7 @@ def split_multiple_texts_on_sentences(
                 
             # 分句并预计算token长度
             sentences = split_sentences(doc['text'], config)
-            sentence_sizes = [len(tokenizer.encode(s)) for s in sentences]
+            sentence_sizes = tokenizer.count_tokens_batch(sentences) # type: ignore
             
             # 检查整个文本是否适合当前块
             total_text_size = sum(sentence_sizes)
@@ -254,7 +253,7 @@ def split_multiple_texts_on_sentences(
                     # 保存当前块
                     if current_chunk:
                         result.append(create_chunk(
-                            current_chunk, current_sizes, current_metadata_list, generator
+                            current_chunk, current_sizes, current_metadata_list
                         ))
                     
                     # 处理重叠
@@ -281,13 +280,17 @@ def split_multiple_texts_on_sentences(
         # 处理最后一个块
         if current_chunk:
             result.append(create_chunk(
-                current_chunk, current_sizes, current_metadata_list, generator # type: ignore
+                current_chunk, current_sizes, current_metadata_list # type: ignore
             ))
             
     except Exception as e:
         log.error(f"Chunking failed: {e}", exc_info=True)
         raise
     
+    if assign_ids:
+        # 整个文档的ID一次性预留
+        assign_chunk_ids(result)
+
     if tick:
         tick(len(texts))
     
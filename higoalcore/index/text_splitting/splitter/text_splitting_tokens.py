@@ -20,7 +20,7 @@ from higoalutils.logger.progress import ProgressTicker
 from higoalcore.config.models.chunking_config import ChunkingConfig
 from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalutils.language_model.tokenizer.base import Tokenizer
-from higoalcore.index.text_splitting.chunk_text.sequential_id import DailySequentialIDGenerator
+from higoalcore.index.text_splitting.chunk_text.sequential_id import assign_chunk_ids
 
 
 log = logging.getLogger(__name__)
@@ -29,7 +29,8 @@ def split_single_text_on_tokens(
     config: ChunkingConfig,
     doc:dict, 
     tokenizer: Tokenizer, 
-    tick: ProgressTicker | None = None
+    tick: ProgressTicker | None = None,
+    assign_ids: bool = True
 ) -> list[ChunkText]:
     """Split a single text and return chunks using the tokenizer."""
     result = []
@@ -38,12 +39,6 @@ def split_single_text_on_tokens(
     
     input_ids = tokenizer.encode(doc['text'])
 
-    # 初始化一个ID生成器，默认key＝'default'
-    generator = DailySequentialIDGenerator.get_instance(
-        auto_persist_every=100,
-        min_persist_interval=0.5
-    )
-
     source_doc_title = doc.get('title','')
     source_doc_filename = doc.get('filename','')
     creation_date = doc.get('creation_date','')
@@ -59,7 +54,7 @@ def split_single_text_on_tokens(
         chunk_text = tokenizer.decode(list(chunk_ids))
         #result.append(chunk_text)  # Append chunked text as string
         chunk = ChunkText(
-            id=generator.generate_id(key="default"),
+            id="",
             text=chunk_text,
             source_doc_id=source_doc_id,
             filename=source_doc_filename,
@@ -74,12 +69,16 @@ def split_single_text_on_tokens(
         cur_idx = min(start_idx + config.size, len(input_ids))
         chunk_ids = input_ids[start_idx:cur_idx]
 
+    if assign_ids:
+        # 整个文档的ID一次性预留
+        assign_chunk_ids(result)
     return result
 def split_multiple_texts_on_tokens(
     config: ChunkingConfig,
     texts: list[dict], 
     tokenizer: Tokenizer, 
-    tick: ProgressTicker | None = None
+    tick: ProgressTicker | None = None,
+    assign_ids: bool = True
 ) -> list[ChunkText]:
     """Split multiple texts and return chunks with metadata using the tokenizer."""
     result = []
@@ -88,12 +87,6 @@ def split_multiple_texts_on_tokens(
     if not texts:
         return result
 
-    # 初始化一个ID生成器，默认key＝'default'
-    generator = DailySequentialIDGenerator.get_instance(
-        auto_persist_every=100,
-        min_persist_interval=0.5
-    )
-
     for doc in texts:
         encoded = tokenizer.encode(doc['text'])
         if tick:
@@ -116,7 +109,7 @@ def split_multiple_texts_on_tokens(
         doc_indices = list({source_doc_title for source_doc_title, _ in chunk_ids})
         #result.append(TextChunk(chunk_text, doc_indices, len(chunk_ids)))
         chunk = ChunkText(
-            id=generator.generate_id(key="default"),
+            id="",
             text=chunk_text,
             source_doc_id=source_doc_id,
             filename=source_doc_filename,
@@ -131,4 +124,7 @@ def split_multiple_texts_on_tokens(
         cur_idx = min(start_idx + config.size, len(input_ids))
         chunk_ids = input_ids[start_idx:cur_idx]
 
+    if assign_ids:
+        # 整个文档的ID一次性预留
+        assign_chunk_ids(result)
     return result
@@ -14,80 +14,115 @@
 
 """工作流：加载文件、切片，并存入向量数据库。"""
 
-from typing import List
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
 import asyncio
+import logging
 
 from higoalcore.config.models.core_config import CoreConfig
 from higoalcore.index.text_splitting.chunking_maker import ChunkingFactory
 from higoalutils.database.relational_database.manager import DBEngineManager
 from higoalcore.database.kgdataloader import KGDataLoader
 from higoalcore.database.kg_vector_store import KGVectorStore
-from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
 from higoalutils.logger.base import ProgressLogger
-from higoalutils.utils.time_utils.date_uitility import DateUtility
 from higoalutils.config.models.system_config import SystemConfig
 from higoalutils.logger.progress import ProgressTicker
+from higoalcore.index.workflow.index_manifest import IndexChanges, IndexManifest
+from higoalcore.index.workflow.index_pipeline import IndexPipeline
+
+
+log = logging.getLogger(__name__)
 
 
 async def extract_docs(
     sys_config: SystemConfig,
     core_config: CoreConfig,
     progress_reporter: ProgressLogger | None = None,
+    incremental: bool = False,
 ) -> None:
-    
-    # 获取chunks
+    """
+    以流式流水线加载、切片输入文件并分批写入向量数据库与关系型数据库
+    args:
+        incremental: 增量模式，只处理新增或内容变化的文件，并删除已删除/已变化文件的旧数据
+    """
+    input_config = core_config.input_config
     chunking_logger = progress_reporter.child("📥 Loading & Chunking") if progress_reporter else None
-    chunk_loader = ChunkingFactory(core_config.input_config, core_config.chunk_config, chunking_logger)
-    chunks = await chunk_loader.run()
+    chunk_loader = ChunkingFactory(input_config, core_config.chunk_config, chunking_logger)
 
-    # 将chunks写入到向量数据库
-    vectordb_logger = progress_reporter.child("📦 Writing to VectorDB", transient=False) if progress_reporter else None
-    ticker_v = ProgressTicker(vectordb_logger, num_total=1)
+    # 全量索引不读取旧清单（所有文件视为新增），并随写入进度重建清单，供后续增量索引使用
+    manifest = IndexManifest(Path(input_config.root_dir) / input_config.manifest_file)
+    if incremental:
+        manifest.load()
+    changes = await manifest.diff(chunk_loader.storage, chunk_loader.find_files())
+
+    data_loader = KGDataLoader(DBEngineManager().get_sessionmaker())
     vector_store = KGVectorStore(sys_config.embedding_config)
-    await vector_store.chunk_operator.upsert_chunk(chunks)
-    ticker_v()
-    ticker_v.done()
 
-    # 将chunks写入到关系型数据库
-    rdb_logger = progress_reporter.child("🗃️ Writing to RDB", transient=False) if progress_reporter else None
-    ticker_r = ProgressTicker(rdb_logger, num_total=1)
-    await _store_docs_chunks_to_rdb(chunks)
-    ticker_r()
-    ticker_r.done()
+    if incremental:
+        log.info(
+            "Incremental index: %d added, %d changed, %d removed, %d unchanged",
+            len(changes.added), len(changes.changed), len(changes.removed), len(changes.unchanged),
+        )
+        await _remove_stale_documents(changes, manifest, data_loader, vector_store)
+        for file in changes.unchanged:
+            # 仅mtime变化的文件更新指纹
+            fingerprint = changes.fingerprints[file]
+            manifest.record(file, fingerprint, fingerprint.doc_ids)
+    manifest.save()
+    if incremental and not changes.to_index:
+        return
+
+    def on_batch_done(completed_files: Dict[str, List[str]]) -> None:
+        # 每个批次持久化后记录已完成的文件，中途失败时重新运行增量索引即可从断点继续
+        for file, doc_ids in completed_files.items():
+            manifest.record(file, changes.fingerprints[file], doc_ids)
+        manifest.save()
+
+    pipeline_logger = progress_reporter.child("📦 Embedding & Writing", transient=False) if progress_reporter else None
+    ticker = ProgressTicker(pipeline_logger, num_total=len(changes.to_index))
+    pipeline = IndexPipeline(
+        chunk_loader=chunk_loader,
+        chunk_operator=vector_store.chunk_operator,
+        data_loader=data_loader,
+        config=core_config.pipeline_config,
+        overwrite=not incremental,
+        on_batch_done=on_batch_done,
+        ticker=ticker,
+    )
+    num_chunks = await pipeline.run(include_files=changes.to_index if incremental else None)
+    ticker.done()
+    log.info(f"Indexed {num_chunks} chunks from {len(changes.to_index)} files")
     await asyncio.sleep(0.1)
-    
 
-async def _store_docs_chunks_to_rdb(chunks: List[ChunkText]):
-    """将documents与chunks写入到关系型数据库"""
-    utils_datetime = DateUtility()
-    records = []
-    documents = []
-    doc_id = ""
-    for chunk in chunks:
-        title = chunk.attributes.get("title", "")
-        if isinstance(title, list):
-            title = ', '.join(title)
-        if doc_id != chunk.source_doc_id:
-            document = {
-                "id": chunk.source_doc_id,
-                "filename": chunk.filename,
-                "title": title,
-                "creation_date": chunk.attributes.get("creation_date", ""),
-                "extracted_date": utils_datetime.now_timezone(),
-            }
-            documents.append(document)
-            doc_id = chunk.source_doc_id
 
-        record = {
-            "id": chunk.id,
-            "text": chunk.text,
-            "source_doc_id": chunk.source_doc_id,
-            "filename": chunk.filename,
-            "title": title,
-            "filename": chunk.filename, 
-            "creation_date": chunk.attributes.get("creation_date", ""),
-        }
-        records.append(record)
-    sessionmaker = DBEngineManager().get_sessionmaker()
-    data_loader = KGDataLoader(sessionmaker)
-    await data_loader.write_all(documents, records)
\ No newline at end of file
+async def _remove_stale_documents(
+    changes: IndexChanges,
+    manifest: IndexManifest,
+    data_loader: KGDataLoader,
+    vector_store: KGVectorStore,
+) -> None:
+    """删除已删除/已变化文件在向量库与关系库中的旧文档"""
+    stale_doc_ids = []
+    for file in changes.removed + changes.changed:
+        stale_doc_ids.extend(manifest.files[file].doc_ids)
+    # 清单中没有记录（如首次增量运行或上次中途失败）的文件，按文件名查找之前入库的文档。
+    # 文档表只记录文件名，因此仅当文件名在新增文件中唯一、且查到的文档不属于清单中其他文件时才视为旧数据，
+    # 避免不同目录下的同名文件误删彼此的文档
+    owned_doc_ids = {doc_id for fingerprint in manifest.files.values() for doc_id in fingerprint.doc_ids}
+    added_names = Counter(Path(file).name for file in changes.added)
+    for file in changes.added:
+        filename = Path(file).name
+        if added_names[filename] > 1:
+            continue
+        processed = await data_loader.loader.check_file_processed(filename)
+        doc_id = processed["document_id"]
+        if doc_id and doc_id not in owned_doc_ids:
+            stale_doc_ids.append(doc_id)
+
+    stale_doc_ids = list(dict.fromkeys(stale_doc_ids))
+    if stale_doc_ids:
+        await vector_store.chunk_operator.delete_chunks_by_doc_ids(stale_doc_ids)
+        deleted = await data_loader.delete_all(stale_doc_ids)
+        log.info(f"Removed stale documents: {deleted}")
+    manifest.forget(changes.removed + changes.changed)
@@ -0,0 +1,137 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""增量索引清单：记录每个输入文件的指纹（mtime、大小、内容哈希）及其生成的文档ID。"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, List
+
+from higoalutils.storage.file_pipeline_storage import FilePipelineStorage
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class FileFingerprint:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    doc_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IndexChanges:
+    """与上次索引相比的文件变化"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    fingerprints: Dict[str, FileFingerprint] = field(default_factory=dict)
+
+    @property
+    def to_index(self) -> List[str]:
+        """需要重新切片与嵌入的文件"""
+        return self.added + self.changed
+
+
+class IndexManifest:
+    """增量索引清单，以JSON文件持久化"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.files: Dict[str, FileFingerprint] = {}
+
+    def load(self) -> "IndexManifest":
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                log.warning(f"Ignoring index manifest {self.path} with unsupported version {data.get('version')}")
+                return self
+            self.files = {
+                key: FileFingerprint(**value)
+                for key, value in data.get("files", {}).items()
+            }
+        except Exception as e:
+            log.warning(f"Failed to read index manifest {self.path}, treating all files as new: {e}")
+            self.files = {}
+        return self
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {key: asdict(value) for key, value in sorted(self.files.items())},
+        }
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    async def diff(self, storage: FilePipelineStorage, files: List[str]) -> IndexChanges:
+        """
+        对比当前文件与清单。mtime与大小都未变化时直接视为未变化，
+        否则再比较内容哈希（仅被touch过的文件不会重新索引）
+        """
+        changes = IndexChanges()
+        for file in files:
+            previous = self.files.get(file)
+            stat = storage.stat(file)
+            if previous and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+                changes.unchanged.append(file)
+                changes.fingerprints[file] = previous
+                continue
+
+            content_hash = await file_content_hash(storage, file)
+            fingerprint = FileFingerprint(
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                content_hash=content_hash,
+                doc_ids=previous.doc_ids if previous else [],
+            )
+            changes.fingerprints[file] = fingerprint
+            if previous is None:
+                changes.added.append(file)
+            elif previous.content_hash == content_hash:
+                changes.unchanged.append(file)
+            else:
+                changes.changed.append(file)
+
+        current = set(files)
+        changes.removed = [file for file in self.files if file not in current]
+        return changes
+
+    def record(self, file: str, fingerprint: FileFingerprint, doc_ids: List[str]) -> None:
+        """记录成功写入的文件；未产生任何chunk（空文件或加载失败）的文件不记录，下次继续尝试"""
+        if doc_ids:
+            fingerprint.doc_ids = doc_ids
+            self.files[file] = fingerprint
+        else:
+            self.files.pop(file, None)
+
+    def forget(self, files: List[str]) -> None:
+        for file in files:
+            self.files.pop(file, None)
+
+
+async def file_content_hash(storage: FilePipelineStorage, file: str) -> str:
+    content = await storage.get(file, as_bytes=True)
+    return sha256(content or b"", usedforsecurity=False).hexdigest()
+
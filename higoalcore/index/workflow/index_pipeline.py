@@ -0,0 +1,173 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+流式索引流水线：加载/切片 → 批量嵌入 → 写入向量库与关系库。
+
+各阶段是独立的协程，通过有界队列衔接：下游处理不过来时上游在 put 处等待（背压），
+因此内存中最多只有 queue_size 个左右的批次，且每个批次写库后即持久化。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Dict, List
+
+from higoalcore.config.models.pipeline_config import IndexPipelineConfig
+from higoalcore.database.kgdataloader import KGDataLoader
+from higoalcore.database.vector_store.ops_chunk import ChunkOperator
+from higoalcore.index.text_splitting.chunk_text.chunk_text import ChunkText
+from higoalcore.index.text_splitting.chunking_maker import ChunkingFactory
+from higoalutils.database.vector_store.base import VectorStoreDocument
+from higoalutils.logger.progress import ProgressTicker
+from higoalutils.utils.time_utils.date_uitility import DateUtility
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Batch:
+    chunks: List[ChunkText]
+    completed_files: Dict[str, List[str]]
+    """最后一个chunk落在本批次的文件 -> 其文档ID列表"""
+    docs: List[VectorStoreDocument] = field(default_factory=list)
+
+
+class IndexPipeline:
+    """有界的 生产者/消费者 索引流水线"""
+
+    def __init__(
+        self,
+        chunk_loader: ChunkingFactory,
+        chunk_operator: ChunkOperator,
+        data_loader: KGDataLoader,
+        config: IndexPipelineConfig,
+        overwrite: bool = True,
+        on_batch_done: Callable[[Dict[str, List[str]]], None] | None = None,
+        ticker: ProgressTicker | None = None,
+    ):
+        """
+        args:
+            chunk_loader: 输入文件加载与切片
+            chunk_operator: 文本块嵌入与向量库写入
+            data_loader: 关系库写入
+            config: 批大小与队列长度
+            overwrite: 第一个批次是否覆盖向量表（全量索引）
+            on_batch_done: 每个批次写库完成后回调，参数为本批次完成的 文件 -> 文档ID列表
+            ticker: 每完成一个文件 tick 一次
+        """
+        self.chunk_loader = chunk_loader
+        self.chunk_operator = chunk_operator
+        self.data_loader = data_loader
+        self.batch_size = max(1, config.batch_size)
+        self.queue_size = max(1, config.queue_size)
+        self.overwrite = overwrite
+        self.on_batch_done = on_batch_done
+        self.ticker = ticker
+        self.num_chunks = 0
+
+    async def run(self, include_files: Collection[str] | None = None) -> int:
+        """运行流水线，返回写入的chunk数"""
+        embed_queue: asyncio.Queue[_Batch | None] = asyncio.Queue(maxsize=self.queue_size)
+        sink_queue: asyncio.Queue[_Batch | None] = asyncio.Queue(maxsize=self.queue_size)
+        tasks = [
+            asyncio.create_task(self._produce(embed_queue, include_files)),
+            asyncio.create_task(self._embed(embed_queue, sink_queue)),
+            asyncio.create_task(self._sink(sink_queue)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 任一阶段失败时取消其它阶段，避免其阻塞在队列上；已写库的批次保留
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return self.num_chunks
+
+    async def _produce(self, out_queue: asyncio.Queue, include_files: Collection[str] | None) -> None:
+        """按文件加载与切片，在文档边界处按 batch_size 切分批次（同一文档的chunk不会跨批次）"""
+        pending: List[ChunkText] = []
+        completed: Dict[str, List[str]] = {}
+        async for file, file_chunks in self.chunk_loader.iter_chunks(include_files):
+            for chunk in file_chunks:
+                if len(pending) >= self.batch_size and chunk.source_doc_id != pending[-1].source_doc_id:
+                    await out_queue.put(_Batch(pending, completed))
+                    pending, completed = [], {}
+                pending.append(chunk)
+            completed[file] = list(dict.fromkeys(chunk.source_doc_id for chunk in file_chunks))
+            if len(pending) >= self.batch_size:
+                await out_queue.put(_Batch(pending, completed))
+                pending, completed = [], {}
+        if pending or completed:
+            await out_queue.put(_Batch(pending, completed))
+        await out_queue.put(None)
+
+    async def _embed(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue) -> None:
+        while (batch := await in_queue.get()) is not None:
+            if batch.chunks:
+                batch.docs = await self.chunk_operator.embed_chunks(batch.chunks)
+            await out_queue.put(batch)
+        await out_queue.put(None)
+
+    async def _sink(self, in_queue: asyncio.Queue) -> None:
+        overwrite_pending = self.overwrite
+        while (batch := await in_queue.get()) is not None:
+            if batch.chunks:
+                await self.chunk_operator.aload_vector_docs(batch.docs, overwrite_pending)
+                overwrite_pending = False
+                await store_docs_chunks_to_rdb(self.data_loader, batch.chunks)
+                self.num_chunks += len(batch.chunks)
+
+            if self.on_batch_done:
+                self.on_batch_done(batch.completed_files)
+            if self.ticker:
+                self.ticker(len(batch.completed_files))
+
+        if overwrite_pending:
+            # 没有任何chunk时也要按全量索引的语义清空向量表
+            await self.chunk_operator.aload_vector_docs([], True)
+
+
+async def store_docs_chunks_to_rdb(data_loader: KGDataLoader, chunks: List[ChunkText]):
+    """将documents与chunks写入到关系型数据库"""
+    utils_datetime = DateUtility()
+    records = []
+    documents = []
+    doc_id = ""
+    for chunk in chunks:
+        title = chunk.attributes.get("title", "")
+        if isinstance(title, list):
+            title = ', '.join(title)
+        if doc_id != chunk.source_doc_id:
+            document = {
+                "id": chunk.source_doc_id,
+                "filename": chunk.filename,
+                "title": title,
+                "creation_date": chunk.attributes.get("creation_date", ""),
+                "extracted_date": utils_datetime.now_timezone(),
+            }
+            documents.append(document)
+            doc_id = chunk.source_doc_id
+
+        record = {
+            "id": chunk.id,
+            "text": chunk.text,
+            "source_doc_id": chunk.source_doc_id,
+            "filename": chunk.filename,
+            "title": title,
+            "creation_date": chunk.attributes.get("creation_date", ""),
+        }
+        records.append(record)
+    await data_loader.write_all(documents, records)
@@ -24,7 +24,8 @@ class PreloadManager:
         await preload_engine.start_up()
 
     async def clean_up(self):
-        await preload_utils.clean_up()
+        # 先停止引擎的后台任务（会用到数据库连接），再关闭数据库
         await preload_engine.clean_up()
+        await preload_utils.clean_up()
 
 preload_manager = PreloadManager()
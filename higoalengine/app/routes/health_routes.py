@@ -14,6 +14,8 @@
 
 from fastapi import APIRouter
 
+from higoalengine.app.tasks.scheduler import task_scheduler
+
 
 router = APIRouter()
 
@@ -23,4 +25,9 @@ async def ping():
 
 @router.get("/")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@router.get("/scheduler")
+async def scheduler_stats():
+    """回答生成任务的队列深度与执行情况"""
+    return task_scheduler.stats()
\ No newline at end of file
@@ -14,7 +14,6 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
-import asyncio
 
 from higoalutils.database.relational_database.dependencies import get_db_session_ws
 from higoalutils.database.memory_store.dependencies import get_store_dep_ws
@@ -22,6 +21,7 @@ from higoalutils.database.memory_store.base import MemoryStoreBase
 from higoalutils.utils.code_utils.uuid import gen_uuid
 from higoalengine.database.models import UserQATask, UserQuery
 from higoalengine.app.tasks.qa_tasks import generate_answer
+from higoalengine.app.tasks.scheduler import TaskRejected, task_scheduler
 from higoalengine.config.enums.task_type import TaskStatusType, ResponseType
 from higoalengine.app.routes.websocket.dispatcher import WSDispatcher
 from higoalengine.app.routes.websocket.utils import cleanup_task_cache_except_result_and_status
@@ -45,25 +45,42 @@ async def handle_create(
     session: Annotated[AsyncSession, WSDepends(get_db_session_ws)] # 当前写法需要手动关闭连接池，到时候统一成fastapi的写法
 ):
     task_id = gen_uuid()
+    priority = task_scheduler.priority_of(req.user_id)
 
     print(req)
 
     async with session.begin():
-        session.add(UserQATask(task_id=task_id, user_id=req.user_id, status=TaskStatusType.PENDING))
+        session.add(UserQATask(task_id=task_id, user_id=req.user_id, priority=priority, status=TaskStatusType.PENDING))
         session.add(UserQuery(task_id=task_id, query_text=req.query))
 
     await memory_store.set(f"task:{task_id}:status", TaskStatusType.PENDING)
 
     model_name = get_model_info().get_by_id(req.model).model_name
-    
-    asyncio.create_task(generate_answer(task_id, req.query, model_name))
+
+    # 有界调度：名额用完时排队，队列满时拒绝
+    try:
+        waiting = task_scheduler.submit(
+            task_id,
+            req.user_id,
+            lambda: generate_answer(task_id, req.query, model_name),
+            priority=priority,
+        )
+    except TaskRejected as e:
+        print(f"⚠️ 任务 {task_id} 被拒绝: {e}")
+        await memory_store.set(f"task:{task_id}:status", TaskStatusType.FAILED)
+        async with session.begin():
+            task = await session.get(UserQATask, task_id)
+            if task:
+                task.status = TaskStatusType.FAILED
+        await wsconn.send_error(message="当前请求过多，请稍后重试", code=503)
+        return
 
     await wsconn.send_json(
         MessageResponse(
             type=ResponseType.STATUS,
             task_id=task_id,
             status=TaskStatusType.PENDING
-        ), code=200,message="AI正在思考中...")
+        ), code=200,message=f"排队中，前面还有 {waiting} 个任务..." if waiting else "AI正在思考中...")
     
     streamer = TaskStreamer(
         memory_store=memory_store,
@@ -86,6 +103,8 @@ async def handle_cancel(
     task_id = req.task_id
 
     await memory_store.set(f"task:{task_id}:status", TaskStatusType.CANCELLED)
+    # 排队中的任务直接出队，执行中的任务取消其协程
+    await task_scheduler.cancel(task_id)
     try:
         async with session.begin():
             task = await session.get(UserQATask, task_id)
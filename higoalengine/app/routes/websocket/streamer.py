@@ -19,6 +19,8 @@ from higoalengine.config.models.api_models import *
 from higoalengine.app.routes.websocket.connection_socketio import SocketIOConnection
 from higoalengine.config.models.api_chunk_models import StreamChunk, FullResult
 from higoalengine.app.routes.websocket.utils import cleanup_task_cache_except_result_and_status
+from higoalengine.app.tasks.task_cache import task_cache_janitor, task_key
+from higoalengine.config.load_config import get_engine_config
 
 
 class TaskStreamer:
@@ -30,6 +32,7 @@ class TaskStreamer:
         stream: bool = False,
         poll_interval: float = 0.5,
         timeout: float = 30.0,
+        block_timeout: float = 2.0,
     ):
         self.store = memory_store
         self.task_id = task_id
@@ -37,11 +40,12 @@ class TaskStreamer:
         self.stream = stream
         self.poll_interval = poll_interval
         self.timeout = timeout
+        # 流式模式下单次阻塞读取消息流的最长等待时间，超时后检查连接与任务状态
+        self.block_timeout = block_timeout
 
-        self.chunk_key = lambda i: f"task:{task_id}:chunk:{i}"
-        self.max_key = f"task:{task_id}:chunk:max"
-        self.status_key = f"task:{task_id}:status"
-        self.result_key = f"task:{task_id}:result"
+        self.stream_key = task_key(task_id, "chunks")
+        self.status_key = task_key(task_id, "status")
+        self.result_key = task_key(task_id, "result")
 
     async def streaming(self):
         """统一处理流式与非流式推送"""
@@ -51,15 +55,49 @@ class TaskStreamer:
             await self._stream_result()
 
     async def _stream_chunks(self):
-        """流式推送模式"""
+        """
+        流式推送模式：阻塞读取任务的消息流，片段写入后立即推送；
+        读取失败时按 subpub_max_retry / subpub_retry_delay 重试，从最后收到的消息ID继续读取
+        """
+        cfg = get_engine_config().memory_config
         index = 1
+        last_id = "0"
+        retries = 0
         try:
             while True:
                 if self.wsconn.closed:
                     raise RuntimeError("WebSocket 已关闭")
 
-                cached = await self.store.get(self.chunk_key(index))
-                if cached:
+                try:
+                    entries = await self.store.stream_read(self.stream_key, last_id, block=self.block_timeout)
+                    retries = 0
+                except Exception as e:
+                    retries += 1
+                    if retries > cfg.subpub_max_retry:
+                        raise
+                    print(f"⚠️ 读取消息流失败，{cfg.subpub_retry_delay} 秒后从 {last_id} 重试: {e}")
+                    await asyncio.sleep(cfg.subpub_retry_delay)
+                    continue
+
+                if not entries:
+                    # 等待超时仍无新片段：任务已结束（最后一个片段已推送）、失败或被取消时不再等待
+                    status = await self.store.get(self.status_key)
+                    if status == TaskStatusType.SUCCEEDED:
+                        # 最后的片段先于成功状态写入，可能恰好落在阻塞读取超时与读取状态之间，结束前再立即读取一次
+                        entries = await self.store.stream_read(self.stream_key, last_id)
+                        if not entries:
+                            print(f"✅ 任务 task_id={self.task_id} 流式完成")
+                            break
+                    elif status in (None, TaskStatusType.FAILED, TaskStatusType.CANCELLED):
+                        await self.wsconn.send_error(
+                            message=f"任务已{status}，无法获取结果" if status else "任务不存在或状态丢失",
+                            code=500 if status else 404
+                        )
+                        break
+                    else:
+                        continue
+
+                for last_id, cached in entries:
                     chunk = StreamChunk.from_memory(cached)
                     if chunk.chunk_index != index:
                         raise RuntimeError(f"Chunk 序号不连续，期望 {index}，但收到 {chunk.chunk_index}")
@@ -69,9 +107,7 @@ class TaskStreamer:
 
                     if chunk.is_final:
                         print(f"✅ 任务 task_id={self.task_id} 流式完成")
-                        break
-                else:
-                    await asyncio.sleep(self.poll_interval)
+                        return
 
         except Exception as e:
             print(f"⚠️ 流式推送中断: {e}")
@@ -83,7 +119,7 @@ class TaskStreamer:
             except Exception:
                 pass
         finally:
-            await cleanup_task_cache_except_result_and_status(self.store, self.task_id)
+            await self._cleanup()
 
     async def _stream_result(self):
         """非流式推送模式"""
@@ -154,4 +190,9 @@ class TaskStreamer:
             except Exception:
                 pass
         finally:
-            await cleanup_task_cache_except_result_and_status(self.store, self.task_id)
\ No newline at end of file
+            await self._cleanup()
+
+    async def _cleanup(self):
+        """交给后台批量清理，未运行时直接清理"""
+        if not task_cache_janitor.schedule(self.task_id):
+            await cleanup_task_cache_except_result_and_status(self.store, self.task_id)
@@ -13,23 +13,11 @@
 # limitations under the License.
 
 from higoalutils.database.memory_store.base import MemoryStoreBase
-from higoalengine.config.load_config import get_engine_config
+from higoalengine.app.tasks.task_cache import task_temp_keys
 
 
-cfg = get_engine_config().memory_config
-
 async def cleanup_task_cache_except_result_and_status(memory_store: MemoryStoreBase, task_id: str):
-    """清理除 result 和 status 以外的所有 task缓存"""
-    prefix = f"task:{task_id}:"
-    preserve_keys = {f"{prefix}status", f"{prefix}result"}
-    keys_to_delete = []
-
-    async for key in memory_store.scan_iter(match=f"{prefix}*"):
-        if key not in preserve_keys:
-            keys_to_delete.append(key)
-
-    if keys_to_delete:
-        await memory_store.delete(*keys_to_delete)
-        print(f"🧹 清理完成，删除 {len(keys_to_delete)} 个键: {keys_to_delete}")
-    else:
-        print("ℹ️ 无需清理：无临时键")
\ No newline at end of file
+    """清理除 result 和 status 以外的所有 task缓存：一次删除登记的临时键"""
+    keys_to_delete = task_temp_keys(task_id)
+    await memory_store.delete(*keys_to_delete)
+    print(f"🧹 清理完成，删除 {len(keys_to_delete)} 个键: {keys_to_delete}")
\ No newline at end of file
@@ -0,0 +1,182 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+回答生成任务的有界调度器。
+
+- 同时执行的任务数不超过 max_workers，其余任务在队列中等待；队列满时拒绝新任务（TaskRejected）
+- 队列按优先级（UserQATask.priority，大者优先）排序，同优先级先到先执行；优先级由服务端按用户配置决定
+- 每个用户同时执行的任务数不超过 max_tasks_per_user，超出的任务留在队列中，不占用执行名额
+- 保存执行中任务的句柄：取消时直接取消其协程，排队中的任务则从队列中移除
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Set
+
+from higoalengine.config.load_config import get_engine_config
+
+
+class TaskRejected(Exception):
+    """队列已满，任务未被接受"""
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    sort_key: tuple[int, int]
+    """(-优先级, 提交序号)"""
+    task_id: str = field(compare=False)
+    user_id: str = field(compare=False)
+    run: Callable[[], Awaitable[None]] = field(compare=False)
+    submitted_at: float = field(compare=False, default_factory=time.monotonic)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class TaskScheduler:
+    """事件驱动的有界任务池：任务提交或结束时从队列中启动可执行的任务"""
+
+    def __init__(self):
+        cfg = get_engine_config().scheduler_config
+        self.max_workers = max(1, cfg.max_workers)
+        self.max_queue_size = max(0, cfg.max_queue_size)
+        self.max_tasks_per_user = max(1, cfg.max_tasks_per_user)
+        self.user_priorities = dict(cfg.user_priorities)
+
+        self._queue: List[_QueuedTask] = []
+        self._queued: Dict[str, _QueuedTask] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_by_user: Dict[str, int] = {}
+        self._cancelling: Set[str] = set()
+        self._sequence = itertools.count()
+        self._counters: Dict[str, int] = dict.fromkeys(
+            ("submitted", "rejected", "completed", "failed", "cancelled"), 0
+        )
+        self._total_wait = 0.0
+        self._started = 0
+
+    def priority_of(self, user_id: str) -> int:
+        """用户任务的优先级（由配置决定，不接受客户端指定）"""
+        return self.user_priorities.get(user_id, 0)
+
+    def submit(
+        self,
+        task_id: str,
+        user_id: str,
+        run: Callable[[], Awaitable[None]],
+        priority: int = 0,
+    ) -> int:
+        """
+        提交任务，run 在获得执行名额时才被调用（创建协程）。
+        returns:
+            提交后排在该任务之前的任务数（执行中的任务及队列中优先级更高或同优先级先提交的任务），0 表示已立即开始执行
+        """
+        if len(self._queued) >= self.max_queue_size and not self._can_start(user_id):
+            self._counters["rejected"] += 1
+            raise TaskRejected(f"Task queue is full ({len(self._queued)} waiting)")
+        item = _QueuedTask((-priority, next(self._sequence)), task_id, user_id, run)
+        heapq.heappush(self._queue, item)
+        self._queued[task_id] = item
+        self._counters["submitted"] += 1
+        self._dispatch()
+        if task_id in self._running:
+            return 0
+        return len(self._running) + sum(1 for queued in self._queued.values() if queued.sort_key < item.sort_key)
+
+    async def cancel(self, task_id: str) -> bool:
+        """取消排队中或执行中的任务，返回任务是否存在"""
+        item = self._queued.pop(task_id, None)
+        if item is not None:
+            item.cancelled = True
+            self._counters["cancelled"] += 1
+            return True
+        task = self._running.get(task_id)
+        if task is None:
+            return False
+        # 任务协程可能自行处理 CancelledError 并正常返回，因此在此记录，由 _on_done 计为取消
+        self._cancelling.add(task_id)
+        task.cancel()
+        await asyncio.wait([task])
+        return True
+
+    async def shutdown(self) -> None:
+        """清空队列并取消所有执行中的任务"""
+        for item in self._queued.values():
+            item.cancelled = True
+        self._queued.clear()
+        self._queue.clear()
+        tasks = list(self._running.values())
+        self._cancelling.update(self._running)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def stats(self) -> Dict[str, float]:
+        """队列深度、执行中任务数及累计计数"""
+        return {
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            **self._counters,
+            "avg_wait_seconds": round(self._total_wait / self._started, 3) if self._started else 0.0,
+        }
+
+    def _can_start(self, user_id: str) -> bool:
+        return len(self._running) < self.max_workers and self._running_by_user.get(user_id, 0) < self.max_tasks_per_user
+
+    def _dispatch(self) -> None:
+        """按优先级启动任务，直到名额用完；所属用户已达上限的任务放回队列"""
+        deferred = []
+        while self._queue and len(self._running) < self.max_workers:
+            item = heapq.heappop(self._queue)
+            if item.cancelled:
+                continue
+            if self._running_by_user.get(item.user_id, 0) >= self.max_tasks_per_user:
+                deferred.append(item)
+                continue
+            self._start(item)
+        for item in deferred:
+            heapq.heappush(self._queue, item)
+
+    def _start(self, item: _QueuedTask) -> None:
+        del self._queued[item.task_id]
+        self._total_wait += time.monotonic() - item.submitted_at
+        self._started += 1
+        task = asyncio.create_task(item.run(), name=f"task:{item.task_id}")
+        self._running[item.task_id] = task
+        self._running_by_user[item.user_id] = self._running_by_user.get(item.user_id, 0) + 1
+        task.add_done_callback(lambda done: self._on_done(item, done))
+
+    def _on_done(self, item: _QueuedTask, task: asyncio.Task) -> None:
+        self._running.pop(item.task_id, None)
+        self._running_by_user[item.user_id] -= 1
+        if self._running_by_user[item.user_id] <= 0:
+            del self._running_by_user[item.user_id]
+        if task.cancelled() or item.task_id in self._cancelling:
+            self._cancelling.discard(item.task_id)
+            self._counters["cancelled"] += 1
+        elif task.exception() is not None:
+            self._counters["failed"] += 1
+            print(f"❌ 任务 {item.task_id} 执行异常: {task.exception()}")
+        else:
+            self._counters["completed"] += 1
+        self._dispatch()
+
+
+task_scheduler = TaskScheduler()
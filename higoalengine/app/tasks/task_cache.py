@@ -0,0 +1,94 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+任务在内存存储中的键，以及已结束任务临时缓存的批量清理。
+
+每个任务的键都以 task:{task_id}: 开头。status 与 result 在任务结束后保留（按 result_retention_time 过期），
+其余为临时键，统一登记在 TASK_TEMP_KEYS 中：清理时直接删除这些键，不需要 SCAN 整个键空间。
+新增任务级的临时键时必须登记在这里。
+"""
+
+import asyncio
+from typing import List, Set
+
+from higoalengine.config.load_config import get_engine_config
+from higoalutils.database.memory_store.factory import MemoryStoreFactory
+
+TASK_TEMP_KEYS = ("chunks",)
+"""任务的临时键名：chunks 为回答片段的消息流"""
+
+
+def task_key(task_id: str, name: str) -> str:
+    return f"task:{task_id}:{name}"
+
+
+def task_temp_keys(task_id: str) -> List[str]:
+    return [task_key(task_id, name) for name in TASK_TEMP_KEYS]
+
+
+class TaskCacheJanitor:
+    """后台批量清理已结束任务的临时键：每 cleanup_interval 秒一次删除期间结束的所有任务的临时键"""
+
+    def __init__(self):
+        self._pending: Set[str] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台清理，并清理尚未处理的任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def schedule(self, task_id: str) -> bool:
+        """登记待清理的任务，未在运行时返回 False（由调用方自行清理）"""
+        if not self.running:
+            return False
+        self._pending.add(task_id)
+        return True
+
+    async def flush(self) -> None:
+        """每 cleanup_batch_size 个任务一次删除；删除失败的键由过期时间兜底"""
+        batch_size = max(1, get_engine_config().memory_config.cleanup_batch_size)
+        store = MemoryStoreFactory.get_store()
+        while self._pending:
+            batch = [self._pending.pop() for _ in range(min(batch_size, len(self._pending)))]
+            await store.delete(*[key for task_id in batch for key in task_temp_keys(task_id)])
+            print(f"🧹 批量清理完成，{len(batch)} 个任务的临时缓存")
+
+    async def _run(self) -> None:
+        interval = get_engine_config().memory_config.cleanup_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ 批量清理任务缓存失败: {e}")
+
+
+task_cache_janitor = TaskCacheJanitor()
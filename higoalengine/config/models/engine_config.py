@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from higoalengine.config.models.web_config import WebConfig
-from higoalengine.config.models.server_config import MemoryConfig
+from higoalengine.config.models.server_config import MemoryConfig, SchedulerConfig
 
 
 class EngineConfig(BaseModel):
     web_config: WebConfig 
-    memory_config: MemoryConfig
\ No newline at end of file
+    memory_config: MemoryConfig
+    scheduler_config: SchedulerConfig = Field(default_factory=SchedulerConfig)
\ No newline at end of file
@@ -12,10 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pydantic import BaseModel
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+class SchedulerConfig(BaseModel):
+    max_workers: int = Field(default=8, description="同时执行的回答生成任务数上限")
+    max_queue_size: int = Field(default=200, description="排队等待的任务数上限，超出时拒绝新任务")
+    max_tasks_per_user: int = Field(default=2, description="每个用户同时执行的任务数上限")
+    user_priorities: Dict[str, int] = Field(default_factory=dict, description="按用户ID配置的任务优先级（大者优先），未配置的用户为0")
 
 class MemoryConfig(BaseModel):
     result_retention_time: int
     task_timeout: int
     subpub_max_retry: int
-    subpub_retry_delay: float
\ No newline at end of file
+    subpub_retry_delay: float
+    cancel_check_interval: float = Field(default=0.5, description="流式输出时检查任务是否被取消的最小间隔（秒）")
+    cleanup_interval: float = Field(default=1.0, description="后台批量清理已结束任务临时缓存的间隔（秒）")
+    cleanup_batch_size: int = Field(default=500, description="批量清理时每次删除的任务数")
\ No newline at end of file
@@ -16,12 +16,16 @@ class PreloadEngine:
     def __init__(self):
         pass
     async def start_up(self):
-        pass
+        from higoalengine.app.tasks.task_cache import task_cache_janitor
+        task_cache_janitor.start()
 
     def load_config(self):
         pass
 
     async def clean_up(self):
-        pass
+        from higoalengine.app.tasks.scheduler import task_scheduler
+        from higoalengine.app.tasks.task_cache import task_cache_janitor
+        await task_scheduler.shutdown()
+        await task_cache_janitor.stop()
 
 preload_engine = PreloadEngine()
\ No newline at end of file
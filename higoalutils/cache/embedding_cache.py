@@ -0,0 +1,199 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+持久化的向量缓存：按 (文本哈希, 模型名, 维度) 寻址。
+
+向量以 float32 存放在内存映射文件中（每个 模型+维度 一个文件，按槽位定长存储），
+索引（key -> 槽位、最近使用时间）存放在 sqlite 中。容量满时按 LRU 复用槽位。
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_SQL_BATCH = 500
+_GROW_ROWS = 4096
+
+
+class EmbeddingCache:
+    """基于 float32 内存映射文件 + sqlite 索引的向量缓存"""
+
+    def __init__(self, base_dir: str, model_name: str, max_entries: int = 1_000_000):
+        """
+        args:
+            base_dir: 缓存根目录
+            model_name: 嵌入模型名称，作为缓存key的一部分
+            max_entries: 每个 模型+维度 最多缓存的向量条数，超出时淘汰最久未使用的条目
+        """
+        self.model_name = model_name
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._dir = Path(base_dir) / model_name.replace("/", "__")
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._dir / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT NOT NULL, dim INTEGER NOT NULL, slot INTEGER NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (key, dim))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries (dim, last_used)")
+        self._conn.commit()
+        self._vectors: Dict[int, np.memmap] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中/淘汰计数"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def dims(self) -> List[int]:
+        """缓存中已有条目的向量维度"""
+        with self._lock:
+            return [dim for (dim,) in self._conn.execute("SELECT DISTINCT dim FROM entries ORDER BY dim")]
+
+    def get_many(self, keys: List[str], dim: int) -> Dict[str, List[float]]:
+        """批量读取维度为 dim 的向量，返回命中的 key -> 向量"""
+        if not keys:
+            return {}
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            rows = []
+            for start in range(0, len(keys), _SQL_BATCH):
+                part = keys[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(part))
+                rows.extend(self._conn.execute(
+                    f"SELECT key, slot FROM entries WHERE dim = ? AND key IN ({placeholders})", [dim, *part]
+                ).fetchall())
+
+            now = time.time()
+            vectors = self._open_vectors(dim)
+            for key, slot in rows:
+                if slot < len(vectors):
+                    found[key] = vectors[slot].tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ? AND dim = ?",
+                    [(now, key, dim) for key in found],
+                )
+                self._conn.commit()
+
+        unique = set(keys)
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        """批量写入 key -> 向量，空向量不缓存"""
+        by_dim: Dict[int, Dict[str, List[float]]] = {}
+        for key, vector in items.items():
+            if vector:
+                by_dim.setdefault(len(vector), {})[key] = vector
+        with self._lock:
+            for dim, dim_items in by_dim.items():
+                self._set_dim(dim, dim_items)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """刷新内存映射并关闭索引"""
+        with self._lock:
+            for vectors in self._vectors.values():
+                vectors.flush()
+            self._vectors.clear()
+            self._conn.close()
+
+    def _set_dim(self, dim: int, items: Dict[str, List[float]]) -> None:
+        """写入同一维度的向量（假设已持有锁）"""
+        keys = list(items.keys())
+        slots: Dict[str, int] = {}
+        # 已存在的key原地覆盖
+        for start in range(0, len(keys), _SQL_BATCH):
+            part = keys[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(part))
+            for key, slot in self._conn.execute(
+                f"SELECT key, slot FROM entries WHERE dim = ? AND key IN ({placeholders})", [dim, *part]
+            ):
+                slots[key] = slot
+
+        new_keys = [key for key in keys if key not in slots][: self.max_entries]
+        if new_keys:
+            count, next_slot = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(slot) + 1, 0) FROM entries WHERE dim = ?", (dim,)
+            ).fetchone()
+            free = max(0, self.max_entries - count)
+            fresh = new_keys[:free]
+            for i, key in enumerate(fresh):
+                slots[key] = next_slot + i
+
+            to_evict = len(new_keys) - len(fresh)
+            if to_evict:
+                # 本批次中原地覆盖的key不能被淘汰（否则其槽位会同时分给新key），多取 len(slots) 条后排除
+                candidates = self._conn.execute(
+                    "SELECT key, slot FROM entries WHERE dim = ? ORDER BY last_used LIMIT ?",
+                    (dim, to_evict + len(slots)),
+                ).fetchall()
+                evicted = [(key, slot) for key, slot in candidates if key not in slots][:to_evict]
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE key = ? AND dim = ?", [(key, dim) for key, _ in evicted]
+                )
+                for key, (_, slot) in zip(new_keys[free:], evicted):
+                    slots[key] = slot
+                self.evictions += len(evicted)
+
+        if not slots:
+            return
+        vectors = self._open_vectors(dim, min_rows=max(slots.values()) + 1)
+        for key, slot in slots.items():
+            vectors[slot] = np.asarray(items[key], dtype=np.float32)
+        vectors.flush()
+
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO entries (key, dim, slot, last_used) VALUES (?, ?, ?, ?)",
+            [(key, dim, slot, now) for key, slot in slots.items()],
+        )
+
+    def _open_vectors(self, dim: int, min_rows: int = 0) -> np.ndarray:
+        """打开（必要时扩容）指定维度的向量文件"""
+        vectors = self._vectors.get(dim)
+        if vectors is not None and len(vectors) >= min_rows:
+            return vectors
+
+        path = self._dir / f"vectors_{dim}.f32"
+        row_bytes = dim * np.dtype(np.float32).itemsize
+        current_rows = path.stat().st_size // row_bytes if path.exists() else 0
+        rows = current_rows
+        if min_rows > current_rows:
+            rows = min(self.max_entries, max(min_rows, current_rows + _GROW_ROWS))
+            if vectors is not None:
+                vectors.flush()
+            with open(path, "ab") as f:
+                f.truncate(rows * row_bytes)
+
+        if rows == 0:
+            return np.zeros((0, dim), dtype=np.float32)
+        vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(rows, dim))
+        self._vectors[dim] = vectors
+        return vectors
@@ -0,0 +1,133 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+进程内的查询向量缓存：按规范化后的查询文本缓存其向量，LRU + TTL 淘汰。
+
+同一查询并发到达时只嵌入一次，其余请求等待同一个结果。
+"""
+
+import asyncio
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """规范化查询文本：NFKC（全角转半角等）、去除首尾空白、合并连续空白"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+class QueryEmbeddingCache:
+    """线程安全的 LRU + TTL 查询向量缓存"""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 3600):
+        """
+        args:
+            max_entries: 最多缓存的查询条数，超出时淘汰最久未使用的条目
+            ttl_seconds: 条目的有效期（秒），0 表示不过期
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Tuple[float, List[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中/淘汰计数及当前条数"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def get(self, query: str) -> List[float] | None:
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, vector = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def set(self, query: str, vector: List[float]) -> None:
+        if not vector:
+            return
+        key = normalize_query(query)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def get_or_embed(
+        self,
+        query: str,
+        embed_fn: Callable[[str], Awaitable[List[float]]],
+    ) -> List[float]:
+        """
+        返回查询向量：命中缓存时直接返回；否则调用 embed_fn 嵌入并缓存。
+        同一事件循环中相同查询的并发请求共享一次嵌入
+        """
+        vector = self.get(query)
+        if vector is not None:
+            return vector
+
+        key = normalize_query(query)
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 发起嵌入的请求被取消（而不是当前请求），由当前请求自行嵌入
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            vector = await embed_fn(query)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 标记异常已读取，无人等待时不告警
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(vector)
+            self.set(query, vector)
+            return vector
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -15,7 +15,8 @@
 """用于 Query Callbacks, 记录LLM调用次数、消耗Tokens以及报错信息"""
 
 import pandas as pd
-from typing import Any
+import time
+from typing import Any, List
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy import select
 import asyncio
@@ -38,7 +39,13 @@ async def save_and_publish_fragment_with_status(
     is_final: bool,
     sessionmaker: async_sessionmaker[AsyncSession] | None = None,
     memory_store: MemoryStoreBase | None = None,
+    full_content: str | None = None,
 ) -> None:
+    """
+    写入一个回答片段：每个片段一次往返（消息流追加与续期在同一个 pipeline 中），
+    第一个片段在同一个 pipeline 中同时更新任务状态。最后一个片段写入完整回答与最终状态，
+    full_content 为调用方在进程内累积的完整回答，为空时从消息流中读取拼接
+    """
     cfg = get_engine_config().memory_config
 
     chunk = StreamChunk(
@@ -52,23 +59,23 @@ async def save_and_publish_fragment_with_status(
     if memory_store is None:
         raise ValueError("memory_store is None")
 
-    if chunk_index == 1:
-        await memory_store.set(f"task:{task_id}:status", TaskStatusType.OUTPUTTING, expire=cfg.result_retention_time)
-    await memory_store.set(f"task:{task_id}:chunk:{chunk_index}", chunk.to_memory(), expire=cfg.task_timeout)
-    await memory_store.set(f"task:{task_id}:chunk:max", chunk_index, expire=cfg.task_timeout)
+    # 片段追加到任务的消息流，TaskStreamer 阻塞读取，写入后立即推送
+    await memory_store.stream_append(
+        f"task:{task_id}:chunks",
+        chunk.to_memory(),
+        expire=cfg.task_timeout,
+        extra={f"task:{task_id}:status": TaskStatusType.OUTPUTTING} if chunk_index == 1 else None,
+        extra_expire=cfg.result_retention_time,
+    )
 
     if is_final:
-        full_content = ""
-        for i in range(1, chunk_index + 1):
-            cached = await memory_store.get(f"task:{task_id}:chunk:{i}")
-            if cached:
-                full_content += cached["content"]
+        if full_content is None:
+            entries = await memory_store.stream_read(f"task:{task_id}:chunks", count=chunk_index)
+            full_content = "".join(cached["content"] for _, cached in entries)
         full_result = FullResult(
             task_id=task_id,
             content=full_content
         )
-        await memory_store.set(f"task:{task_id}:result", full_result.to_memory(), expire=cfg.result_retention_time)
-        
         if sessionmaker is None:
             raise RuntimeError("sessionmaker is None")
         
@@ -89,7 +96,11 @@ async def save_and_publish_fragment_with_status(
                 task = result.scalar_one()
                 task.status = TaskStatusType.SUCCEEDED
 
-        await memory_store.set(f"task:{task_id}:status", TaskStatusType.SUCCEEDED, expire=cfg.result_retention_time)
+        # 结果与最终状态一次写入（结果在前，读到成功状态时结果一定已存在）
+        await memory_store.set_many({
+            f"task:{task_id}:result": full_result.to_memory(),
+            f"task:{task_id}:status": TaskStatusType.SUCCEEDED,
+        }, expire=cfg.result_retention_time)
 
 
 
@@ -117,6 +128,11 @@ class RecordQueryCallbacks(QueryCallbacks):
         self.sessionmaker = sessionmaker
         self.chunk_index = 1
         self.buffer = ""
+        # 已写入的片段，最后一个片段写入时在进程内拼出完整回答
+        self.answer_parts: List[str] = []
+        self.final_written = False
+        self.cancel_check_interval = get_engine_config().memory_config.cancel_check_interval
+        self._last_cancel_check = 0.0
         
 
     def on_context(self, context: Any) -> None:
@@ -139,24 +155,33 @@ class RecordQueryCallbacks(QueryCallbacks):
 
     async def on_llm_new_token(self, token):
         if self.stream_to_redis and self.task_id and self.memory_store:
-            # ✅ 取消检查逻辑（每次 token 推送前都检查）
-            status = await self.memory_store.get(f"task:{self.task_id}:status")
-            if status == TaskStatusType.CANCELLED:
-                print(f"❌ Task {self.task_id} 被取消，中止推理")
-                raise asyncio.CancelledError(f"Task {self.task_id} was cancelled.")
+            # ✅ 取消检查逻辑（每 cancel_check_interval 秒最多检查一次，不在每个 token 上访问 Redis）
+            now = time.monotonic()
+            if now - self._last_cancel_check >= self.cancel_check_interval:
+                self._last_cancel_check = now
+                status = await self.memory_store.get(f"task:{self.task_id}:status")
+                if status == TaskStatusType.CANCELLED:
+                    print(f"❌ Task {self.task_id} 被取消，中止推理")
+                    raise asyncio.CancelledError(f"Task {self.task_id} was cancelled.")
 
             self.buffer += token
             if len(self.buffer) >= 10 or token in ('.', '。', '\n'):
-                await save_and_publish_fragment_with_status(
-                    task_id=self.task_id,
-                    chunk_index=self.chunk_index,
-                    content=self.buffer,
-                    is_final=False,
-                    sessionmaker=self.sessionmaker,
-                    memory_store=self.memory_store,
-                )
-                self.chunk_index += 1
-                self.buffer = ""
+                await self._write_fragment(is_final=False)
+
+    async def _write_fragment(self, is_final: bool) -> None:
+        content = self.buffer
+        await save_and_publish_fragment_with_status(
+            task_id=self.task_id, # type: ignore
+            chunk_index=self.chunk_index,
+            content=content,
+            is_final=is_final,
+            sessionmaker=self.sessionmaker,
+            memory_store=self.memory_store,
+            full_content="".join(self.answer_parts) + content if is_final else None,
+        )
+        self.answer_parts.append(content)
+        self.chunk_index += 1
+        self.buffer = ""
 
     def add_tokens(self, prompt_tokens: int | None, output_tokens: int | None):
         """Caculate the number of tokens used."""
@@ -195,16 +220,10 @@ class RecordQueryCallbacks(QueryCallbacks):
         self.add_tokens(search_result.prompt_tokens, search_result.output_tokens)
         self.add_llm_call(search_result.llm_calls)
         self.completion_time += completion_time
-        if self.stream_to_redis and self.buffer and self.task_id:
-            await save_and_publish_fragment_with_status(
-                task_id=self.task_id,
-                chunk_index=self.chunk_index,
-                content=self.buffer,
-                is_final=True,
-                sessionmaker=self.sessionmaker,
-                memory_store=self.memory_store,
-            )
-            self.buffer = ""
+        # 最后一个 token 恰好触发了片段写入（buffer 为空）时也要写入结束片段，任务才会完成
+        if self.stream_to_redis and self.task_id and not self.final_written and (self.buffer or self.answer_parts):
+            await self._write_fragment(is_final=True)
+            self.final_written = True
     
     def dumps(self) -> str:
         """Dump the callback to a string."""
@@ -18,6 +18,7 @@ from higoalutils.config.enums.sys_enums import DeviceType, AsyncType
 class EmbeddingDefaultBase:
     """通用嵌入模型默认配置基类"""
     async_mode = AsyncType.THREADED
+    batch_max_tokens = 32_768
 
 
 class HuggingFaceEmbeddingDefaults(EmbeddingDefaultBase):
@@ -26,6 +27,7 @@ class HuggingFaceEmbeddingDefaults(EmbeddingDefaultBase):
     device: DeviceType = DeviceType.CPU
     parallelization_num_threads = 50
     parallelization_stagger = 0.3
+    batch_size = 32
 
 
 class OpenAIEmbeddingDefaults(EmbeddingDefaultBase):
@@ -34,4 +36,22 @@ class OpenAIEmbeddingDefaults(EmbeddingDefaultBase):
     request_timeout = 30.0
     retry_strategy = "exponential"
     max_retries = 3
-    max_retry_wait = 10.0
\ No newline at end of file
+    max_retry_wait = 10.0
+    batch_size = 10 # DashScope text-embedding-v3 单次请求最多10条输入
+    concurrent_requests = 8
+    requests_per_minute = 0 # 0 表示不限制
+    tokens_per_minute = 0 # 0 表示不限制
+
+
+class EmbeddingCacheDefaults:
+    """默认配置：持久化向量缓存"""
+    enabled = False
+    base_dir = "appdata/cache/embeddings"
+    max_entries = 1_000_000
+
+
+class QueryCacheDefaults:
+    """默认配置：进程内查询向量缓存"""
+    enabled = True
+    max_entries = 10_000
+    ttl_seconds = 3600
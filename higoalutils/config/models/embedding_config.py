@@ -16,7 +16,9 @@ from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 
 from higoalutils.config.enums.sys_enums import AsyncType, EmbeddingType, DeviceType
-from higoalutils.config.defaults.embedding_defaults import HuggingFaceEmbeddingDefaults, OpenAIEmbeddingDefaults
+from higoalutils.config.defaults.embedding_defaults import (
+    EmbeddingCacheDefaults, HuggingFaceEmbeddingDefaults, OpenAIEmbeddingDefaults, QueryCacheDefaults
+)
 
 
 class EmbeddingModelConfig(BaseModel):
@@ -28,6 +30,8 @@ class HuggingFaceEmbeddingConfig(BaseModel):
     parallelization_num_threads: int = Field(default=HuggingFaceEmbeddingDefaults.parallelization_num_threads)
     parallelization_stagger: float = Field(default=HuggingFaceEmbeddingDefaults.parallelization_stagger)
     async_mode: AsyncType = Field(default=HuggingFaceEmbeddingDefaults.async_mode)
+    batch_size: int = Field(default=HuggingFaceEmbeddingDefaults.batch_size, description="单次前向计算的最大文本数")
+    batch_max_tokens: int = Field(default=HuggingFaceEmbeddingDefaults.batch_max_tokens, description="单个批次的最大token数")
 
 
 class OpenAIEmbeddingConfig(BaseModel):
@@ -37,12 +41,31 @@ class OpenAIEmbeddingConfig(BaseModel):
     max_retries: int = Field(default=OpenAIEmbeddingDefaults.max_retries)
     max_retry_wait: float = Field(default=OpenAIEmbeddingDefaults.max_retry_wait)
     async_mode: AsyncType = Field(default=OpenAIEmbeddingDefaults.async_mode)
+    batch_size: int = Field(default=OpenAIEmbeddingDefaults.batch_size, description="单次请求的最大输入条数")
+    batch_max_tokens: int = Field(default=OpenAIEmbeddingDefaults.batch_max_tokens, description="单个批次的最大token数")
+    concurrent_requests: int = Field(default=OpenAIEmbeddingDefaults.concurrent_requests, description="同时进行中的最大请求数")
+    requests_per_minute: int = Field(default=OpenAIEmbeddingDefaults.requests_per_minute, description="每分钟最大请求数，0 表示不限制")
+    tokens_per_minute: int = Field(default=OpenAIEmbeddingDefaults.tokens_per_minute, description="每分钟最大token数，0 表示不限制")
+
+
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = Field(default=EmbeddingCacheDefaults.enabled, description="是否启用持久化向量缓存")
+    base_dir: str = Field(default=EmbeddingCacheDefaults.base_dir, description="向量缓存目录")
+    max_entries: int = Field(default=EmbeddingCacheDefaults.max_entries, description="每个模型最多缓存的向量条数，超出时按LRU淘汰")
+
+
+class QueryCacheConfig(BaseModel):
+    enabled: bool = Field(default=QueryCacheDefaults.enabled, description="是否缓存查询文本的向量")
+    max_entries: int = Field(default=QueryCacheDefaults.max_entries, description="最多缓存的查询条数，超出时按LRU淘汰")
+    ttl_seconds: float = Field(default=QueryCacheDefaults.ttl_seconds, description="查询向量的有效期（秒），0 表示不过期")
 
 
 class EmbeddingConfig(BaseModel):
     embedding_model_config: EmbeddingModelConfig
     huggingface_embedding_config: Optional[HuggingFaceEmbeddingConfig] = None
     openai_embedding_config: Optional[OpenAIEmbeddingConfig] = None
+    cache_config: EmbeddingCacheConfig = Field(default_factory=EmbeddingCacheConfig)
+    query_cache_config: QueryCacheConfig = Field(default_factory=QueryCacheConfig)
 
     @model_validator(mode="after")
     def validate_active_model(self):
@@ -57,4 +80,11 @@ class EmbeddingConfig(BaseModel):
         else:
             raise ValueError(f"Unsupported embedding model type: {model_type}")
 
-        return self
\ No newline at end of file
+        return self
+
+    @property
+    def active_model_config(self) -> HuggingFaceEmbeddingConfig | OpenAIEmbeddingConfig:
+        """当前启用的嵌入模型配置"""
+        if self.embedding_model_config.type == EmbeddingType.HuggingFace:
+            return self.huggingface_embedding_config # type: ignore
+        return self.openai_embedding_config # type: ignore
\ No newline at end of file
@@ -30,6 +30,9 @@ class ModelRegistryItem(BaseModel):
     api_key: Optional[str] = None
     local_path: Optional[str] = None
 
+    # 仅嵌入模型需要：输出向量的维度
+    dimension: Optional[int] = None
+
     @property
     def display_name(self) -> str:
         return self.readable_name or self.model_name
@@ -29,11 +29,13 @@ class DatabaseConfig(BaseModel):
     vector_database_config: VectorDatabaseConfig
 
     redis_config: Optional[RedisConfig] = None
+    local_memory_config: Optional[LocalMemoryConfig] = None
     mysql_config: Optional[MysqlConfig] = None
     oceanbase_relational_config: Optional[OBReConfig] = None
     sqlite_config: Optional[SqliteConfig] = None
     lancedb_config: Optional[LancedbConfig] = None
     oceanbase_vector_config: Optional[OBVeConfig] = None
+    local_vector_config: Optional[LocalVectorConfig] = None
 
 
     @model_validator(mode="after")
@@ -57,7 +59,9 @@ class DatabaseConfig(BaseModel):
         if self.vector_database_config:
             if self.vector_database_config.type == VectorDatabaseType.LANCEDB:
                 assert self.lancedb_config is not None, "LanceDB 配置缺失"
-            elif self.relation_database_config.type == VectorDatabaseType.OCEANBASE:
+            elif self.vector_database_config.type == VectorDatabaseType.OCEANBASE:
                 assert self.oceanbase_vector_config is not None, "OceanBase 配置缺失"
+            elif self.vector_database_config.type == VectorDatabaseType.LOCAL:
+                assert self.local_vector_config is not None, "本地向量索引配置缺失"
         
         return self
\ No newline at end of file
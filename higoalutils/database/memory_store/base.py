@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import Any, AsyncGenerator, AsyncIterator
+from typing import Any, AsyncGenerator, AsyncIterator, List, Mapping, Tuple
 
 
 class MemoryStoreBase(ABC):
@@ -25,6 +25,11 @@ class MemoryStoreBase(ABC):
     async def set(self, key: str, value: Any, expire: int | None = None) -> None: 
         ...
 
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, Any], expire: int | None = None) -> None:
+        """一次往返写入多个键值"""
+        ...
+
     @abstractmethod
     async def has(self, key: str) -> bool: 
         ...
@@ -55,4 +60,29 @@ class MemoryStoreBase(ABC):
     
     @abstractmethod
     def scan_iter(self, match: str) -> AsyncIterator[str]:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def stream_append(
+        self,
+        key: str,
+        message: Any,
+        expire: int | None = None,
+        extra: Mapping[str, Any] | None = None,
+        extra_expire: int | None = None,
+    ) -> str:
+        """
+        向 key 对应的消息流末尾追加一条消息，返回其消息ID（按追加顺序递增）；
+        extra 中的键值（过期时间 extra_expire）与追加在同一次往返中写入
+        """
+        ...
+
+    @abstractmethod
+    async def stream_read(
+        self, key: str, last_id: str = "0", block: float | None = None, count: int = 100
+    ) -> List[Tuple[str, Any]]:
+        """
+        读取消息ID在 last_id 之后的至多 count 条消息（消息ID, 消息）；
+        暂无新消息时最多等待 block 秒，block 为空时立即返回
+        """
+        ...
@@ -20,6 +20,8 @@ class MemoryDatabaseType(str, Enum):
 
     REDIS = "redis"
     """The Redis database"""
+    LOCAL = "local"
+    """In-process memory store"""
     NONE = "none"
     """No memory database"""
 
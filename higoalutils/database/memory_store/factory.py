@@ -17,6 +17,7 @@ from higoalutils.database.memory_store.redis_store import RedisMemoryStore
 from higoalutils.database.memory_store.base import MemoryStoreBase
 from higoalutils.database.memory_store.enums import MemoryDatabaseType
 from higoalutils.database.memory_store.null_store import NullMemoryStore
+from higoalutils.database.memory_store.local_store import LocalMemoryStore
 
 
 class MemoryStoreFactory:
@@ -27,6 +28,8 @@ class MemoryStoreFactory:
         match store_type:
             case MemoryDatabaseType.REDIS:
                 return RedisMemoryStore()
+            case MemoryDatabaseType.LOCAL:
+                return LocalMemoryStore()
             case MemoryDatabaseType.NONE:
                 return NullMemoryStore()
             case _:
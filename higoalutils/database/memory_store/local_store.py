@@ -0,0 +1,273 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+进程内的内存存储，适合单机部署与测试，无需 Redis。
+
+- 取值以 JSON 序列化保存（与 Redis 实现的读写语义一致，读出的是副本）
+- 过期：最小堆按过期时间排序，每次读写时弹出已过期的键；读取时也会检查过期时间
+- 容量：键按最近使用顺序排列，超过 max_entries 时淘汰最久未使用的键
+- scan_iter：按键中 ":" 分隔的前缀建立索引，只在模式的字面前缀对应的键中匹配
+- 消息流：追加时唤醒阻塞读取的协程；发布订阅：每个订阅者一个有界 asyncio.Queue
+所有操作在事件循环线程中执行，内部不跨 await 修改状态，无需加锁。
+"""
+
+import asyncio
+import bisect
+import heapq
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from fnmatch import fnmatchcase
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Mapping, Set, Tuple
+
+from higoalutils.config.load_config import get_config
+from higoalutils.database.memory_store.base import MemoryStoreBase
+from higoalutils.database.memory_store.models import LocalMemoryConfig
+from higoalutils.utils.singleton_utils.singleton import singleton
+
+log = logging.getLogger(__name__)
+
+_GLOB_CHARS = "*?[\\"
+
+
+class _Stream:
+    """消息流：消息ID为 "<毫秒时间戳>-<序号>"，与 Redis Stream 的格式与顺序一致"""
+
+    def __init__(self):
+        self.ids: List[Tuple[int, int]] = []
+        self.messages: List[str] = []
+
+    def next_id(self) -> Tuple[int, int]:
+        now = int(time.time() * 1000)
+        if self.ids and self.ids[-1][0] >= now:
+            return self.ids[-1][0], self.ids[-1][1] + 1
+        return now, 0
+
+
+@singleton
+class LocalMemoryStore(MemoryStoreBase):
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            # 单例每次获取时都会再次调用 __init__，不能清空已有数据
+            return
+        self._initialized = True
+        cfg = get_config().database_config.local_memory_config or LocalMemoryConfig()
+        self.max_entries = max(1, cfg.max_entries)
+        self.max_stream_length = max(1, cfg.max_stream_length)
+        self.subscriber_queue_size = max(1, cfg.subscriber_queue_size)
+
+        # 键 -> JSON 字符串或 _Stream，按最近使用排序
+        self._data: OrderedDict[str, str | _Stream] = OrderedDict()
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # ":" 分隔的前缀（含末尾的 ":"）-> 键
+        self._prefix_index: Dict[str, Set[str]] = defaultdict(set)
+        # 消息流键 -> 等待新消息的读取方
+        self._stream_events: Dict[str, asyncio.Event] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def get(self, key: str):
+        value = self._lookup(key)
+        if value is None:
+            return None
+        if isinstance(value, _Stream):
+            raise TypeError(f"Key {key} holds a stream, use stream_read")
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, expire: int | None = None):
+        self._purge_expired()
+        self._store(key, json.dumps(value), expire)
+
+    async def set_many(self, items: Mapping[str, Any], expire: int | None = None) -> None:
+        self._purge_expired()
+        for key, value in items.items():
+            self._store(key, json.dumps(value), expire)
+
+    async def has(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._expires.clear()
+        self._expiry_heap.clear()
+        self._prefix_index.clear()
+        for event in self._stream_events.values():
+            event.set()
+        self._stream_events.clear()
+
+    async def warmup(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self.clear()
+        self._subscribers.clear()
+
+    async def subscribe(self, channel: str) -> AsyncGenerator[str, None]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            if queue.full():
+                # 订阅者消费过慢时丢弃其最旧的消息，内存有界
+                queue.get_nowait()
+                log.warning(f"Subscriber queue of channel {channel} is full, dropped the oldest message")
+            queue.put_nowait(message)
+
+    async def scan_iter(self, match: str = "*") -> AsyncIterator[str]:
+        self._purge_expired()
+        literal = match
+        for i, char in enumerate(match):
+            if char in _GLOB_CHARS:
+                literal = match[:i]
+                break
+        prefix = literal[:literal.rfind(":") + 1]
+        candidates = self._prefix_index.get(prefix, set()) if prefix else self._data.keys()
+        for key in [key for key in candidates if fnmatchcase(key, match)]:
+            if self._lookup(key, touch=False) is not None:
+                yield key
+
+    async def stream_append(
+        self,
+        key: str,
+        message: Any,
+        expire: int | None = None,
+        extra: Mapping[str, Any] | None = None,
+        extra_expire: int | None = None,
+    ) -> str:
+        self._purge_expired()
+        for extra_key, value in (extra or {}).items():
+            self._store(extra_key, json.dumps(value), extra_expire)
+        stream = self._lookup(key)
+        if stream is None:
+            stream = _Stream()
+        elif not isinstance(stream, _Stream):
+            raise TypeError(f"Key {key} does not hold a stream")
+        entry_id = stream.next_id()
+        stream.ids.append(entry_id)
+        stream.messages.append(json.dumps(message))
+        if len(stream.ids) > self.max_stream_length:
+            del stream.ids[0], stream.messages[0]
+        self._store(key, stream, expire if expire else self._ttl(key))
+
+        event = self._stream_events.pop(key, None)
+        if event is not None:
+            event.set()
+        return f"{entry_id[0]}-{entry_id[1]}"
+
+    async def stream_read(
+        self, key: str, last_id: str = "0", block: float | None = None, count: int = 100
+    ) -> List[Tuple[str, Any]]:
+        deadline = time.monotonic() + block if block else None
+        while True:
+            entries = self._read_stream(key, last_id, count)
+            if entries or deadline is None:
+                return entries
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            event = self._stream_events.setdefault(key, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return []
+
+    def _read_stream(self, key: str, last_id: str, count: int) -> List[Tuple[str, Any]]:
+        stream = self._lookup(key)
+        if stream is None:
+            return []
+        if not isinstance(stream, _Stream):
+            raise TypeError(f"Key {key} does not hold a stream")
+        start = bisect.bisect_right(stream.ids, _parse_stream_id(last_id))
+        return [
+            (f"{ms}-{seq}", json.loads(message))
+            for (ms, seq), message in zip(stream.ids[start:start + count], stream.messages[start:start + count])
+        ]
+
+    def _lookup(self, key: str, touch: bool = True) -> str | _Stream | None:
+        value = self._data.get(key)
+        if value is None:
+            return None
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        if touch:
+            self._data.move_to_end(key)
+        return value
+
+    def _ttl(self, key: str) -> float | None:
+        expires_at = self._expires.get(key)
+        return expires_at - time.monotonic() if expires_at is not None else None
+
+    def _store(self, key: str, value: str | _Stream, expire: float | None) -> None:
+        if key not in self._data:
+            for prefix in _key_prefixes(key):
+                self._prefix_index[prefix].add(key)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if expire:
+            expires_at = time.monotonic() + expire
+            self._expires[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+        else:
+            self._expires.pop(key, None)
+        while len(self._data) > self.max_entries:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+
+    def _remove(self, key: str) -> None:
+        if self._data.pop(key, None) is None:
+            return
+        self._expires.pop(key, None)
+        for prefix in _key_prefixes(key):
+            keys = self._prefix_index.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._prefix_index[prefix]
+
+    def _purge_expired(self) -> None:
+        """弹出堆顶已过期的键；键被重新设置过期时间（或已删除）时堆中的旧条目直接丢弃"""
+        now = time.monotonic()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            if self._expires.get(key) == expires_at:
+                self._remove(key)
+
+
+def _key_prefixes(key: str) -> List[str]:
+    """键中每个 ":" 之前（含 ":"）的前缀，如 task:1:status -> task:, task:1:"""
+    return [key[:i + 1] for i, char in enumerate(key) if char == ":"]
+
+
+def _parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from higoalutils.database.memory_store.enums import MemoryDatabaseType
 
@@ -20,10 +20,16 @@ from higoalutils.database.memory_store.enums import MemoryDatabaseType
 class MemoryDatabaseConfig(BaseModel):
     type: MemoryDatabaseType
 
+class LocalMemoryConfig(BaseModel):
+    max_entries: int = Field(default=100_000, description="最多保存的键数，超出时淘汰最久未使用的键")
+    max_stream_length: int = Field(default=10_000, description="每个消息流最多保留的消息数，超出时丢弃最旧的消息")
+    subscriber_queue_size: int = Field(default=1000, description="每个订阅者的消息队列长度，消费过慢时丢弃最旧的消息")
+
 class RedisConfig(BaseModel):
     host: str
     port: int
     password: str
     db: int = 0
     max_connections: int = 10
-    pool_recycle: int = 3600
\ No newline at end of file
+    pool_recycle: int = 3600
+    stream_max_connections: int = Field(default=256, description="阻塞读取消息流（流式推送）的连接池大小，约等于同时进行的流式会话数上限")
\ No newline at end of file
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, AsyncGenerator, AsyncIterator
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, List, Mapping, Tuple
 from higoalutils.database.memory_store.base import MemoryStoreBase
 
 
@@ -24,6 +25,9 @@ class NullMemoryStore(MemoryStoreBase):
     async def set(self, key: str, value: Any, expire: int | None = None):
         pass
 
+    async def set_many(self, items: Mapping[str, Any], expire: int | None = None):
+        pass
+
     async def has(self, key: str) -> bool:
         return False
 
@@ -50,4 +54,21 @@ class NullMemoryStore(MemoryStoreBase):
     async def scan_iter(self, match: str = "*") -> AsyncIterator[str]:
         if False:
             yield ""
-        raise NotImplementedError("This memory store does not support scan_iter.")
\ No newline at end of file
+        raise NotImplementedError("This memory store does not support scan_iter.")
+
+    async def stream_append(
+        self,
+        key: str,
+        message: Any,
+        expire: int | None = None,
+        extra: Mapping[str, Any] | None = None,
+        extra_expire: int | None = None,
+    ) -> str:
+        return ""
+
+    async def stream_read(
+        self, key: str, last_id: str = "0", block: float | None = None, count: int = 100
+    ) -> List[Tuple[str, Any]]:
+        if block:
+            await asyncio.sleep(block)
+        return []
@@ -14,8 +14,8 @@
 
 import json
 import inspect
-from typing import Any, AsyncGenerator, AsyncIterator
-from redis.asyncio import Redis
+from typing import Any, AsyncGenerator, AsyncIterator, List, Mapping, Tuple
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from higoalutils.database.memory_store.base import MemoryStoreBase
 from higoalutils.config.load_config import get_config
@@ -25,6 +25,10 @@ from higoalutils.utils.singleton_utils.singleton import singleton
 @singleton
 class RedisMemoryStore(MemoryStoreBase):
     def __init__(self):
+        if getattr(self, "_initialized", False):
+            # 单例每次获取时都会再次调用 __init__，不能重复创建连接池
+            return
+        self._initialized = True
         redis_cfg = get_config().database_config.redis_config
         self._redis = Redis(
             host=redis_cfg.host, # type: ignore
@@ -34,6 +38,18 @@ class RedisMemoryStore(MemoryStoreBase):
             decode_responses=True,
             max_connections=getattr(redis_cfg, "max_connections", 10)
         )
+        # 阻塞读取（XREAD BLOCK）在等待期间独占连接，使用单独的连接池；连接用尽时排队等待而不是报错
+        self._stream_redis = Redis(
+            connection_pool=BlockingConnectionPool(
+                host=redis_cfg.host, # type: ignore
+                port=redis_cfg.port, # type: ignore
+                db=redis_cfg.db, # type: ignore
+                password=redis_cfg.password, # type: ignore
+                decode_responses=True,
+                max_connections=redis_cfg.stream_max_connections, # type: ignore
+                timeout=None
+            )
+        )
 
     async def get(self, key: str):
         data = await self._redis.get(key)
@@ -42,11 +58,19 @@ class RedisMemoryStore(MemoryStoreBase):
     async def set(self, key: str, value: Any, expire: int | None = None):
         await self._redis.set(key, json.dumps(value), ex=expire)
 
+    async def set_many(self, items: Mapping[str, Any], expire: int | None = None) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, json.dumps(value), ex=expire)
+            await pipe.execute()
+
     async def has(self, key: str) -> bool:
         return await self._redis.exists(key) == 1
 
     async def delete(self, *keys: str) -> None:
-        await self._redis.delete(*keys)
+        # UNLINK 在后台线程释放内存，删除大键（消息流）不阻塞 Redis
+        if keys:
+            await self._redis.unlink(*keys)
 
     async def clear(self) -> None:
         async for key in self._redis.scan_iter("*"):
@@ -56,10 +80,11 @@ class RedisMemoryStore(MemoryStoreBase):
         await self._redis.ping()
 
     async def close(self) -> None:
-        await self._redis.close()
-        result = self._redis.connection_pool.disconnect()
-        if inspect.isawaitable(result):
-            await result
+        for client in (self._redis, self._stream_redis):
+            await client.close()
+            result = client.connection_pool.disconnect()
+            if inspect.isawaitable(result):
+                await result
     
     async def subscribe(self, channel: str) -> AsyncGenerator[str, None]:
         pubsub = self._redis.pubsub()
@@ -77,4 +102,33 @@ class RedisMemoryStore(MemoryStoreBase):
     
     async def scan_iter(self, match: str = "*") -> AsyncIterator[str]:
         async for key in self._redis.scan_iter(match=match):
-            yield key
\ No newline at end of file
+            yield key
+
+    async def stream_append(
+        self,
+        key: str,
+        message: Any,
+        expire: int | None = None,
+        extra: Mapping[str, Any] | None = None,
+        extra_expire: int | None = None,
+    ) -> str:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, {"data": json.dumps(message)})
+            if expire:
+                pipe.expire(key, expire)
+            for extra_key, value in (extra or {}).items():
+                pipe.set(extra_key, json.dumps(value), ex=extra_expire)
+            entry_id, *_ = await pipe.execute()
+        return entry_id
+
+    async def stream_read(
+        self, key: str, last_id: str = "0", block: float | None = None, count: int = 100
+    ) -> List[Tuple[str, Any]]:
+        client = self._stream_redis if block else self._redis
+        response = await client.xread(
+            {key: last_id}, count=count, block=max(1, int(block * 1000)) if block else None
+        )
+        if not response:
+            return []
+        _, entries = response[0]
+        return [(entry_id, json.loads(fields["data"])) for entry_id, fields in entries]
@@ -12,11 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, List, Sequence, TypeVar
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+if TYPE_CHECKING:
+    from higoalutils.database.vector_store.filters import FieldFilter
+
+T = TypeVar("T")
+
 
 class FilterColumn(str, Enum):
     """Enum for the column of vector store to filter."""
@@ -27,6 +38,10 @@ class FilterColumn(str, Enum):
     """Column name for the chunk id."""
 
 
+# 检索默认返回的列：不含向量列，需要向量时显式传入包含 "vector" 的列表
+DEFAULT_SEARCH_COLUMNS = ("id", "source_doc_id", "text", "metadata")
+
+
 @dataclass
 class VectorStoreDocument:
     id: str
@@ -43,7 +58,19 @@ class VectorStoreSearchResult:
 
 
 class VectorStoreBase(ABC):
-    """统一向量数据库接口基类"""
+    """
+    统一向量数据库接口基类
+
+    a 开头的异步接口默认在有界线程池中执行对应的同步实现，避免阻塞事件循环；
+    数据库提供异步客户端时子类可覆盖为原生异步实现
+    """
+
+    top_k: int = 3
+    """未指定 top_k 时返回的条数，各实现取其配置的 default_top_k"""
+    async_workers: int = 8
+    """异步接口执行同步实现的线程数，同时也限制了并发的数据库调用数"""
+    _async_executor: ThreadPoolExecutor | None = None
+    _async_executor_lock = threading.Lock()
 
     @abstractmethod
     def warmup(self) -> None:
@@ -60,6 +87,19 @@ class VectorStoreBase(ABC):
         """向量入库"""
         ...
 
+    @abstractmethod
+    def delete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        """删除 filter_column 取值在 filter_values 中的向量"""
+        ...
+
+    def sample_vectors(self, table_name: str, limit: int | None = None) -> np.ndarray:
+        """读取表中至多 limit 条向量，返回 (n, dim) 的 float32 矩阵，用于基准测试等离线分析"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reading vectors back")
+
+    def optimize(self, table_name: str, reindex: bool = False) -> None:
+        """整理表并更新向量索引；reindex 为 True 时重建索引。不支持索引维护的实现无需覆盖"""
+        return None
+
     @abstractmethod
     def similarity_search_by_vector(
         self,
@@ -68,17 +108,115 @@ class VectorStoreBase(ABC):
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_values: list[str] | None = None
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: "Sequence[FieldFilter] | None" = None
     ) -> List[VectorStoreSearchResult]:
-        """向量相似度检索"""
+        """
+        向量相似度检索，相似度阈值在数据库查询中过滤
+        filter_column / filter_values: 等价于 FieldFilter.isin(filter_column, filter_values)
+        columns: 返回的列，未选择的字段在结果文档中为空
+        filters: 结构化过滤条件（AND），在向量检索之前过滤（前置过滤）
+        """
         ...
 
+    def batch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: "Sequence[FieldFilter] | None" = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        """批量向量相似度检索，返回与 vectors 逐条对应的结果。默认实现逐条调用 similarity_search_by_vector"""
+        return [
+            self.similarity_search_by_vector(
+                vector=list(vector),
+                table_name=table_name,
+                top_k=top_k,
+                similarity_threshold=similarity_threshold,
+                filter_column=filter_column,
+                filter_values=filter_values,
+                columns=columns,
+                filters=filters
+            )
+            for vector in vectors
+        ]
+
     @abstractmethod
-    def search_by_id(self, table_name: str, id: str) -> VectorStoreDocument:
+    def search_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
         """通过ID精确查找"""
         ...
 
     @abstractmethod
     def get_full_table_name(self, simple_name: str) -> str:
         """根据逻辑表名获取完整表名"""
-        ...
\ No newline at end of file
+        ...
+
+    async def aload_documents(
+        self, documents: List[VectorStoreDocument], table_name: str, overwrite: bool | None = None
+    ) -> None:
+        await self._run_sync(self.load_documents, documents, table_name, overwrite)
+
+    async def adelete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        await self._run_sync(self.delete_documents, table_name, filter_column, filter_values)
+
+    async def asimilarity_search_by_vector(
+        self,
+        vector: list[float],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: "Sequence[FieldFilter] | None" = None
+    ) -> List[VectorStoreSearchResult]:
+        return await self._run_sync(
+            self.similarity_search_by_vector,
+            vector, table_name, top_k, similarity_threshold, filter_column, filter_values, columns, filters
+        )
+
+    async def abatch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: "Sequence[FieldFilter] | None" = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        return await self._run_sync(
+            self.batch_similarity_search,
+            vectors, table_name, top_k, similarity_threshold, filter_column, filter_values, columns, filters
+        )
+
+    async def asearch_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
+        return await self._run_sync(self.search_by_id, table_name, id, columns)
+
+    async def _run_sync(self, fn: Callable[..., T], *args: Any) -> T:
+        """在本实例的有界线程池中执行同步调用，线程都忙时排队等待而不占用事件循环"""
+        if self._async_executor is None:
+            with self._async_executor_lock:
+                if self._async_executor is None:
+                    self._async_executor = ThreadPoolExecutor(
+                        max_workers=max(1, self.async_workers),
+                        thread_name_prefix=type(self).__name__,
+                    )
+        return await asyncio.get_running_loop().run_in_executor(self._async_executor, partial(fn, *args))
+
+    def _shutdown_async_executor(self) -> None:
+        """关闭异步接口的线程池（在 close 中调用），之后再调用异步接口时重新创建"""
+        with self._async_executor_lock:
+            executor, self._async_executor = self._async_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
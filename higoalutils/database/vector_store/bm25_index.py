@@ -0,0 +1,196 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+与向量表对应的 BM25 全文索引，持久化为 sqlite FTS5 表，用于混合检索中的词法召回。
+
+文本先规范化（NFKC、转小写），英文与数字按连续的字母数字切分，中文按相邻两字切分
+（单独的一个汉字取单字）。不依赖分词词典，产品型号、编号等未登录词也能精确命中。
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+from higoalutils.database.vector_store.base import FilterColumn, VectorStoreDocument, VectorStoreSearchResult
+from higoalutils.database.vector_store.filters import SQL_OPERATORS, FieldFilter, FilterOp, build_filters
+
+log = logging.getLogger(__name__)
+
+_SQL_BATCH = 500
+_TOKEN = re.compile(r"[0-9a-z]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+_FILTER_COLUMNS = {FilterColumn.ID.value, FilterColumn.DOCID.value}
+
+
+def tokenize_for_bm25(text: str | None) -> List[str]:
+    """切分为BM25词项：字母数字串整体作为一个词项，汉字串切为相邻两字的二元组"""
+    if not text:
+        return []
+    tokens = []
+    for match in _TOKEN.finditer(unicodedata.normalize("NFKC", text).lower()):
+        token = match.group()
+        if token.isascii() or len(token) == 1:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
+class BM25Index:
+    """基于 sqlite FTS5 的 BM25 全文索引，线程安全"""
+
+    def __init__(self, path: str | Path):
+        """
+        args:
+            path: 索引文件路径，不存在时创建
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, source_doc_id TEXT, text TEXT, metadata TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks (source_doc_id)")
+        # 词项已预先切分，以空格分隔写入，unicode61 只按空格拆分
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(tokens, tokenize='unicode61 remove_diacritics 0')"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add_documents(self, documents: Sequence[VectorStoreDocument], overwrite: bool = False) -> None:
+        """写入文档（同ID覆盖）；overwrite 为 True 时先清空索引"""
+        documents = [doc for doc in documents if doc.text]
+        with self._lock, self._conn:
+            if overwrite:
+                self._conn.execute("DELETE FROM chunks_fts")
+                self._conn.execute("DELETE FROM chunks")
+            elif documents:
+                self._delete_where("id", [doc.id for doc in documents])
+            if not documents:
+                return
+            start = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM chunks").fetchone()[0]
+            rowids = range(start, start + len(documents))
+            self._conn.executemany(
+                "INSERT INTO chunks (rowid, id, source_doc_id, text, metadata) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (rowid, doc.id, doc.source_doc_id, doc.text, json.dumps(doc.metadata))
+                    for rowid, doc in zip(rowids, documents)
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO chunks_fts (rowid, tokens) VALUES (?, ?)",
+                [(rowid, " ".join(tokenize_for_bm25(doc.text))) for rowid, doc in zip(rowids, documents)],
+            )
+
+    def delete_documents(self, filter_column: str, filter_values: List[str]) -> None:
+        """删除 filter_column 取值在 filter_values 中的文档"""
+        if not filter_values:
+            return
+        with self._lock, self._conn:
+            self._delete_where(_filter_column(filter_column), filter_values)
+
+    def _delete_where(self, column: str, values: List[str]) -> None:
+        for start in range(0, len(values), _SQL_BATCH):
+            part = values[start:start + _SQL_BATCH]
+            placeholders = ", ".join("?" * len(part))
+            self._conn.execute(
+                f"DELETE FROM chunks_fts WHERE rowid IN (SELECT rowid FROM chunks WHERE {column} IN ({placeholders}))",
+                part,
+            )
+            self._conn.execute(f"DELETE FROM chunks WHERE {column} IN ({placeholders})", part)
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        filter_column: str | None = None,
+        filter_values: List[str] | None = None,
+        filters: Sequence[FieldFilter] | None = None,
+    ) -> List[VectorStoreSearchResult]:
+        """BM25检索，按得分降序返回至多 top_k 条，score 为 BM25 得分（越大越相关）"""
+        match = _match_expression(tokenize_for_bm25(query))
+        if not match or top_k <= 0:
+            return []
+        sql = (
+            "SELECT c.id, c.source_doc_id, c.text, c.metadata, -bm25(chunks_fts) AS score "
+            "FROM chunks_fts JOIN chunks c ON c.rowid = chunks_fts.rowid WHERE chunks_fts MATCH ?"
+        )
+        params: List = [match]
+        for condition in build_filters(filter_column, filter_values, filters):
+            clause, clause_params = _filter_clause(condition)
+            sql += f" AND {clause}"
+            params.extend(clause_params)
+        sql += " ORDER BY score DESC LIMIT ?"
+        params.append(top_k)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            VectorStoreSearchResult(
+                document=VectorStoreDocument(
+                    id=id,
+                    source_doc_id=source_doc_id,
+                    text=text,
+                    vector=None,
+                    metadata=json.loads(metadata) if metadata else {},
+                ),
+                score=score,
+            )
+            for id, source_doc_id, text, metadata, score in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_bm25_index(path: str) -> BM25Index:
+    """同一索引文件在进程内共用一个实例（一个sqlite连接）"""
+    return BM25Index(path)
+
+
+def _filter_column(column: str) -> str:
+    if column not in _FILTER_COLUMNS:
+        raise ValueError(f"Invalid filter_column: {column}")
+    return column
+
+
+def _filter_clause(condition: FieldFilter) -> Tuple[str, List]:
+    """过滤条件编译为 sqlite 条件与参数，metadata 键按 JSON 路径取值"""
+    key = condition.metadata_key
+    if key is None:
+        target, params = f"c.{_filter_column(condition.field)}", []
+    else:
+        target, params = "json_extract(c.metadata, ?)", [f"$.{key}"]
+    if condition.op == FilterOp.IN:
+        if not condition.values:
+            return "0", []
+        return f"{target} IN ({', '.join('?' * len(condition.values))})", params + list(condition.values)
+    return f"{target} {SQL_OPERATORS[condition.op]} ?", params + [condition.value]
+
+
+def _match_expression(tokens: Iterable[str]) -> str:
+    """任一词项命中即召回（OR），BM25按命中词项的稀有程度与频次打分"""
+    return " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
@@ -22,9 +22,62 @@ class VectorDatabaseType(str, Enum):
     """The lancedb vector database"""
     OCEANBASE = "oceanbase"
     """The oceanbase vector database"""
+    LOCAL = "local"
+    """进程内的本地向量索引（NumPy 内存映射文件），适合中小规模语料"""
     NONE = "none"
     """No vector database"""
 
     def __repr__(self):
         """Get a string representation."""
-        return f'"{self.value}"'
\ No newline at end of file
+        return f'"{self.value}"'
+
+class LanceDBIndexType(str, Enum):
+    """LanceDB 向量索引类型"""
+
+    IVF_PQ = "IVF_PQ"
+    """倒排 + 乘积量化，内存占用小，适合大表"""
+    IVF_HNSW_SQ = "IVF_HNSW_SQ"
+    """倒排分区内建 HNSW 图 + 标量量化，召回率高"""
+    IVF_HNSW_PQ = "IVF_HNSW_PQ"
+    """倒排分区内建 HNSW 图 + 乘积量化"""
+    NONE = "none"
+    """不建索引，始终暴力扫描"""
+
+    def __repr__(self):
+        """Get a string representation."""
+        return f'"{self.value}"'
+
+class VectorQuantization(str, Enum):
+    """本地向量索引的量化方式"""
+
+    NONE = "none"
+    """不量化，直接用 float32 向量计算"""
+    INT8 = "int8"
+    """int8 标量量化生成候选，float32 向量重排"""
+    BINARY = "binary"
+    """1 比特二值量化生成候选，float32 向量重排"""
+
+    def __repr__(self):
+        """Get a string representation."""
+        return f'"{self.value}"'
+
+class MetadataFieldType(str, Enum):
+    """提升为独立列的 metadata 字段类型"""
+
+    STRING = "string"
+    INT = "int"
+    FLOAT = "float"
+
+    def cast(self, value):
+        """将 metadata 中的取值转换为该类型"""
+        match self:
+            case MetadataFieldType.INT:
+                return int(value)
+            case MetadataFieldType.FLOAT:
+                return float(value)
+            case _:
+                return str(value)
+
+    def __repr__(self):
+        """Get a string representation."""
+        return f'"{self.value}"'
@@ -13,8 +13,6 @@
 # limitations under the License.
 
 from higoalutils.config.load_config import get_config
-from higoalutils.database.vector_store.lancedb_store import LanceDBStore
-from higoalutils.database.vector_store.oceanbase_store import OBVectorStore
 from higoalutils.database.vector_store.null_store import NullVectorStore
 from higoalutils.database.vector_store.base import VectorStoreBase
 from higoalutils.database.vector_store.enums import VectorDatabaseType
@@ -37,10 +35,16 @@ class VectorStoreFactory:
         db_type = config.database_config.vector_database_config.type
 
         match db_type:
+            # 各后端的客户端库只在被选用时导入
             case VectorDatabaseType.LANCEDB:
+                from higoalutils.database.vector_store.lancedb_store import LanceDBStore
                 self._store = LanceDBStore()
             case VectorDatabaseType.OCEANBASE:
+                from higoalutils.database.vector_store.oceanbase_store import OBVectorStore
                 self._store = OBVectorStore()
+            case VectorDatabaseType.LOCAL:
+                from higoalutils.database.vector_store.local_store import LocalVectorStore
+                self._store = LocalVectorStore()
             case _:
                 self._store = NullVectorStore()
 
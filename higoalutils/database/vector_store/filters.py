@@ -0,0 +1,146 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+向量检索的结构化过滤条件（多个条件之间为 AND），由各向量库实现编译为各自的查询语法：
+取值以参数绑定传入，或按 SQL 字面量规则转义，不直接拼接。
+
+可过滤的字段：
+- id、source_doc_id
+- metadata.<键名>：文档 metadata 中的键，如 metadata.creation_date。
+  登记在 vector_database_config.indexed_metadata_fields 中的键在写入时提升为独立列（meta_<键名>）并建标量索引
+"""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from higoalutils.database.vector_store.base import FilterColumn
+from higoalutils.database.vector_store.enums import MetadataFieldType
+
+METADATA_PREFIX = "metadata."
+_METADATA_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+FilterValue = str | int | float | bool
+
+
+class FilterOp(str, Enum):
+    """过滤条件的比较方式"""
+
+    EQ = "eq"
+    IN = "in"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+
+
+# 除 IN 以外的比较方式对应的 SQL 运算符
+SQL_OPERATORS = {
+    FilterOp.EQ: "=",
+    FilterOp.GT: ">",
+    FilterOp.GTE: ">=",
+    FilterOp.LT: "<",
+    FilterOp.LTE: "<=",
+}
+
+
+@dataclass(frozen=True)
+class FieldFilter:
+    field: str
+    """id、source_doc_id 或 metadata.<键名>"""
+    op: FilterOp
+    value: FilterValue | Tuple[FilterValue, ...]
+    """IN 为取值元组，其余为单个取值"""
+
+    def __post_init__(self):
+        if self.field not in (FilterColumn.ID.value, FilterColumn.DOCID.value) and self.metadata_key is None:
+            raise ValueError(f"Invalid filter field: {self.field}, expected id, source_doc_id or metadata.<key>")
+        if self.op == FilterOp.IN:
+            if isinstance(self.value, (str, bytes)) or not isinstance(self.value, Sequence):
+                raise ValueError(f"IN filter on {self.field} expects a list of values")
+            object.__setattr__(self, "value", tuple(self.value))
+            values = self.value
+        else:
+            values = (self.value,)
+        for value in values: # type: ignore
+            if not isinstance(value, (str, int, float, bool)):
+                raise ValueError(f"Unsupported filter value for {self.field}: {value!r}")
+
+    @property
+    def metadata_key(self) -> str | None:
+        """metadata 字段的键名，id / source_doc_id 时为空"""
+        if self.field.startswith(METADATA_PREFIX):
+            key = self.field[len(METADATA_PREFIX):]
+            if _METADATA_KEY.match(key):
+                return key
+        return None
+
+    @property
+    def values(self) -> Tuple[FilterValue, ...]:
+        return self.value if self.op == FilterOp.IN else (self.value,) # type: ignore
+
+    @classmethod
+    def eq(cls, field: str, value: FilterValue) -> "FieldFilter":
+        return cls(field, FilterOp.EQ, value)
+
+    @classmethod
+    def isin(cls, field: str, values: Sequence[FilterValue]) -> "FieldFilter":
+        return cls(field, FilterOp.IN, tuple(values))
+
+    @classmethod
+    def range(
+        cls,
+        field: str,
+        gte: FilterValue | None = None,
+        gt: FilterValue | None = None,
+        lte: FilterValue | None = None,
+        lt: FilterValue | None = None,
+    ) -> List["FieldFilter"]:
+        """范围条件，如 FieldFilter.range("metadata.creation_date", gte="2024-01-01", lt="2025-01-01")"""
+        bounds = {FilterOp.GTE: gte, FilterOp.GT: gt, FilterOp.LTE: lte, FilterOp.LT: lt}
+        return [cls(field, op, value) for op, value in bounds.items() if value is not None]
+
+
+def build_filters(
+    filter_column: str | None = None,
+    filter_values: Sequence[str] | None = None,
+    filters: Sequence[FieldFilter] | None = None,
+) -> List[FieldFilter]:
+    """合并 filter_column / filter_values（IN 条件）与结构化过滤条件"""
+    combined = list(filters or [])
+    if filter_column and filter_values:
+        combined.insert(0, FieldFilter.isin(filter_column, filter_values))
+    return combined
+
+
+def metadata_column(key: str) -> str:
+    """提升为独立列的 metadata 键对应的列名"""
+    return f"meta_{key}"
+
+
+def promote_metadata(metadata: Mapping[str, Any], fields: Mapping[str, MetadataFieldType]) -> Dict[str, Any]:
+    """取出需要提升为独立列的 metadata 值（按登记的类型转换，缺失或无法转换时为空）"""
+    promoted = {}
+    for key, field_type in fields.items():
+        value = metadata.get(key)
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value)
+        try:
+            promoted[metadata_column(key)] = None if value is None or value == "" else field_type.cast(value)
+        except (TypeError, ValueError):
+            promoted[metadata_column(key)] = None
+    return promoted
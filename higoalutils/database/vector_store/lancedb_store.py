@@ -12,88 +12,310 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
-from typing import List, Optional
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 import lancedb
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import time
 
 from higoalutils.database.vector_store.base import (
-    VectorStoreBase, VectorStoreDocument, VectorStoreSearchResult
+    DEFAULT_SEARCH_COLUMNS, VectorStoreBase, VectorStoreDocument, VectorStoreSearchResult
+)
+from higoalutils.database.vector_store.enums import LanceDBIndexType, MetadataFieldType
+from higoalutils.database.vector_store.filters import (
+    SQL_OPERATORS, FieldFilter, FilterOp, FilterValue, build_filters, metadata_column, promote_metadata
 )
 from higoalutils.config.load_config import get_config
-from higoalutils.database.vector_store.utils  import normalize_vector
+from higoalutils.database.vector_store.utils  import normalize_vector, normalize_vectors
+
+log = logging.getLogger(__name__)
+
+VECTOR_COLUMN = "vector"
+_BASE_COLUMNS = ("id", "source_doc_id", "text", VECTOR_COLUMN, "metadata")
+_ARROW_TYPES = {
+    MetadataFieldType.STRING: pa.string(),
+    MetadataFieldType.INT: pa.int64(),
+    MetadataFieldType.FLOAT: pa.float64(),
+}
 
 
 class LanceDBStore(VectorStoreBase):
     """LanceDB 向量数据库实现（余弦相似度版本）"""
 
     def __init__(self):
-        lancedb_cfg = get_config().database_config.lancedb_config
+        database_cfg = get_config().database_config
+        lancedb_cfg = database_cfg.lancedb_config
         self.container = lancedb_cfg.container_name # type: ignore
         self.top_k = lancedb_cfg.default_top_k # type: ignore
         self.similarity_threshold = lancedb_cfg.default_similarity_threshold # type: ignore
         self.overwrite = lancedb_cfg.overwrite # type: ignore
-        self.db_connection = lancedb.connect(lancedb_cfg.path) # type: ignore
+        self.index_type = lancedb_cfg.index_type # type: ignore
+        self.index_min_rows = lancedb_cfg.index_min_rows # type: ignore
+        self.num_partitions = lancedb_cfg.num_partitions # type: ignore
+        self.num_sub_vectors = lancedb_cfg.num_sub_vectors # type: ignore
+        self.nprobes = lancedb_cfg.nprobes # type: ignore
+        self.refine_factor = lancedb_cfg.refine_factor # type: ignore
+        self.ef = lancedb_cfg.ef # type: ignore
+        self.optimize_unindexed_rows = lancedb_cfg.optimize_unindexed_rows # type: ignore
+        self.write_batch_size = max(1, lancedb_cfg.write_batch_size) # type: ignore
+        self.search_workers = max(1, lancedb_cfg.search_workers) # type: ignore
+        # 提升为独立列并建标量索引的 metadata 字段，只有这些字段可以在检索时过滤
+        self.indexed_metadata_fields = database_cfg.vector_database_config.indexed_metadata_fields
+        self.path = lancedb_cfg.path # type: ignore
+        # 缓存的表句柄每隔 read_consistency_interval 检查一次其它进程的写入
+        self.read_consistency_interval = timedelta(seconds=lancedb_cfg.read_consistency_interval) # type: ignore
+        self.db_connection = lancedb.connect(self.path, read_consistency_interval=self.read_consistency_interval)
+        # 已打开的表句柄，本进程写入后失效
+        self._tables: Dict[str, Any] = {}
+        self._tables_lock = threading.Lock()
+        # 异步检索使用 LanceDB 的异步连接，首次使用时建立；写入仍走同步连接（在线程池中执行）
+        self._async_db: Any = None
+        self._async_tables: Dict[str, Any] = {}
 
     def warmup(self) -> None:
         self.db_connection.table_names()
 
     def close(self) -> None:
-        pass
+        with self._tables_lock:
+            self._tables.clear()
+            self._async_tables.clear()
+        if self._async_db is not None:
+            self._async_db.close()
+            self._async_db = None
+        self._shutdown_async_executor()
 
     def _open_table(self, table_name: str):
-        return self.db_connection.open_table(table_name)
+        table = self._tables.get(table_name)
+        if table is None:
+            with self._tables_lock:
+                table = self._tables.get(table_name)
+                if table is None:
+                    table = self.db_connection.open_table(table_name)
+                    self._tables[table_name] = table
+        return table
+
+    def _try_open_table(self, table_name: str):
+        """表不存在（尚未写入任何数据）时返回 None"""
+        if table_name not in self._tables and table_name not in self.db_connection.table_names():
+            return None
+        return self._open_table(table_name)
+
+    async def _aopen_table(self, table_name: str):
+        """异步表句柄，表不存在时返回 None"""
+        table = self._async_tables.get(table_name)
+        if table is None:
+            if self._async_db is None:
+                self._async_db = await lancedb.connect_async(
+                    self.path, read_consistency_interval=self.read_consistency_interval
+                )
+            if table_name not in await self._async_db.table_names():
+                return None
+            table = await self._async_db.open_table(table_name)
+            with self._tables_lock:
+                self._async_tables[table_name] = table
+        return table
+
+    def _invalidate_table(self, table_name: str) -> None:
+        with self._tables_lock:
+            self._tables.pop(table_name, None)
+            self._async_tables.pop(table_name, None)
 
     def get_full_table_name(self, simple_name: str) -> str:
         return f"{self.container}_{simple_name}"
 
     def load_documents(self, documents: List[VectorStoreDocument], table_name: str, overwrite: bool | None = None) -> None:
         overwrite = overwrite if overwrite is not None else self.overwrite
-        data = [
-            {
-                "id": doc.id,
-                "source_doc_id": doc.source_doc_id,
-                "text": doc.text,
-                "vector": normalize_vector(doc.vector),
-                "metadata": json.dumps(doc.metadata),
-            }
-            for doc in documents if doc.vector is not None
-        ]
-
-        schema = pa.schema([
-            pa.field("id", pa.string()),
-            pa.field("source_doc_id", pa.string()),
-            pa.field("text", pa.string()),
-            pa.field("vector", pa.list_(pa.float32())),
-            pa.field("metadata", pa.string()),
-        ])
-
-        # print(f"📝 准备写入 LanceDB，文档数量: {len(data)}")
-
-        if overwrite:
-            if data:
+        documents = [doc for doc in documents if doc.vector is not None]
+        metadata_fields = self.indexed_metadata_fields
+        if not overwrite and table_name in self.db_connection.table_names():
+            # 追加写入时沿用已有表的列（升级前创建的表没有提升列，需全量重建索引后才能按其过滤）
+            existing = set(self._open_table(table_name).schema.names)
+            metadata_fields = {key: t for key, t in metadata_fields.items() if metadata_column(key) in existing}
+        data = self._to_record_batch_reader(documents, metadata_fields) if documents else None
+
+        try:
+            if overwrite and data is None:
+                # 向量维度未知时无法创建空表（向量列需为定长列表），删除旧表，首次写入数据时再创建
+                if table_name in self.db_connection.table_names():
+                    self.db_connection.drop_table(table_name)
+            elif overwrite:
                 self.db_connection.create_table(
                     table_name,
                     data=data,
                     mode="overwrite"
                 )
-            else:
-                self.db_connection.create_table(
-                    table_name,
-                    schema=schema,
-                    mode="overwrite"
-                )
-        else:
+            elif table_name not in self.db_connection.table_names():
+                # 增量写入时表可能尚未创建
+                if data is not None:
+                    self.db_connection.create_table(table_name, data=data)
+            elif data is not None:
+                self._open_table(table_name).add(data, mode="append")
+        finally:
+            self._invalidate_table(table_name)
+
+        if data is not None:
+            self._maintain_index(table_name)
+
+    def _to_record_batch_reader(
+        self,
+        documents: List[VectorStoreDocument],
+        metadata_fields: Dict[str, MetadataFieldType],
+    ) -> pa.RecordBatchReader:
+        """
+        将文档转为列式数据流：每 write_batch_size 行一个 RecordBatch，在 LanceDB 读取时才逐批构造，
+        向量在整批上一次归一化后以连续的 float32 定长列表列写入
+        """
+        dim = len(documents[0].vector) # type: ignore
+        schema = _table_schema(dim, metadata_fields)
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            for start in range(0, len(documents), self.write_batch_size):
+                part = documents[start:start + self.write_batch_size]
+                vectors = normalize_vectors([doc.vector for doc in part], dim) # type: ignore
+                promoted = [promote_metadata(doc.metadata, metadata_fields) for doc in part]
+                yield pa.RecordBatch.from_arrays([
+                    pa.array([doc.id for doc in part], type=pa.string()),
+                    pa.array([doc.source_doc_id for doc in part], type=pa.string()),
+                    pa.array([doc.text for doc in part], type=pa.string()),
+                    pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), dim),
+                    pa.array([json.dumps(doc.metadata) for doc in part], type=pa.string()),
+                    *[
+                        pa.array([row[field.name] for row in promoted], type=field.type)
+                        for field in schema if field.name not in _BASE_COLUMNS
+                    ],
+                ], schema=schema)
+
+        return pa.RecordBatchReader.from_batches(schema, batches())
+
+    def delete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        if not filter_values or table_name not in self.db_connection.table_names():
+            return
+        query_filter = self._compile_filters([FieldFilter.isin(filter_column, filter_values)])
+        if query_filter:
+            try:
+                self._open_table(table_name).delete(query_filter)
+            finally:
+                self._invalidate_table(table_name)
+
+    def sample_vectors(self, table_name: str, limit: int | None = None) -> np.ndarray:
+        table = self._try_open_table(table_name)
+        if table is None:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = table.to_lance().to_table(columns=[VECTOR_COLUMN], limit=limit).column(VECTOR_COLUMN).combine_chunks()
+        return vectors.flatten().to_numpy().astype(np.float32, copy=False).reshape(len(vectors), -1)
+
+    def optimize(self, table_name: str, reindex: bool = False) -> None:
+        """合并小文件、清理已删除的行并把新增行并入向量索引；reindex 为 True 时（或尚无索引时）重建向量索引"""
+        if table_name not in self.db_connection.table_names():
+            return
+        t1 = time.time()
+        table = self._open_table(table_name)
+        try:
+            table.optimize()
+            if self.index_type != LanceDBIndexType.NONE and (reindex or self._vector_index_stats(table) is None):
+                self._create_index(table)
+        finally:
+            self._invalidate_table(table_name)
+        log.info(f"Optimized LanceDB table {table_name} in {time.time() - t1:.2f}s")
+
+    def _maintain_index(self, table_name: str) -> None:
+        """
+        写入后维护索引：过滤列缺少标量索引时创建；
+        向量索引在行数达到阈值时创建，未索引的新增行过多时增量更新（同时更新标量索引）
+        """
+        try:
             table = self._open_table(table_name)
-            if data:
-                table.add(data, mode="append")
+            if self._ensure_scalar_indexes(table):
+                self._invalidate_table(table_name)
+                table = self._open_table(table_name)
+            if self.index_type == LanceDBIndexType.NONE:
+                return
+            index_stats = self._vector_index_stats(table)
+            if index_stats is None:
+                if table.count_rows() >= self.index_min_rows:
+                    self._create_index(table)
+                    self._invalidate_table(table_name)
+            elif self.optimize_unindexed_rows and index_stats.get("num_unindexed_rows", 0) >= self.optimize_unindexed_rows:
+                table.optimize()
+                self._invalidate_table(table_name)
+        except Exception as e:
+            # 索引维护失败不影响写入，检索退化为暴力扫描
+            log.warning(f"Failed to maintain vector index of LanceDB table {table_name}: {e}")
 
-    def _build_filter(self, column: str, values: List[str]) -> Optional[str]:
-        if not values:
-            return None
-        quoted = ", ".join(f"'{v}'" for v in values)
-        return f"{column} in ({quoted})"
+    def _ensure_scalar_indexes(self, table) -> bool:
+        """为 id、source_doc_id 及提升的 metadata 列建 BTREE 标量索引，返回是否新建了索引"""
+        indexed = {tuple(index.get("fields", [])) for index in table.to_lance().list_indices()}
+        created = False
+        for name in table.schema.names:
+            if name in (VECTOR_COLUMN, "text", "metadata") or (name,) in indexed:
+                continue
+            table.create_scalar_index(name, index_type="BTREE")
+            created = True
+        return created
+
+    def _vector_index_stats(self, table) -> Optional[Dict[str, Any]]:
+        """返回向量列索引的统计信息（含 num_unindexed_rows），没有索引时返回 None"""
+        dataset = table.to_lance()
+        for index in dataset.list_indices():
+            if index.get("fields") == [VECTOR_COLUMN]:
+                return dataset.stats.index_stats(index["name"])
+        return None
+
+    def _create_index(self, table) -> None:
+        vector_type = table.schema.field(VECTOR_COLUMN).type
+        if not pa.types.is_fixed_size_list(vector_type):
+            log.warning(f"Skip vector index of LanceDB table {table.name}: vector column is not fixed size")
+            return
+        num_rows = table.count_rows()
+        dim = vector_type.list_size
+        num_partitions = self.num_partitions or max(1, int(math.sqrt(num_rows)))
+        num_sub_vectors = self.num_sub_vectors or _default_num_sub_vectors(dim)
+        t1 = time.time()
+        # 入库向量已归一化，L2距离的平方 = 2 - 2 * 余弦相似度，与检索时的分数换算一致
+        table.create_index(
+            metric="L2",
+            num_partitions=num_partitions,
+            num_sub_vectors=num_sub_vectors,
+            vector_column_name=VECTOR_COLUMN,
+            replace=True,
+            index_type=self.index_type.value,
+        )
+        log.info(
+            f"Created {self.index_type.value} index on LanceDB table {table.name} "
+            f"({num_rows} rows, {num_partitions} partitions, {num_sub_vectors} sub vectors) "
+            f"in {time.time() - t1:.2f}s"
+        )
+
+    def _compile_filters(self, filters: List[FieldFilter]) -> Optional[str]:
+        """将结构化过滤条件编译为 LanceDB 的 SQL 过滤表达式，取值按 SQL 字面量规则转义"""
+        clauses = []
+        for condition in filters:
+            column = self._filter_column(condition)
+            if condition.op == FilterOp.IN:
+                literals = ", ".join(_sql_literal(value) for value in condition.values)
+                clauses.append(f"{column} IN ({literals})" if literals else "false")
+            else:
+                clauses.append(f"{column} {SQL_OPERATORS[condition.op]} {_sql_literal(condition.value)}") # type: ignore
+        return " AND ".join(clauses) or None
+
+    def _filter_column(self, condition: FieldFilter) -> str:
+        key = condition.metadata_key
+        if key is None:
+            return condition.field
+        if key not in self.indexed_metadata_fields:
+            raise ValueError(
+                f"Cannot filter on metadata key '{key}': add it to "
+                "vector_database_config.indexed_metadata_fields and rebuild the index"
+            )
+        return metadata_column(key)
 
     def similarity_search_by_vector(
         self,
@@ -102,55 +324,240 @@ class LanceDBStore(VectorStoreBase):
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_values: list[str] | None = None
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
     ) -> List[VectorStoreSearchResult]:
         t1 = time.time()
         top_k = top_k if top_k else self.top_k
         sim_t = similarity_threshold if similarity_threshold else self.similarity_threshold
 
-        table = self._open_table(table_name)
-        query_vector = normalize_vector(vector)
-        
+        table = self._try_open_table(table_name)
+        if table is None:
+            return []
+        query_filter = self._compile_filters(build_filters(filter_column, filter_values, filters))
+        results = self._search(table, normalize_vector(vector), top_k, sim_t, query_filter, columns)
+        t2 = time.time()
+        print(f"✅ 查询 LanceDB 向量数据库 共 {len(results)} 个结果通过相似度过滤，返回 Top {top_k}，耗时 {t2 - t1} 秒")
+        return results
+
+    def batch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        """
+        批量检索：表句柄与过滤条件只准备一次，所有查询向量一次归一化，
+        各查询在线程池中并发执行（LanceDB 的检索在 Rust 端执行，不持有 GIL）
+        """
+        t1 = time.time()
+        top_k = top_k if top_k else self.top_k
+        sim_t = similarity_threshold if similarity_threshold else self.similarity_threshold
+
+        table = self._try_open_table(table_name)
+        if table is None or len(vectors) == 0:
+            return [[] for _ in vectors]
+        query_filter = self._compile_filters(build_filters(filter_column, filter_values, filters))
+        query_vectors = normalize_vectors(vectors)
+
+        with ThreadPoolExecutor(max_workers=self.search_workers) as executor:
+            results = list(executor.map(
+                lambda query_vector: self._search(table, query_vector, top_k, sim_t, query_filter, columns),
+                query_vectors,
+            ))
+        log.info(f"Searched {len(results)} vectors in LanceDB table {table_name} in {time.time() - t1:.2f}s")
+        return results
+
+    def _search(
+        self,
+        table,
+        query_vector: Sequence[float] | np.ndarray,
+        top_k: int,
+        sim_t: float,
+        query_filter: str | None,
+        columns: Sequence[str],
+    ) -> List[VectorStoreSearchResult]:
+        """对已归一化的查询向量执行一次检索"""
         # 明确使用余弦相似度搜索
         res = table.search(query_vector, vector_column_name="vector") # .metric("cosine")
+        # 以下参数只在表有对应的向量索引时生效
+        res = res.nprobes(self.nprobes)
+        if self.refine_factor:
+            res = res.refine_factor(self.refine_factor)
+        if self.ef:
+            res = res.ef(self.ef)
 
-        if filter_column and filter_values:
-            query_filter = self._build_filter(filter_column, filter_values)
-            if query_filter:
-                res = res.where(query_filter, prefilter=True)
+        max_distance = _max_distance(sim_t)
+        if query_filter:
+            res = res.where(query_filter, prefilter=True)
+        elif max_distance is not None:
+            res = res.where(f"_distance <= {max_distance}", prefilter=False)
 
-        docs = res.limit(top_k * 3).to_list()  # 获取更多结果以便后续过滤
+        # 结果按距离升序，阈值过滤只会去掉尾部，因此只需取 top_k 条
+        hits = res.select(list(columns)).limit(top_k).to_arrow()
+        return _to_results(hits, max_distance if query_filter else None)
 
-        results = []
-        for i, doc in enumerate(docs):
-            raw_score = float(doc["_distance"])
-            normalized_score = 1 - 0.5 * raw_score
-            if sim_t > 0 and normalized_score < sim_t:
-                continue
-            results.append(VectorStoreSearchResult(
-                document=VectorStoreDocument(
-                    id=doc["id"],
-                    text=doc["text"],
-                    source_doc_id=doc["source_doc_id"],
-                    vector=doc["vector"],
-                    metadata=json.loads(doc["metadata"]),
-                ),
-                score=normalized_score,  # 使用归一化后的分数
-            ))
-        t2 = time.time()
-        print(f"✅ 查询 LanceDB 向量数据库 共 {len(results)} 个结果通过相似度过滤，返回 Top {top_k}，耗时 {t2 - t1} 秒")
-        return results[:top_k]
+    async def asimilarity_search_by_vector(
+        self,
+        vector: list[float],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[VectorStoreSearchResult]:
+        t1 = time.time()
+        top_k = top_k if top_k else self.top_k
+        sim_t = similarity_threshold if similarity_threshold else self.similarity_threshold
 
-    def search_by_id(self, table_name: str, id: str) -> VectorStoreDocument:
-        table = self._open_table(table_name)
-        docs = table.search().where(f"id == '{id}'", prefilter=True).to_list()
+        table = await self._aopen_table(table_name)
+        if table is None:
+            return []
+        query_filter = self._compile_filters(build_filters(filter_column, filter_values, filters))
+        results = await self._asearch(table, normalize_vector(vector), top_k, sim_t, query_filter, columns)
+        log.debug(f"Searched LanceDB table {table_name}: {len(results)} results (top {top_k}) in {time.time() - t1:.2f}s")
+        return results
+
+    async def abatch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        """批量异步检索，同时进行的查询数不超过 search_workers"""
+        t1 = time.time()
+        top_k = top_k if top_k else self.top_k
+        sim_t = similarity_threshold if similarity_threshold else self.similarity_threshold
+
+        table = await self._aopen_table(table_name)
+        if table is None or len(vectors) == 0:
+            return [[] for _ in vectors]
+        query_filter = self._compile_filters(build_filters(filter_column, filter_values, filters))
+        semaphore = asyncio.Semaphore(self.search_workers)
+
+        async def search(query_vector: np.ndarray) -> List[VectorStoreSearchResult]:
+            async with semaphore:
+                return await self._asearch(table, query_vector, top_k, sim_t, query_filter, columns)
+
+        results = await asyncio.gather(*(search(query_vector) for query_vector in normalize_vectors(vectors)))
+        log.info(f"Searched {len(results)} vectors in LanceDB table {table_name} in {time.time() - t1:.2f}s")
+        return list(results)
+
+    async def _asearch(
+        self,
+        table,
+        query_vector: Sequence[float] | np.ndarray,
+        top_k: int,
+        sim_t: float,
+        query_filter: str | None,
+        columns: Sequence[str],
+    ) -> List[VectorStoreSearchResult]:
+        """_search 的异步版本：检索在 LanceDB 的后台运行时中执行，不占用事件循环"""
+        res = table.vector_search(query_vector).column(VECTOR_COLUMN).nprobes(self.nprobes)
+        if self.refine_factor:
+            res = res.refine_factor(self.refine_factor)
+        if self.ef:
+            res = res.ef(self.ef)
+
+        max_distance = _max_distance(sim_t)
+        if query_filter:
+            res = res.where(query_filter)
+        elif max_distance is not None:
+            res = res.where(f"_distance <= {max_distance}").postfilter()
+
+        hits = await res.select(list(columns)).limit(top_k).to_arrow()
+        return _to_results(hits, max_distance if query_filter else None)
+
+    def search_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
+        table = self._try_open_table(table_name)
+        docs = []
+        if table is not None:
+            id_filter = self._compile_filters([FieldFilter.eq("id", id)])
+            docs = table.search().where(id_filter, prefilter=True).select(list(columns)).limit(1).to_list()
+        if not docs:
+            return VectorStoreDocument(id=id, source_doc_id=None, text=None, vector=None)
+        return _to_document(docs[0])
+
+    async def asearch_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
+        table = await self._aopen_table(table_name)
+        docs = []
+        if table is not None:
+            id_filter = self._compile_filters([FieldFilter.eq("id", id)])
+            docs = await table.query().where(id_filter).select(list(columns)).limit(1).to_list() # type: ignore
         if not docs:
             return VectorStoreDocument(id=id, source_doc_id=None, text=None, vector=None)
-        doc = docs[0]
-        return VectorStoreDocument(
-            id=doc["id"],
-            text=doc["text"],
-            source_doc_id=doc["source_doc_id"],
-            vector=doc["vector"],
-            metadata=json.loads(doc["metadata"]),
-        )
\ No newline at end of file
+        return _to_document(docs[0])
+
+
+def _max_distance(sim_t: float) -> Optional[float]:
+    """向量已归一化：分数 = 1 - 0.5 * L2距离的平方，相似度阈值换算为距离上限"""
+    return 2 * (1 - sim_t) if sim_t > 0 else None
+
+
+def _to_results(hits: pa.Table, max_distance: Optional[float] = None) -> List[VectorStoreSearchResult]:
+    """
+    由检索结果构造带分数的结果列表。
+    一次查询只能有一个过滤条件：有前置过滤时传入 max_distance，距离阈值在返回的（至多 top_k 条）结果上向量化过滤
+    """
+    if max_distance is not None:
+        hits = hits.filter(pc.less_equal(hits["_distance"], max_distance))
+    scores = pc.subtract(1, pc.multiply(hits["_distance"], 0.5)).to_pylist()
+    return [
+        VectorStoreSearchResult(document=_to_document(row), score=score)
+        for row, score in zip(hits.drop_columns(["_distance"]).to_pylist(), scores)
+    ]
+
+
+def _to_document(row: Dict[str, Any]) -> VectorStoreDocument:
+    """由查询结果的一行构造文档，未选择的列为空"""
+    metadata = row.get("metadata")
+    return VectorStoreDocument(
+        id=row.get("id"), # type: ignore
+        text=row.get("text"),
+        source_doc_id=row.get("source_doc_id"),
+        vector=row.get(VECTOR_COLUMN),
+        metadata=json.loads(metadata) if metadata else {},
+    )
+
+def _table_schema(dim: int, metadata_fields: Dict[str, MetadataFieldType]) -> pa.Schema:
+    return pa.schema([
+        pa.field("id", pa.string()),
+        pa.field("source_doc_id", pa.string()),
+        pa.field("text", pa.string()),
+        pa.field(VECTOR_COLUMN, pa.list_(pa.float32(), dim)),
+        pa.field("metadata", pa.string()),
+        *[pa.field(metadata_column(key), _ARROW_TYPES[field_type]) for key, field_type in metadata_fields.items()],
+    ])
+
+
+def _sql_literal(value: FilterValue) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _default_num_sub_vectors(dim: int) -> int:
+    """默认每个子向量16维左右，且子向量数需整除维度"""
+    for num in range(max(1, dim // 16), 0, -1):
+        if dim % num == 0:
+            return num
+    return 1
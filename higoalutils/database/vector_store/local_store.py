@@ -0,0 +1,557 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+进程内的本地向量索引，无需外部服务，适合中小规模（约20万条以内）的语料。
+
+每张表一个目录，由若干不可变的段组成，每段包含：
+- {段名}.npy：归一化后的 float32 向量矩阵，以内存映射方式读取
+- {段名}.arrow：id、source_doc_id、text、metadata 列（Arrow IPC 文件，内存映射读取）
+manifest.json 记录当前的段列表，写完新段后原子替换；其它进程通过 manifest 的修改时间发现写入。
+
+检索对每段做一次矩阵-向量乘积（向量已归一化，内积即余弦相似度），用 argpartition 取 top_k；
+按 source_doc_id / id 过滤时先由预先构建的 取值 -> 行号 索引取出候选行再计算；
+其它过滤条件（metadata 键、范围比较）在首次使用时按列缓存取值，逐行比较得到候选行。
+追加写入生成新段，末尾相邻的段行数相近时合并（段数保持在 O(log n)），optimize 合并为一段。
+
+开启量化（quantization）时每段另存 {段名}.q.npz（int8 或二值编码），编码常驻内存用于生成
+top_k * rerank_factor 个候选，float32 向量仍以内存映射方式只读取候选行做精确重排。
+"""
+
+import json
+import logging
+import operator
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from higoalutils.config.load_config import get_config
+from higoalutils.database.vector_store.base import (
+    DEFAULT_SEARCH_COLUMNS,
+    FilterColumn,
+    VectorStoreBase,
+    VectorStoreDocument,
+    VectorStoreSearchResult,
+)
+from higoalutils.database.vector_store.enums import VectorQuantization
+from higoalutils.database.vector_store.filters import FieldFilter, FilterOp, build_filters
+from higoalutils.database.vector_store.quantization import approximate_scores, quantize, top_indices
+from higoalutils.database.vector_store.utils import normalize_vectors
+
+log = logging.getLogger(__name__)
+
+_COMPARATORS = {
+    FilterOp.EQ: operator.eq,
+    FilterOp.GT: operator.gt,
+    FilterOp.GTE: operator.ge,
+    FilterOp.LT: operator.lt,
+    FilterOp.LTE: operator.le,
+}
+
+VECTOR_COLUMN = "vector"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+META_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("source_doc_id", pa.string()),
+    pa.field("text", pa.string()),
+    pa.field("metadata", pa.string()),
+])
+
+
+@dataclass
+class _Segment:
+    name: str
+    vectors: np.ndarray
+    """(行数, 维度) 的 float32 内存映射矩阵"""
+    meta: pa.Table
+    codes: np.ndarray | None = None
+    """量化编码（常驻内存），未开启量化时为空"""
+    scale: np.ndarray | None = None
+    """int8 量化的每维缩放系数"""
+
+    @property
+    def num_rows(self) -> int:
+        return self.vectors.shape[0]
+
+
+class _TableState:
+    """已加载的表：段列表及 id / source_doc_id -> 全局行号 的索引。只读，写入后整体替换"""
+
+    def __init__(
+        self,
+        segments: List[_Segment],
+        dim: int,
+        mtime_ns: int,
+        quantization: VectorQuantization = VectorQuantization.NONE,
+    ):
+        self.segments = segments
+        self.dim = dim
+        self.mtime_ns = mtime_ns
+        self.quantization = quantization
+        self.offsets = np.cumsum([0] + [segment.num_rows for segment in segments])
+        self.num_rows = int(self.offsets[-1])
+        self.row_by_id: Dict[str, int] = {}
+        rows_by_doc: Dict[str, List[int]] = defaultdict(list)
+        for segment, start in zip(segments, self.offsets.tolist()):
+            ids = segment.meta.column("id").to_pylist()
+            doc_ids = segment.meta.column("source_doc_id").to_pylist()
+            for row, (id, doc_id) in enumerate(zip(ids, doc_ids), start=start):
+                self.row_by_id[id] = row
+                rows_by_doc[doc_id].append(row)
+        self.rows_by_doc = {doc_id: np.asarray(rows, dtype=np.int64) for doc_id, rows in rows_by_doc.items()}
+        # 过滤字段 -> 全表取值（object 数组），首次按该字段过滤时构建
+        self._field_values: Dict[str, np.ndarray] = {}
+
+    def filter_rows(self, column: str, values: Sequence[str]) -> np.ndarray:
+        """filter_column 取值在 values 中的全局行号"""
+        values = list(dict.fromkeys(values))
+        if column == FilterColumn.DOCID.value:
+            parts = [self.rows_by_doc[value] for value in values if value in self.rows_by_doc]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        if column == FilterColumn.ID.value:
+            return np.asarray([self.row_by_id[value] for value in values if value in self.row_by_id], dtype=np.int64)
+        raise ValueError(f"Invalid filter_column: {column}")
+
+    def match_rows(self, filters: Sequence[FieldFilter]) -> np.ndarray | None:
+        """满足所有过滤条件的全局行号（升序），没有过滤条件时返回 None"""
+        rows = None
+        for condition in filters:
+            if condition.metadata_key is None and condition.op in (FilterOp.EQ, FilterOp.IN):
+                matched = np.unique(self.filter_rows(condition.field, condition.values)) # type: ignore
+            else:
+                matched = np.flatnonzero(self._compare(condition))
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+            if len(rows) == 0:
+                break
+        return rows
+
+    def _compare(self, condition: FieldFilter) -> np.ndarray:
+        """逐行比较，取值缺失或类型不可比较的行不满足条件"""
+        values = self._values_of(condition.field, condition.metadata_key)
+        if condition.op == FilterOp.IN:
+            targets = set(condition.values)
+            return np.fromiter((value in targets for value in values), dtype=bool, count=len(values))
+        compare, target = _COMPARATORS[condition.op], condition.value
+
+        def matches(value) -> bool:
+            try:
+                return value is not None and compare(value, target)
+            except TypeError:
+                return False
+
+        return np.fromiter((matches(value) for value in values), dtype=bool, count=len(values))
+
+    def _values_of(self, field: str, key: str | None) -> np.ndarray:
+        values = self._field_values.get(field)
+        if values is None:
+            column = "metadata" if key is not None else field
+            raw = [value for segment in self.segments for value in segment.meta.column(column).to_pylist()]
+            if key is not None:
+                raw = [json.loads(metadata).get(key) if metadata else None for metadata in raw]
+            values = np.empty(len(raw), dtype=object)
+            values[:] = raw
+            self._field_values[field] = values
+        return values
+
+    def locate(self, rows: np.ndarray) -> np.ndarray:
+        """全局行号所在的段下标"""
+        return np.searchsorted(self.offsets, rows, side="right") - 1
+
+    def vectors_at(self, rows: np.ndarray) -> np.ndarray:
+        return self._gather("vectors", rows)
+
+    def _gather(self, attr: str, rows: np.ndarray) -> np.ndarray:
+        """按全局行号取各段的 vectors / codes"""
+        if len(self.segments) == 1:
+            return getattr(self.segments[0], attr)[rows]
+        first = getattr(self.segments[0], attr)
+        out = np.empty((len(rows), first.shape[1]), dtype=first.dtype)
+        segment_idx = self.locate(rows)
+        for i in np.unique(segment_idx).tolist():
+            mask = segment_idx == i
+            out[mask] = getattr(self.segments[i], attr)[rows[mask] - self.offsets[i]]
+        return out
+
+    def scores(self, queries: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """(查询数, 候选行数) 的相似度矩阵，rows 为空时对全表计算"""
+        if rows is not None:
+            return queries @ self.vectors_at(rows).T
+        return np.concatenate([queries @ segment.vectors.T for segment in self.segments], axis=1)
+
+    def approximate_scores(self, queries: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """由量化编码计算的近似相似度矩阵，rows 为空时对全表计算"""
+        if rows is not None:
+            # 各段的 int8 缩放系数不同，按段分别计算
+            scores = np.empty((len(queries), len(rows)), dtype=np.float32)
+            segment_idx = self.locate(rows)
+            for i in np.unique(segment_idx).tolist():
+                mask = segment_idx == i
+                segment = self.segments[i]
+                scores[:, mask] = approximate_scores(
+                    self.quantization, segment.codes[rows[mask] - self.offsets[i]], queries, self.dim, segment.scale # type: ignore
+                )
+            return scores
+        return np.concatenate([
+            approximate_scores(self.quantization, segment.codes, queries, self.dim, segment.scale) # type: ignore
+            for segment in self.segments
+        ], axis=1)
+
+    def documents(self, rows: np.ndarray, columns: Sequence[str]) -> List[VectorStoreDocument]:
+        """按行号取文档，每段只做一次 take"""
+        meta_columns = [name for name in columns if name in META_SCHEMA.names]
+        docs: List[Any] = [None] * len(rows)
+        segment_idx = self.locate(rows)
+        for i in np.unique(segment_idx).tolist():
+            positions = np.flatnonzero(segment_idx == i)
+            local_rows = rows[positions] - self.offsets[i]
+            segment = self.segments[i]
+            records = segment.meta.select(meta_columns).take(pa.array(local_rows)).to_pylist()
+            vectors = segment.vectors[local_rows].tolist() if VECTOR_COLUMN in columns else None
+            for j, (position, record) in enumerate(zip(positions.tolist(), records)):
+                docs[position] = _to_document(record, vectors[j] if vectors is not None else None)
+        return docs
+
+
+class LocalVectorStore(VectorStoreBase):
+    """本地 NumPy 内存映射向量索引实现（余弦相似度）"""
+
+    def __init__(self):
+        local_cfg = get_config().database_config.local_vector_config
+        self.path = Path(local_cfg.path) # type: ignore
+        self.container = local_cfg.container_name # type: ignore
+        self.top_k = local_cfg.default_top_k # type: ignore
+        self.similarity_threshold = local_cfg.default_similarity_threshold # type: ignore
+        self.overwrite = local_cfg.overwrite # type: ignore
+        self.quantization = local_cfg.quantization # type: ignore
+        self.rerank_factor = max(1, local_cfg.rerank_factor) # type: ignore
+        # 已加载的表，manifest 被修改（本进程或其它进程写入）后重新加载
+        self._states: Dict[str, _TableState] = {}
+        self._states_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def warmup(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def close(self) -> None:
+        with self._states_lock:
+            self._states.clear()
+        self._shutdown_async_executor()
+
+    def get_full_table_name(self, simple_name: str) -> str:
+        return f"{self.container}_{simple_name}"
+
+    def _table_dir(self, table_name: str) -> Path:
+        return self.path / table_name
+
+    def _state(self, table_name: str) -> Optional[_TableState]:
+        """表的当前状态，表不存在或为空时返回 None"""
+        manifest_path = self._table_dir(table_name) / MANIFEST_FILE
+        try:
+            mtime_ns = manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        state = self._states.get(table_name)
+        if state is None or state.mtime_ns != mtime_ns:
+            with self._states_lock:
+                state = self._states.get(table_name)
+                if state is None or state.mtime_ns != mtime_ns:
+                    state = self._load_state(table_name, mtime_ns)
+                    self._states[table_name] = state
+        return state if state.num_rows else None
+
+    def _load_state(self, table_name: str, mtime_ns: int) -> _TableState:
+        """加载 manifest 中的各段；段不可变，上次已加载的段直接复用"""
+        table_dir = self._table_dir(table_name)
+        manifest = _read_manifest(table_dir)
+        previous = self._states.get(table_name)
+        loaded = {segment.name: segment for segment in previous.segments} if previous else {}
+        segments = []
+        for entry in manifest["segments"]:
+            segment = loaded.get(entry["name"])
+            if segment is None:
+                segment = _Segment(
+                    name=entry["name"],
+                    vectors=np.load(table_dir / f"{entry['name']}.npy", mmap_mode="r"),
+                    meta=pa.ipc.open_file(pa.memory_map(str(table_dir / f"{entry['name']}.arrow"))).read_all(),
+                )
+                if self.quantization != VectorQuantization.NONE:
+                    segment.codes, segment.scale = _load_codes(table_dir, segment, self.quantization)
+            segments.append(segment)
+        return _TableState(segments, manifest["dim"] or 0, mtime_ns, self.quantization)
+
+    def load_documents(self, documents: List[VectorStoreDocument], table_name: str, overwrite: bool | None = None) -> None:
+        """写入一个新段；overwrite 时替换全部段，否则同ID的旧行先删除（重复写入幂等）"""
+        overwrite = overwrite if overwrite is not None else self.overwrite
+        documents = [doc for doc in documents if doc.vector is not None]
+        table_dir = self._table_dir(table_name)
+        table_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._write_lock:
+            manifest = _read_manifest(table_dir)
+            obsolete = [entry["name"] for entry in manifest["segments"]] if overwrite else []
+            if overwrite:
+                manifest = _empty_manifest()
+            elif documents:
+                state = self._state(table_name)
+                if state is not None:
+                    stale = state.filter_rows(FilterColumn.ID.value, [doc.id for doc in documents])
+                    obsolete += self._drop_rows(table_dir, manifest, state, stale)
+
+            if documents:
+                dim = manifest["dim"] or len(documents[0].vector) # type: ignore
+                vectors = normalize_vectors([doc.vector for doc in documents], dim) # type: ignore
+                meta = pa.table({
+                    "id": [doc.id for doc in documents],
+                    "source_doc_id": [doc.source_doc_id for doc in documents],
+                    "text": [doc.text for doc in documents],
+                    "metadata": [json.dumps(doc.metadata) for doc in documents],
+                }, schema=META_SCHEMA)
+                manifest["dim"] = dim
+                manifest["segments"].append(_write_segment(table_dir, vectors, meta))
+                obsolete += self._merge_tail(table_dir, manifest)
+
+            self._commit(table_dir, manifest, obsolete)
+
+    def delete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        if not filter_values:
+            return
+        table_dir = self._table_dir(table_name)
+        with self._write_lock:
+            state = self._state(table_name)
+            if state is None:
+                return
+            rows = state.filter_rows(filter_column, filter_values)
+            if len(rows) == 0:
+                return
+            manifest = _read_manifest(table_dir)
+            obsolete = self._drop_rows(table_dir, manifest, state, rows)
+            self._commit(table_dir, manifest, obsolete)
+
+    def sample_vectors(self, table_name: str, limit: int | None = None) -> np.ndarray:
+        state = self._state(table_name)
+        if state is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return state.vectors_at(np.arange(min(state.num_rows, limit or state.num_rows)))
+
+    def optimize(self, table_name: str, reindex: bool = False) -> None:
+        """把所有段合并为一段，并清理不在 manifest 中的残留段文件"""
+        table_dir = self._table_dir(table_name)
+        if not (table_dir / MANIFEST_FILE).exists():
+            return
+        t1 = time.time()
+        with self._write_lock:
+            manifest = _read_manifest(table_dir)
+            obsolete = []
+            if len(manifest["segments"]) > 1:
+                obsolete = [entry["name"] for entry in manifest["segments"]]
+                manifest["segments"] = [_merge_segments(table_dir, manifest["segments"], manifest["dim"])]
+            self._commit(table_dir, manifest, obsolete)
+            live = {entry["name"] for entry in manifest["segments"]}
+            for file in table_dir.iterdir():
+                if file.name.startswith("seg-") and file.name.split(".")[0] not in live:
+                    file.unlink(missing_ok=True)
+        log.info(f"Optimized local vector table {table_name} in {time.time() - t1:.2f}s")
+
+    def _drop_rows(self, table_dir: Path, manifest: Dict, state: _TableState, rows: np.ndarray) -> List[str]:
+        """重写包含 rows 的段（去掉这些行），更新 manifest，返回被替换的段名"""
+        if len(rows) == 0:
+            return []
+        segment_idx = state.locate(rows)
+        replaced = {}
+        for i in np.unique(segment_idx).tolist():
+            segment = state.segments[i]
+            keep = np.ones(segment.num_rows, dtype=bool)
+            keep[rows[segment_idx == i] - state.offsets[i]] = False
+            kept_rows = np.flatnonzero(keep)
+            replaced[segment.name] = (
+                _write_segment(table_dir, segment.vectors[kept_rows], segment.meta.take(pa.array(kept_rows)))
+                if len(kept_rows) else None
+            )
+        segments = []
+        for entry in manifest["segments"]:
+            entry = replaced.get(entry["name"], entry)
+            if entry is not None:
+                segments.append(entry)
+        manifest["segments"] = segments
+        return list(replaced)
+
+    def _merge_tail(self, table_dir: Path, manifest: Dict) -> List[str]:
+        """末尾的段行数不小于前一段的一半时合并两者，重复直到不满足，返回被合并的段名"""
+        segments = manifest["segments"]
+        obsolete = []
+        while len(segments) >= 2 and segments[-1]["rows"] * 2 >= segments[-2]["rows"]:
+            tail = segments[-2:]
+            obsolete += [entry["name"] for entry in tail]
+            segments[-2:] = [_merge_segments(table_dir, tail, manifest["dim"])]
+        return obsolete
+
+    def _commit(self, table_dir: Path, manifest: Dict, obsolete: List[str]) -> None:
+        """原子替换 manifest 后删除被替换的段文件（已映射这些文件的读者不受影响）"""
+        tmp_path = table_dir / f"{MANIFEST_FILE}.tmp"
+        tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp_path, table_dir / MANIFEST_FILE)
+        for name in obsolete:
+            for suffix in (".npy", ".arrow", ".q.npz"):
+                (table_dir / f"{name}{suffix}").unlink(missing_ok=True)
+
+    def similarity_search_by_vector(
+        self,
+        vector: list[float],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[VectorStoreSearchResult]:
+        return self.batch_similarity_search(
+            [vector], table_name, top_k, similarity_threshold, filter_column, filter_values, columns, filters
+        )[0]
+
+    def batch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        """
+        所有查询与（过滤后的）候选行一次矩阵乘积求相似度，按行 argpartition 取 top_k。
+        开启量化且候选行较多时，先由编码取 top_k * rerank_factor 个候选，再用 float32 向量精确重排
+        """
+        top_k = top_k if top_k else self.top_k
+        sim_t = similarity_threshold if similarity_threshold else self.similarity_threshold
+
+        state = self._state(table_name)
+        if state is None or len(vectors) == 0:
+            return [[] for _ in vectors]
+        candidates = state.match_rows(build_filters(filter_column, filter_values, filters))
+        if candidates is not None and len(candidates) == 0:
+            return [[] for _ in vectors]
+
+        queries = normalize_vectors(vectors, state.dim)
+        num_candidates = state.num_rows if candidates is None else len(candidates)
+        num_rerank = top_k * self.rerank_factor
+        if self.quantization != VectorQuantization.NONE and num_candidates > num_rerank:
+            pool, _ = top_indices(state.approximate_scores(queries, candidates), num_rerank)
+            pool_rows = pool if candidates is None else candidates[pool]
+            exact = np.einsum("mkd,md->mk", state.vectors_at(pool_rows.reshape(-1)).reshape(*pool.shape, -1), queries)
+            rerank, top_scores = top_indices(exact, top_k)
+            top = np.take_along_axis(pool, rerank, axis=1)
+        else:
+            top, top_scores = top_indices(state.scores(queries, candidates), top_k)
+
+        results = []
+        for query_top, query_scores in zip(top, top_scores):
+            passed = query_scores >= sim_t if sim_t > 0 else np.ones(len(query_scores), dtype=bool)
+            rows = query_top[passed] if candidates is None else candidates[query_top[passed]]
+            documents = state.documents(rows, columns)
+            results.append([
+                VectorStoreSearchResult(document=document, score=score)
+                for document, score in zip(documents, query_scores[passed].tolist())
+            ])
+        return results
+
+    def search_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
+        state = self._state(table_name)
+        row = state.row_by_id.get(id) if state is not None else None
+        if row is None:
+            return VectorStoreDocument(id=id, source_doc_id=None, text=None, vector=None)
+        return state.documents(np.asarray([row], dtype=np.int64), columns)[0] # type: ignore
+
+
+def _empty_manifest() -> Dict:
+    return {"version": MANIFEST_VERSION, "dim": None, "segments": []}
+
+
+def _read_manifest(table_dir: Path) -> Dict:
+    manifest_path = table_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return _empty_manifest()
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported local vector table version {manifest.get('version')} in {table_dir}")
+    return manifest
+
+
+def _load_codes(
+    table_dir: Path, segment: _Segment, quantization: VectorQuantization
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """读取段的量化编码；不存在或量化方式已变更时由 float32 向量生成并保存"""
+    path = table_dir / f"{segment.name}.q.npz"
+    if path.exists():
+        with np.load(path) as data:
+            if str(data["quantization"]) == quantization.value:
+                return data["codes"], data["scale"] if "scale" in data else None
+    encoded = quantize(np.asarray(segment.vectors), quantization)
+    tmp_path = table_dir / f"{segment.name}.q.tmp.npz"
+    np.savez(tmp_path, quantization=np.array(quantization.value), **encoded)
+    os.replace(tmp_path, path)
+    return encoded["codes"], encoded.get("scale")
+
+
+def _write_segment(table_dir: Path, vectors: np.ndarray, meta: pa.Table) -> Dict:
+    """写入一个新段，返回其 manifest 条目"""
+    name = f"seg-{uuid.uuid4().hex[:16]}"
+    np.save(table_dir / f"{name}.npy", np.ascontiguousarray(vectors, dtype=np.float32))
+    with pa.OSFile(str(table_dir / f"{name}.arrow"), "wb") as sink, pa.ipc.new_file(sink, META_SCHEMA) as writer:
+        writer.write_table(meta)
+    return {"name": name, "rows": len(meta)}
+
+
+def _merge_segments(table_dir: Path, entries: List[Dict], dim: int) -> Dict:
+    """按顺序合并若干段为一个新段，向量逐段复制到新的内存映射文件中"""
+    name = f"seg-{uuid.uuid4().hex[:16]}"
+    total = sum(entry["rows"] for entry in entries)
+    merged = np.lib.format.open_memmap(table_dir / f"{name}.npy", mode="w+", dtype=np.float32, shape=(total, dim))
+    metas = []
+    start = 0
+    for entry in entries:
+        vectors = np.load(table_dir / f"{entry['name']}.npy", mmap_mode="r")
+        merged[start:start + len(vectors)] = vectors
+        start += len(vectors)
+        metas.append(pa.ipc.open_file(pa.memory_map(str(table_dir / f"{entry['name']}.arrow"))).read_all())
+    merged.flush()
+    del merged
+    with pa.OSFile(str(table_dir / f"{name}.arrow"), "wb") as sink, pa.ipc.new_file(sink, META_SCHEMA) as writer:
+        writer.write_table(pa.concat_tables(metas))
+    return {"name": name, "rows": total}
+
+
+def _to_document(record: Dict[str, Any], vector: list[float] | None) -> VectorStoreDocument:
+    """由一行元数据构造文档，未选择的列为空"""
+    metadata = record.get("metadata")
+    return VectorStoreDocument(
+        id=record.get("id"), # type: ignore
+        text=record.get("text"),
+        source_doc_id=record.get("source_doc_id"),
+        vector=vector,
+        metadata=json.loads(metadata) if metadata else {},
+    )
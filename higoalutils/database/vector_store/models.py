@@ -12,13 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pydantic import BaseModel
+from typing import Dict
 
-from higoalutils.database.vector_store.enums import VectorDatabaseType
+from pydantic import BaseModel, Field
+
+from higoalutils.database.vector_store.enums import (
+    LanceDBIndexType, MetadataFieldType, VectorDatabaseType, VectorQuantization
+)
 
 
 class VectorDatabaseConfig(BaseModel):
     type: VectorDatabaseType
+    indexed_metadata_fields: Dict[str, MetadataFieldType] = Field(
+        default_factory=lambda: {"creation_date": MetadataFieldType.STRING},
+        description="可在检索时过滤的 metadata 键及其类型，写入时提升为独立列并建标量索引（修改后需全量重建索引）"
+    )
 
 
 class LancedbConfig(BaseModel):
@@ -27,6 +35,26 @@ class LancedbConfig(BaseModel):
     container_name: str
     default_top_k: int
     default_similarity_threshold: float
+    index_type: LanceDBIndexType = Field(default=LanceDBIndexType.IVF_PQ, description="向量索引类型")
+    index_min_rows: int = Field(default=100_000, description="表的行数达到该值后才建向量索引，之前暴力扫描")
+    num_partitions: int = Field(default=0, description="IVF分区数，0 表示按 sqrt(行数) 自动确定")
+    num_sub_vectors: int = Field(default=0, description="PQ子向量数（需整除向量维度），0 表示按维度自动确定")
+    nprobes: int = Field(default=20, description="检索时探查的IVF分区数")
+    refine_factor: int = Field(default=5, description="按原始向量重排 top_k * refine_factor 个候选（使分数为精确值），0 表示不重排")
+    ef: int = Field(default=0, description="HNSW检索时的候选列表大小，0 表示使用默认值")
+    optimize_unindexed_rows: int = Field(default=50_000, description="未被索引的新增行数达到该值时增量更新索引，0 表示不自动更新")
+    write_batch_size: int = Field(default=8192, description="写入时每个RecordBatch的行数")
+    search_workers: int = Field(default=8, description="批量检索时并发执行查询的线程数")
+    read_consistency_interval: float = Field(default=5.0, description="缓存的表句柄检查其它进程写入的间隔（秒），0 表示每次读取都检查")
+
+class LocalVectorConfig(BaseModel):
+    path: str
+    overwrite: bool
+    container_name: str
+    default_top_k: int
+    default_similarity_threshold: float
+    quantization: VectorQuantization = Field(default=VectorQuantization.NONE, description="量化方式：int8 / binary 编码常驻内存生成候选，float32 向量只用于重排")
+    rerank_factor: int = Field(default=4, description="开启量化时由编码取 top_k * rerank_factor 个候选做精确重排")
 
 class OBVeConfig(BaseModel):
     host: str
@@ -37,4 +65,10 @@ class OBVeConfig(BaseModel):
     overwrite: bool
     container_name: str
     default_top_k: int
-    default_similarity_threshold: float
\ No newline at end of file
+    default_similarity_threshold: float
+    insert_batch_size: int = Field(default=1000, description="每条多行INSERT语句写入的行数")
+    vector_dim: int = Field(default=0, description="向量维度，0 表示取模型注册表中嵌入模型的dimension，未登记时按写入的数据确定")
+    hnsw_m: int = Field(default=16, description="HNSW索引每个节点的最大邻居数")
+    hnsw_ef_construction: int = Field(default=200, description="HNSW索引构建时的候选列表大小")
+    hnsw_ef_search: int = Field(default=64, description="HNSW检索时的候选列表大小（会话变量ob_hnsw_ef_search），0 表示使用数据库默认值")
+    async_workers: int = Field(default=8, description="异步接口执行数据库调用的线程数（同时进行的查询数上限）")
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, List
+from typing import Any, List, Sequence
+import numpy as np
 from higoalutils.database.vector_store.base import (
+    DEFAULT_SEARCH_COLUMNS,
     VectorStoreBase,
     VectorStoreDocument,
     VectorStoreSearchResult,
 )
+from higoalutils.database.vector_store.filters import FieldFilter
 
 class NullVectorStore(VectorStoreBase):
     """无操作的向量数据库实现，用于禁用或调试场景"""
@@ -29,6 +32,9 @@ class NullVectorStore(VectorStoreBase):
     def load_documents(self, documents: List[VectorStoreDocument], table_name: str, overwrite: bool | None = None) -> None:
         pass
 
+    def delete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        pass
+
     def close(self) -> None:
         pass
 
@@ -48,11 +54,28 @@ class NullVectorStore(VectorStoreBase):
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_values: list[str] | None = None
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
     ) -> List[VectorStoreSearchResult]:
        return []
 
-    def search_by_id(self, table_name: str, id: str) -> VectorStoreDocument:
+    def batch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        return [[] for _ in vectors]
+
+    def search_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
         return VectorStoreDocument(id=id, source_doc_id=None, text=None,  vector=None)
 
     def get_full_table_name(self, simple_name: str) -> str:
@@ -13,29 +13,66 @@
 # limitations under the License.
 
 import json
-from typing import List
-from sqlalchemy import Column, String, Text, JSON as SQL_JSON, func
+import logging
+import operator
+import threading
+from typing import Any, Callable, Dict, List, Sequence
+import numpy as np
+from sqlalchemy import (
+    BigInteger, Column, Double, MetaData, String, Table, Text, JSON as SQL_JSON,
+    bindparam, column, event, func, literal_column, select, text, union_all
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from pyobvector import ObVecClient, VECTOR
 import time
 
 from higoalutils.database.vector_store.base import (
-    VectorStoreBase, VectorStoreDocument, VectorStoreSearchResult
+    DEFAULT_SEARCH_COLUMNS, VectorStoreBase, VectorStoreDocument, VectorStoreSearchResult
+)
+from higoalutils.database.vector_store.enums import MetadataFieldType
+from higoalutils.database.vector_store.filters import (
+    FieldFilter, FilterOp, build_filters, metadata_column, promote_metadata
 )
 from higoalutils.config.load_config import get_config
-from higoalutils.database.vector_store.utils  import normalize_vector
+from higoalutils.config.load_model_info import get_model_info
+from higoalutils.database.vector_store.utils  import normalize_vector, normalize_vectors
+
+log = logging.getLogger(__name__)
 
+_COLUMN_TYPES = {
+    MetadataFieldType.STRING: ("VARCHAR(255)", lambda: String(255)),
+    MetadataFieldType.INT: ("BIGINT", BigInteger),
+    MetadataFieldType.FLOAT: ("DOUBLE", Double),
+}
+_OPERATORS: Dict[FilterOp, Callable[[Any, Any], Any]] = {
+    FilterOp.EQ: operator.eq,
+    FilterOp.IN: lambda target, values: target.in_(values),
+    FilterOp.GT: operator.gt,
+    FilterOp.GTE: operator.ge,
+    FilterOp.LT: operator.lt,
+    FilterOp.LTE: operator.le,
+}
 
 
 class OBVectorStore(VectorStoreBase):
     """OceanBase 向量数据库实现（基于 pyobvector）"""
 
     def __init__(self):
-        ob_cfg = get_config().database_config.oceanbase_vector_config
+        database_cfg = get_config().database_config
+        ob_cfg = database_cfg.oceanbase_vector_config
         self.container = ob_cfg.container_name  # type: ignore
         self.top_k = ob_cfg.default_top_k  # type: ignore
         self.similarity_threshold = ob_cfg.default_similarity_threshold  # type: ignore
         self.overwrite = ob_cfg.overwrite  # type: ignore
         self.database = ob_cfg.database # type: ignore
+        self.insert_batch_size = max(1, ob_cfg.insert_batch_size)  # type: ignore
+        self.vector_dim = ob_cfg.vector_dim or _embedding_model_dimension()  # type: ignore
+        self.hnsw_m = ob_cfg.hnsw_m  # type: ignore
+        self.hnsw_ef_construction = ob_cfg.hnsw_ef_construction  # type: ignore
+        # 异步接口在有界线程池中执行同步的 pyobvector 调用，线程数不宜超过连接池大小
+        self.async_workers = max(1, ob_cfg.async_workers)  # type: ignore
+        # 提升为独立列并建索引的 metadata 字段，其余 metadata 键按 JSON 路径过滤
+        self.indexed_metadata_fields = database_cfg.vector_database_config.indexed_metadata_fields
 
         self.client = ObVecClient(
             uri=f"{ob_cfg.host}:{ob_cfg.port}",  # type: ignore
@@ -43,62 +80,168 @@ class OBVectorStore(VectorStoreBase):
             password=ob_cfg.password,  # type: ignore
             db_name=ob_cfg.database  # type: ignore
         )
+        if ob_cfg.hnsw_ef_search:  # type: ignore
+            self._set_ef_search(ob_cfg.hnsw_ef_search)  # type: ignore
+        # 本进程中已确认存在的表 -> 写入用的表结构（建表语句每张表只执行一次）
+        self._tables: Dict[str, Table] = {}
+        # 检索用的反射表结构
+        self._reflected: Dict[str, Table] = {}
+        self._tables_lock = threading.Lock()
+
+    def _set_ef_search(self, ef_search: int) -> None:
+        """ob_hnsw_ef_search 是会话变量，在连接池每个新建连接上设置"""
+        @event.listens_for(self.client.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"SET ob_hnsw_ef_search = {int(ef_search)}")
+            finally:
+                cursor.close()
 
     def warmup(self) -> None:
         self.client.perform_raw_text_sql("SHOW TABLES")  # type: ignore
 
     def close(self) -> None:
-        pass  # ObVecClient 无需关闭
+        # ObVecClient 无需关闭
+        self._shutdown_async_executor()
 
     def get_full_table_name(self, simple_name: str) -> str:
         return f"{self.container}_{simple_name}"
 
-    def _get_columns(self) -> List[Column]:
+    def _get_columns(self, dim: int, metadata_fields: Dict[str, MetadataFieldType]) -> List[Column]:
         return [
-            Column("id", String(64), primary_key=True),
-            Column("source_doc_id", String(64)),
+            Column("id", String(255), primary_key=True),
+            Column("source_doc_id", String(255)),
             Column("text", Text),
-            Column("vector", VECTOR(1024)),
+            Column("vector", VECTOR(dim)),
             Column("metadata", SQL_JSON),
+            *[Column(metadata_column(key), _COLUMN_TYPES[t][1]()) for key, t in metadata_fields.items()],
         ]
 
+    def _reflect_table(self, table_name: str) -> Table:
+        table = self._reflected.get(table_name)
+        if table is None:
+            table = Table(table_name, MetaData(), autoload_with=self.client.engine)
+            self._reflected[table_name] = table
+        return table
+
+    def _drop_table(self, table_name: str) -> None:
+        self.client.perform_raw_text_sql(f"DROP TABLE IF EXISTS `{table_name}`")
+        self._tables.pop(table_name, None)
+        self._reflected.pop(table_name, None)
+
+    def _ensure_table(self, table_name: str, dim: int, overwrite: bool) -> Table:
+        """确保表存在（覆盖写入时先删表），返回写入用的表结构"""
+        with self._tables_lock:
+            if overwrite:
+                self._drop_table(table_name)
+            table = self._tables.get(table_name)
+            if table is not None:
+                return table
+
+            promoted = [metadata_column(key) for key in self.indexed_metadata_fields]
+            promoted_columns = "".join(
+                f"`{name}` {_COLUMN_TYPES[t][0]},\n"
+                for name, t in zip(promoted, self.indexed_metadata_fields.values())
+            )
+            promoted_indexes = "".join(f"INDEX `{table_name}_{name}_index` (`{name}`),\n" for name in promoted)
+            create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS `{table_name}` (
+                id VARCHAR(255) PRIMARY KEY,
+                source_doc_id VARCHAR(255),
+                text TEXT,
+                vector VECTOR({dim}),
+                metadata JSON,
+                {promoted_columns}
+                INDEX `{table_name}_source_doc_id_index` (source_doc_id),
+                {promoted_indexes}
+                VECTOR INDEX `{table_name}_vector_index` (vector) WITH (
+                    distance=cosine, type=hnsw, m={self.hnsw_m}, ef_construction={self.hnsw_ef_construction}
+                )
+            )
+            """
+            self.client.perform_raw_text_sql(create_table_sql)
+            # 升级前创建的表没有提升列，写入时只写已有的列（全量重建索引后才能按其过滤）
+            existing = set(self._reflect_table(table_name).c.keys())
+            metadata_fields = {
+                key: t for key, t in self.indexed_metadata_fields.items() if metadata_column(key) in existing
+            }
+            table = Table(table_name, MetaData(), *self._get_columns(dim, metadata_fields))
+            self._tables[table_name] = table
+            return table
+
     def load_documents(self, documents: List[VectorStoreDocument], table_name: str, overwrite: bool | None = None) -> None:
         overwrite = overwrite if overwrite is not None else self.overwrite
+        documents = [doc for doc in documents if doc.vector is not None]
+        dim = self.vector_dim or (len(documents[0].vector) if documents else 0)  # type: ignore
+        if not dim:
+            # 维度未知且没有数据：只处理覆盖写入的删表，首次写入数据时再建表
+            if overwrite:
+                with self._tables_lock:
+                    self._drop_table(table_name)
+            return
 
-        self.client.perform_raw_text_sql(f"USE {self.database}")
-
-        if overwrite:
-            self.client.perform_raw_text_sql(f"DROP TABLE IF EXISTS `{table_name}`")
+        table = self._ensure_table(table_name, dim, overwrite)
 
-        # 创建表结构
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS `{table_name}` (
-            id VARCHAR(255) PRIMARY KEY,
-            source_doc_id VARCHAR(255),
-            text TEXT,
-            vector VECTOR(1024),
-            metadata JSON,
-            VECTOR INDEX `{table_name}_vector_index` (vector) WITH (distance=cosine, type=hnsw)
-        )
-        """
-        self.client.perform_raw_text_sql(create_table_sql)
+        # print(f"📝 准备写入 OceanBase，文档数量: {len(documents)}")
 
-        data = []
-        for doc in documents:
-            if doc.vector is not None:
-                normalized_vector = normalize_vector(doc.vector)
-                data.append({
+        # 分批多行写入；主键已存在时更新（重复写入同一批文档是幂等的）
+        metadata_fields = {
+            key: t for key, t in self.indexed_metadata_fields.items() if metadata_column(key) in table.c
+        }
+        update_columns = [name for name in table.c.keys() if name != "id"]
+        for start in range(0, len(documents), self.insert_batch_size):
+            part = documents[start:start + self.insert_batch_size]
+            vectors = normalize_vectors([doc.vector for doc in part], dim)  # type: ignore
+            stmt = mysql_insert(table).values([
+                {
                     "id": doc.id,
                     "source_doc_id": doc.source_doc_id,
                     "text": doc.text,
-                    "vector": normalized_vector,
+                    "vector": vector.tolist(),
                     "metadata": doc.metadata,
-                })
-        
-        # print(f"📝 准备写入 OceanBase，文档数量: {len(data)}")
+                    **promote_metadata(doc.metadata, metadata_fields),
+                }
+                for doc, vector in zip(part, vectors)
+            ])
+            stmt = stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in update_columns})
+            with self.client.engine.begin() as conn:
+                conn.execute(stmt)
 
-        if data:
-            self.client.insert(table_name, data=data)
+    def delete_documents(self, table_name: str, filter_column: str, filter_values: List[str]) -> None:
+        if not filter_values:
+            return
+        if not self.client.check_table_exists(table_name):
+            return
+        # 校验列名，取值以参数绑定传入
+        condition = FieldFilter.isin(filter_column, filter_values)
+        stmt = text(
+            f"DELETE FROM `{table_name}` WHERE `{condition.field}` IN :values"
+        ).bindparams(bindparam("values", expanding=True))
+        with self.client.engine.begin() as conn:
+            conn.execute(stmt, {"values": list(condition.values)})
+
+    def _filter_clauses(self, filters: List[FieldFilter], table: Table | None = None) -> List[Any]:
+        """
+        将结构化过滤条件编译为 SQLAlchemy 表达式（取值以参数绑定传入）：
+        提升的 metadata 字段使用独立列（有索引），其余 metadata 键使用 JSON 路径
+        """
+        def col(name: str):
+            return table.c[name] if table is not None else column(name)
+
+        clauses = []
+        for condition in filters:
+            key = condition.metadata_key
+            if key is None:
+                target = col(condition.field)
+            elif key in self.indexed_metadata_fields:
+                target = col(metadata_column(key))
+            else:
+                target = func.json_extract(col("metadata"), f"$.{key}")
+                if all(isinstance(value, str) for value in condition.values):
+                    target = func.json_unquote(target)
+            clauses.append(_OPERATORS[condition.op](target, condition.value))
+        return clauses
 
     def similarity_search_by_vector(
         self,
@@ -107,62 +250,153 @@ class OBVectorStore(VectorStoreBase):
         top_k: int | None = None,
         similarity_threshold: float | None = None,
         filter_column: str | None = None,
-        filter_values: list[str] | None = None
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
     ) -> List[VectorStoreSearchResult]:
         t1 = time.time()
         top_k = top_k if top_k is not None else self.top_k
         sim_t = similarity_threshold if similarity_threshold is not None else self.similarity_threshold
-        
+        query_vector = normalize_vector(vector)
+
+        where_clause = []
+        if sim_t > 0:
+            # 相似度阈值换算为余弦距离上限，在SQL中过滤
+            where_clause.append(
+                func.cosine_distance(column("vector"), _vector_literal(query_vector)) <= 1 - sim_t
+            )
+        where_clause.extend(self._filter_clauses(build_filters(filter_column, filter_values, filters)))
+
+        output_columns = list(columns)
         res = self.client.ann_search(
             table_name=table_name,
-            vec_data=normalize_vector(vector),
+            vec_data=query_vector,
             vec_column_name="vector",
             distance_func=func.cosine_distance,
-            topk=top_k * 3,
+            topk=top_k,
             with_dist=True,
-            output_column_names=["id", "source_doc_id", "text", "vector", "metadata"],
+            output_column_names=output_columns,
+            where_clause=where_clause or None,
             metric="cosine"
         )
         results = []
-        for i, row in enumerate(res):
+        for row in res:
             *fields, distance = row
-            score = 1 - float(distance)
-
-            if sim_t > 0 and score < sim_t:
-                continue
-            
-            id_, source_doc_id, text, vector_data, metadata_json = fields
-            metadata = metadata_json if isinstance(metadata_json, dict) else json.loads(metadata_json)
-
-            # print(f"🔹 第{i+1}个结果 Score: {score:.4f} - ID: {id_}", metadata)
-
             results.append(VectorStoreSearchResult(
-                document=VectorStoreDocument(
-                    id=id_,
-                    source_doc_id=source_doc_id,
-                    text=text,
-                    vector=vector_data,
-                    metadata=metadata,
-                ),
-                score=score
+                document=_to_document(dict(zip(output_columns, fields))),
+                score=1 - float(distance)
             ))
         t2 = time.time()
         print(f"✅ 查询 Oceanbase 向量数据库 共 {len(results)} 个结果通过相似度过滤，返回 Top {top_k}，耗时 {t2 - t1} 秒")
-        return results[:top_k]
+        return results
 
-    def search_by_id(self, table_name: str, id: str) -> VectorStoreDocument:
-        query = self.client.select(  # type: ignore
-            table_name=table_name,
-            where=f"id = '{id}'",
-            output_column_names=["id", "source_doc_id", "text", "vector", "metadata"]
-        )
-        if not query:
+    def batch_similarity_search(
+        self,
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        table_name: str,
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
+        filter_column: str | None = None,
+        filter_values: list[str] | None = None,
+        columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS,
+        filters: Sequence[FieldFilter] | None = None
+    ) -> List[List[VectorStoreSearchResult]]:
+        """批量检索：表结构只反射一次，各查询向量的ANN子查询以 UNION ALL 合并为一条语句执行"""
+        t1 = time.time()
+        top_k = top_k if top_k is not None else self.top_k
+        sim_t = similarity_threshold if similarity_threshold is not None else self.similarity_threshold
+        if len(vectors) == 0:
+            return []
+
+        table = self._reflect_table(table_name)
+        filter_clauses = self._filter_clauses(build_filters(filter_column, filter_values, filters), table)
+        output_columns = list(columns)
+        subqueries = []
+        for index, query_vector in enumerate(normalize_vectors(vectors)):
+            distance = func.cosine_distance(table.c["vector"], _vector_literal(query_vector.tolist()))
+            stmt = select(
+                literal_column(str(index)).label("query_index"),
+                *[table.c[name] for name in output_columns],
+                distance.label("distance"),
+            )
+            if sim_t > 0:
+                stmt = stmt.where(distance <= 1 - sim_t)
+            if filter_clauses:
+                stmt = stmt.where(*filter_clauses)
+            # APPROXIMATE LIMIT 以语句后缀追加，过滤值与查询向量仍以参数绑定传入
+            subqueries.append(stmt.order_by(distance).suffix_with(f"APPROXIMATE LIMIT {int(top_k)}"))
+
+        with self.client.engine.connect() as conn:
+            rows = conn.execute(union_all(*subqueries) if len(subqueries) > 1 else subqueries[0]).fetchall()
+
+        # UNION ALL 不保证各子查询的结果顺序，按查询序号分组后再按距离排序
+        grouped: List[List[Any]] = [[] for _ in subqueries]
+        for query_index, *fields, distance_value in rows:
+            grouped[int(query_index)].append((float(distance_value), fields))
+        results = []
+        for group in grouped:
+            group.sort(key=lambda item: item[0])
+            results.append([
+                VectorStoreSearchResult(
+                    document=_to_document(dict(zip(output_columns, fields))),
+                    score=1 - distance_value
+                )
+                for distance_value, fields in group
+            ])
+        log.debug(f"Searched {len(results)} vectors in OceanBase table {table_name} in {time.time() - t1:.2f}s")
+        return results
+
+    def search_by_id(
+        self, table_name: str, id: str, columns: Sequence[str] = DEFAULT_SEARCH_COLUMNS
+    ) -> VectorStoreDocument:
+        if not self.client.check_table_exists(table_name):
+            return VectorStoreDocument(id=id, source_doc_id=None, text=None, vector=None)
+        table = self._reflect_table(table_name)
+        stmt = select(*[table.c[name] for name in columns]).where(table.c["id"] == id).limit(1)
+        with self.client.engine.connect() as conn:
+            row = conn.execute(stmt).mappings().first()
+        if row is None:
             return VectorStoreDocument(id=id, source_doc_id=None, text=None, vector=None)
-        doc = query[0]
-        return VectorStoreDocument(
-            id=doc["id"],
-            source_doc_id=doc.get("source_doc_id"),
-            text=doc.get("text"),
-            vector=doc.get("vector"),
-            metadata=doc.get("metadata", {}),
-        )
\ No newline at end of file
+        return _to_document(dict(row))
+
+    def sample_vectors(self, table_name: str, limit: int | None = None) -> np.ndarray:
+        if not self.client.check_table_exists(table_name):
+            return np.empty((0, 0), dtype=np.float32)
+        table = self._reflect_table(table_name)
+        stmt = select(table.c["vector"])
+        if limit:
+            stmt = stmt.limit(limit)
+        with self.client.engine.connect() as conn:
+            vectors = conn.execute(stmt).scalars().all()
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        # VECTOR 列在未注册类型时以 "[x,y,...]" 字符串返回
+        return np.asarray(
+            [json.loads(vector) if isinstance(vector, str) else vector for vector in vectors], dtype=np.float32
+        )
+
+
+def _vector_literal(vector: List[float]) -> str:
+    return "[" + ",".join(str(v) for v in vector) + "]"
+
+
+def _to_document(row: Dict[str, Any]) -> VectorStoreDocument:
+    """由查询结果的一行构造文档，未选择的列为空"""
+    metadata = row.get("metadata")
+    return VectorStoreDocument(
+        id=row.get("id"), # type: ignore
+        source_doc_id=row.get("source_doc_id"),
+        text=row.get("text"),
+        vector=row.get("vector"),
+        metadata=(metadata if isinstance(metadata, dict) else json.loads(metadata)) if metadata else {},
+    )
+
+
+def _embedding_model_dimension() -> int:
+    """当前嵌入模型在模型注册表中登记的向量维度，未登记时返回0（由写入的数据决定）"""
+    try:
+        model_name = get_config().embedding_config.active_model_config.default_model
+        return get_model_info().get_by_model_name(model_name).dimension or 0
+    except Exception as e:
+        log.warning(f"Failed to resolve embedding dimension from the model registry: {e}")
+        return 0
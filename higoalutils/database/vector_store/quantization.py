@@ -0,0 +1,80 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+向量量化：用低精度编码生成候选，再用原始 float32 向量对候选精确重排。
+
+- int8（标量量化）：每维按该维最大绝对值缩放到 [-127, 127]，内存为 float32 的 1/4；
+  近似分数 = (查询 * 缩放系数) · 编码
+- binary（二值量化）：每维只保留符号位，内存为 float32 的 1/32；
+  近似分数由汉明距离换算：1 - 2 * 汉明距离 / 维度
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from higoalutils.database.vector_store.enums import VectorQuantization
+
+# 分块计算近似分数，限制 int8 -> float32 转换等临时数组的大小
+_BLOCK_ROWS = 16_384
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def quantize(vectors: np.ndarray, quantization: VectorQuantization) -> Dict[str, np.ndarray]:
+    """将已归一化的 (n, dim) float32 矩阵量化，返回编码（codes）及 int8 的每维缩放系数（scale）"""
+    if quantization == VectorQuantization.INT8:
+        max_abs = np.abs(vectors).max(axis=0) if len(vectors) else np.ones(vectors.shape[1], dtype=np.float32)
+        scale = np.where(max_abs > 0, max_abs / 127, 1).astype(np.float32)
+        codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+        return {"codes": codes, "scale": scale}
+    if quantization == VectorQuantization.BINARY:
+        return {"codes": np.packbits(vectors > 0, axis=1)}
+    raise ValueError(f"Unsupported quantization: {quantization}")
+
+
+def approximate_scores(
+    quantization: VectorQuantization,
+    codes: np.ndarray,
+    queries: np.ndarray,
+    dim: int,
+    scale: np.ndarray | None = None,
+) -> np.ndarray:
+    """已归一化的查询 (m, dim) 与编码 (n, ...) 的近似相似度，返回 (m, n) 的 float32 矩阵"""
+    scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+    if quantization == VectorQuantization.INT8:
+        scaled = (queries * scale).astype(np.float32)
+        for start in range(0, len(codes), _BLOCK_ROWS):
+            block = codes[start:start + _BLOCK_ROWS]
+            scores[:, start:start + len(block)] = scaled @ block.astype(np.float32).T
+    elif quantization == VectorQuantization.BINARY:
+        query_bits = np.packbits(queries > 0, axis=1)
+        for start in range(0, len(codes), _BLOCK_ROWS):
+            block = codes[start:start + _BLOCK_ROWS]
+            for i, bits in enumerate(query_bits):
+                hamming = _POPCOUNT[np.bitwise_xor(block, bits)].sum(axis=1, dtype=np.int32)
+                scores[i, start:start + len(block)] = 1 - 2 * hamming / dim
+    else:
+        raise ValueError(f"Unsupported quantization: {quantization}")
+    return scores
+
+
+def top_indices(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """每行分数最高的 k 个下标及其分数（按分数降序），k 不超过列数"""
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
@@ -12,17 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
 from typing import Sequence, Union
 import numpy as np
-import torch
 
 
 VectorLike = Union[Sequence[float], np.ndarray]
 
 def normalize_vector(vec: VectorLike) -> list[float]:
     """通用归一化函数，支持 List / ndarray / Tensor，输出 float32 list"""
-    # 处理 torch.Tensor
-    if isinstance(vec, torch.Tensor):
+    # 处理 torch.Tensor：只有 torch 已被加载时 vec 才可能是 Tensor，不为此导入 torch
+    torch = sys.modules.get("torch")
+    if torch is not None and isinstance(vec, torch.Tensor):
         vec = vec.detach().cpu().numpy()
 
     # 转为 numpy 数组（float32）
@@ -33,4 +34,22 @@ def normalize_vector(vec: VectorLike) -> list[float]:
     if norm == 0:
         return arr.tolist()
 
-    return (arr / norm).tolist()
\ No newline at end of file
+    return (arr / norm).tolist()
+
+
+def normalize_vectors(vectors: Sequence[VectorLike] | np.ndarray, dim: int | None = None) -> np.ndarray:
+    """批量归一化（一次向量化计算），输出 (n, dim) 的 float32 矩阵，零向量保持为零"""
+    torch = sys.modules.get("torch")
+    if torch is not None and isinstance(vectors, torch.Tensor):
+        vectors = vectors.detach().cpu().numpy()
+
+    try:
+        arr = np.array(vectors, dtype=np.float32)
+    except ValueError as e:
+        raise ValueError(f"Vectors must all have the same dimension: {e}") from e
+    if arr.ndim != 2 or (dim is not None and arr.shape[1] != dim):
+        raise ValueError(f"Expected a batch of {dim or 'equal'}-dimensional vectors, got shape {arr.shape}")
+
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    np.divide(arr, norms, out=arr, where=norms > 0)
+    return arr
@@ -63,3 +63,15 @@ class BaseTextEmbedding(ABC):
     @abstractmethod
     async def aembed(self, text: str | list[str], **kwargs: Any) -> list[list[float]]:
         """Embed a text string asynchronously."""
+
+    def embed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed a batch of text strings, returning one vector per input in input order."""
+        return [self.embed(text, **kwargs)[0] for text in texts]
+
+    async def aembed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed a batch of text strings asynchronously, returning one vector per input in input order."""
+        return [(await self.aembed(text, **kwargs))[0] for text in texts]
+
+    async def aembed_many(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed many text strings asynchronously (concurrently where supported), in input order."""
+        return await self.aembed_batch(texts, **kwargs)
@@ -0,0 +1,125 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""带持久化向量缓存的嵌入模型包装器。"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+from higoalutils.cache.embedding_cache import EmbeddingCache
+from higoalutils.language_model.llm.base import BaseTextEmbedding
+from higoalutils.utils.code_utils.hashing import gen_sha512_hash_str
+
+log = logging.getLogger(__name__)
+
+
+class CachedTextEmbedding(BaseTextEmbedding):
+    """
+    包装任意 BaseTextEmbedding，按 gen_sha512_hash_str(text) + 模型名 + 维度 缓存向量，
+    只对未命中的文本调用底层模型
+    """
+
+    def __init__(self, embedder: BaseTextEmbedding, cache: EmbeddingCache, dimension: int | None = None):
+        """
+        args:
+            dimension: 模型输出的向量维度；为空时若缓存中只有一种维度则使用该维度，
+                否则由第一次嵌入的结果确定（之前不读缓存）
+        """
+        self.embedder = embedder
+        self.cache = cache
+        if not dimension:
+            stored = cache.dims()
+            dimension = stored[0] if len(stored) == 1 else None
+        self.dimension = dimension
+
+    def __getattr__(self, name: str) -> Any:
+        # 透传底层模型的属性（如 batch_size、model）
+        return getattr(self.embedder, name)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """缓存命中/未命中/淘汰计数"""
+        return self.cache.stats
+
+    def embed(self, text: str | list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed text, reading cached vectors where possible."""
+        texts = [text] if isinstance(text, str) else text
+        return self.embed_batch(texts, **kwargs)
+
+    async def aembed(self, text: str | list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed text asynchronously, reading cached vectors where possible."""
+        texts = [text] if isinstance(text, str) else text
+        return await self.aembed_batch(texts, **kwargs)
+
+    def embed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed a batch of texts, only sending cache misses to the wrapped model."""
+        keys, results, missing = self._lookup(texts)
+        if missing:
+            vectors = self.embedder.embed_batch([texts[i] for i in missing], **kwargs)
+            self._store(keys, results, missing, vectors)
+        return results
+
+    async def aembed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed a batch of texts asynchronously, only sending cache misses to the wrapped model."""
+        return await self._aembed_missing(texts, self.embedder.aembed_batch, **kwargs)
+
+    async def aembed_many(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed many texts concurrently, only sending cache misses to the wrapped model."""
+        return await self._aembed_missing(texts, self.embedder.aembed_many, **kwargs)
+
+    async def _aembed_missing(
+        self,
+        texts: list[str],
+        embed_fn: Callable[..., Awaitable[list[list[float]]]],
+        **kwargs: Any,
+    ) -> list[list[float]]:
+        keys, results, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            vectors = await embed_fn([texts[i] for i in missing], **kwargs)
+            await asyncio.to_thread(self._store, keys, results, missing, vectors)
+        return results
+
+    def _lookup(self, texts: List[str]) -> tuple[List[str], List[List[float]], List[int]]:
+        """返回每条文本的key、已命中的结果（未命中为空列表）及未命中的下标（重复文本只取首个）"""
+        keys = [gen_sha512_hash_str(text) for text in texts]
+        cached = self.cache.get_many(keys, self.dimension) if self.dimension else {}
+        results = [cached.get(key, []) for key in keys]
+        missing = list({key: i for i, key in reversed(list(enumerate(keys))) if not results[i]}.values())
+        missing.sort()
+        return keys, results, missing
+
+    def _store(
+        self,
+        keys: List[str],
+        results: List[List[float]],
+        missing: List[int],
+        vectors: List[List[float]],
+    ) -> None:
+        new_items = {keys[i]: vector for i, vector in zip(missing, vectors)}
+        for i, key in enumerate(keys):
+            if not results[i]:
+                results[i] = new_items.get(key, [])
+        new_items = {key: vector for key, vector in new_items.items() if vector}
+        if new_items:
+            dimension = len(next(iter(new_items.values())))
+            if self.dimension != dimension:
+                if self.dimension:
+                    log.warning(f"Embedding dimension changed from {self.dimension} to {dimension}, cache keyed on the new dimension")
+                self.dimension = dimension
+        try:
+            self.cache.set_many(new_items)
+        except Exception as e:
+            # 缓存写入失败不影响嵌入结果
+            log.warning(f"Failed to write embedding cache: {e}")
@@ -13,11 +13,17 @@
 # limitations under the License.
 
 from typing import Optional
+from higoalutils.cache.embedding_cache import EmbeddingCache
+from higoalutils.cache.query_cache import QueryEmbeddingCache
+from higoalutils.language_model.llm.cached_embedding import CachedTextEmbedding
 from higoalutils.language_model.llm.get_client import get_text_embedder
 from higoalutils.language_model.llm.base import BaseTextEmbedding
 from higoalutils.config.models.embedding_config import EmbeddingConfig
+import logging
 import threading
 
+log = logging.getLogger(__name__)
+
 
 class EmbeddingModelSingleton:
     """
@@ -28,6 +34,7 @@ class EmbeddingModelSingleton:
     _instance: Optional[BaseTextEmbedding] = None
     _lock = threading.Lock()
     _config: Optional[EmbeddingConfig] = None
+    _query_cache: Optional[QueryEmbeddingCache] = None
     
     @classmethod
     def get_instance(cls, config: Optional[EmbeddingConfig] = None) -> BaseTextEmbedding:
@@ -50,17 +57,63 @@ class EmbeddingModelSingleton:
                     if config is None:
                         raise ValueError("首次调用必须提供模型配置")
                     cls._config = config
-                    cls._instance = get_text_embedder(config)
+                    cls._instance = cls._with_cache(get_text_embedder(config), config)
         elif config is not None and config != cls._config:
             raise ValueError("嵌入模型配置已初始化，不允许更改")
             
         return cls._instance
     
+    @staticmethod
+    def _with_cache(embedder: BaseTextEmbedding, config: EmbeddingConfig) -> BaseTextEmbedding:
+        """按配置为嵌入模型包装持久化向量缓存"""
+        cache_cfg = config.cache_config
+        if not cache_cfg.enabled:
+            return embedder
+        model_name = config.active_model_config.default_model
+        cache = EmbeddingCache(
+            base_dir=cache_cfg.base_dir,
+            model_name=model_name,
+            max_entries=cache_cfg.max_entries,
+        )
+        return CachedTextEmbedding(embedder, cache, dimension=_registered_dimension(model_name))
+
+    @classmethod
+    def get_query_cache(cls) -> Optional[QueryEmbeddingCache]:
+        """
+        获取进程内共享的查询向量缓存（随嵌入模型一起初始化）
+
+        返回:
+            QueryEmbeddingCache实例；嵌入模型尚未初始化或配置中未启用时返回None
+        """
+        if cls._query_cache is None and cls._config is not None:
+            with cls._lock:
+                cache_cfg = cls._config.query_cache_config if cls._config else None
+                if cls._query_cache is None and cache_cfg and cache_cfg.enabled:
+                    cls._query_cache = QueryEmbeddingCache(
+                        max_entries=cache_cfg.max_entries,
+                        ttl_seconds=cache_cfg.ttl_seconds,
+                    )
+        return cls._query_cache
+
     @classmethod
     def clear_instance(cls) -> None:
         """
         清除当前实例(主要用于测试)
         """
         with cls._lock:
+            if isinstance(cls._instance, CachedTextEmbedding):
+                cls._instance.cache.close()
             cls._instance = None
-            cls._config = None
\ No newline at end of file
+            cls._config = None
+            cls._query_cache = None
+
+
+def _registered_dimension(model_name: str) -> Optional[int]:
+    """模型注册表中登记的向量维度，未登记时返回None（由缓存中已有的维度或第一次嵌入的结果确定）"""
+    try:
+        from higoalutils.config.load_model_info import get_model_info  # 导入时即加载配置，延迟到此处
+
+        return get_model_info().get_by_model_name(model_name).dimension or None
+    except Exception as e:
+        log.warning(f"Failed to resolve embedding dimension from the model registry: {e}")
+        return None
@@ -7,7 +7,6 @@ import logging
 from higoalutils.config.models.embedding_config import EmbeddingConfig
 from higoalutils.config.enums.sys_enums import EmbeddingType
 from higoalutils.language_model.llm.base import BaseTextEmbedding
-from higoalutils.language_model.llm.huggingface_embedding.embedding import HuggingFaceEmbedding
 from higoalutils.language_model.llm.oai.chat_openai import ChatOpenAI
 from higoalutils.language_model.llm.oai.embedding import OpenAIEmbedding
 from higoalutils.language_model.llm.oai.typing import OpenaiApiType
@@ -64,14 +63,22 @@ def get_text_embedder(config: EmbeddingConfig) -> BaseTextEmbedding:
             api_type=OpenaiApiType.OpenAI,
             model=oai_model.model_name, # type: ignore
             max_retries=oai_cfg.max_retries, # type: ignore
+            batch_size=oai_cfg.batch_size, # type: ignore
+            concurrent_requests=oai_cfg.concurrent_requests, # type: ignore
+            requests_per_minute=oai_cfg.requests_per_minute, # type: ignore
+            tokens_per_minute=oai_cfg.tokens_per_minute, # type: ignore
         )
     
     elif model_type == EmbeddingType.HuggingFace:
+        # 本地模型后端依赖 torch，只在选用时导入
+        from higoalutils.language_model.llm.huggingface_embedding.embedding import HuggingFaceEmbedding
+
         hg_cfg = embeddings_llm_settings.huggingface_embedding_config
         hg_model = model_info.get_by_model_name(hg_cfg.default_model) # type: ignore
         return HuggingFaceEmbedding(
             model=hg_model.model_name,  # type: ignore
             device=hg_cfg.device,  # type: ignore
+            batch_size=hg_cfg.batch_size,  # type: ignore
         )
 
     else:
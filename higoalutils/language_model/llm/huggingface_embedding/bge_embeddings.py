@@ -15,9 +15,10 @@
 """HuggingFaceEmbeddings model definition."""
 
 import os
-from typing import Union
-from huggingface_hub import snapshot_download
-from langchain_huggingface import HuggingFaceEmbeddings  # type: ignore
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from langchain_huggingface import HuggingFaceEmbeddings  # type: ignore
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -27,17 +28,22 @@ def sanitize_model_dir(model_name: str) -> str:
     """将 HuggingFace 模型名转换为合法的本地目录名"""
     return model_name.replace("/", "__")
 
-def get_embeddings(modelname: Union[str, None], device: str = "cpu") -> HuggingFaceEmbeddings:
+def get_embeddings(modelname: Union[str, None], device: str = "cpu", batch_size: int = 32) -> "HuggingFaceEmbeddings":
     """
     加载或自动下载 HuggingFace 模型用于向量嵌入。
     
     参数:
         modelname (str): 模型名称，例如 'BAAI/bge-large-zh-v1.5'，可为 None（使用默认模型）
         device (str): 运行设备，支持 'cpu', 'cuda', 'mps' 等
+        batch_size (int): 单次前向计算的最大文本数
 
     返回:
         HuggingFaceEmbeddings 实例
     """
+    # huggingface_hub / sentence_transformers（torch）导入开销很大，只在真正加载模型时导入
+    from huggingface_hub import snapshot_download
+    from langchain_huggingface import HuggingFaceEmbeddings  # type: ignore
+
     if modelname is None:
         modelname = DEFAULT_MODEL
 
@@ -60,5 +66,5 @@ def get_embeddings(modelname: Union[str, None], device: str = "cpu") -> HuggingF
     return HuggingFaceEmbeddings(
         model_name=local_dir,
         model_kwargs={"device": device},
-        encode_kwargs={"normalize_embeddings": True},
+        encode_kwargs={"normalize_embeddings": True, "batch_size": batch_size},
     )
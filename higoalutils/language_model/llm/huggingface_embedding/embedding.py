@@ -14,6 +14,8 @@
 
 """HuggingFaceEmbeddings model implementation."""
 
+import asyncio
+import threading
 from typing import Any
 import numpy as np
 
@@ -29,9 +31,14 @@ class HuggingFaceEmbedding(BaseTextEmbedding):
         model: str,
         device: str = "cpu",
         max_tokens: int = 524288, # 512K tokens
+        batch_size: int = 32,
     ):
         self.max_tokens = max_tokens
-        self.embeddings = get_embeddings(model, device)
+        self.batch_size = batch_size
+        self.embeddings = get_embeddings(model, device, batch_size)
+        # 本地模型的前向计算串行执行，并发调用只排队不争抢算力
+        self._forward_lock = threading.Lock()
+
     def embed(self, text: str | list[str], **kwargs: Any) -> list[list[float]]:
         """
         Embed text using HuggingFaceEmbedding sync function.
@@ -49,3 +56,20 @@ class HuggingFaceEmbedding(BaseTextEmbedding):
             text = [text]
         chunk_embeddings = np.array(await self.embeddings.aembed_documents(text)).tolist()
         return chunk_embeddings
+
+    def embed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Embed a batch of texts; sentence-transformers splits them into forward passes of batch_size.
+        """
+        if not texts:
+            return []
+        with self._forward_lock:
+            return self.embeddings.embed_documents(texts)
+
+    async def aembed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Embed a batch of texts in a worker thread so the event loop is not blocked.
+        """
+        if not texts:
+            return []
+        return await asyncio.to_thread(self.embed_batch, texts)
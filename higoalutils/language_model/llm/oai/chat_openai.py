@@ -9,7 +9,6 @@ from operator import call
 from typing import Any, Optional, Dict
 import asyncio
 
-from sympy import comp
 from tenacity import (
     AsyncRetrying,
     RetryError,
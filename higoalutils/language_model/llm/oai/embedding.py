@@ -17,12 +17,14 @@ from tenacity import (
 )
 
 from higoalutils.language_model.llm.base import BaseTextEmbedding
+from higoalutils.language_model.llm.rate_limiter import AsyncRateLimiter
 from higoalutils.language_model.llm.oai.base import OpenAILLMImpl
 from higoalutils.language_model.llm.oai.typing import (
     OPENAI_RETRY_ERROR_TYPES,
     OpenaiApiType,
 )
-from higoalutils.language_model.llm.oai.text_utils import chunk_text
+from higoalutils.language_model.llm.oai.text_utils import batched, chunk_text
+from higoalutils.language_model.tokenizer.get_tokenizer import get_tokenizer
 
 
 class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
@@ -39,6 +41,10 @@ class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
         max_retries: int = 10,
         request_timeout: float = 180.0,
         retry_error_types: tuple[type[BaseException]] = OPENAI_RETRY_ERROR_TYPES,  # type: ignore
+        batch_size: int = 10,
+        concurrent_requests: int = 8,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
     ):
         OpenAILLMImpl.__init__(
             self=self,
@@ -53,6 +59,13 @@ class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
         self.encoding_name = encoding_name
         self.max_tokens = max_tokens
         self.retry_error_types = retry_error_types
+        self.batch_size = batch_size
+        self.concurrent_requests = max(1, concurrent_requests)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._limiter_loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._rate_limiter: AsyncRateLimiter | None = None
 
     def embed(self, text: str | list[str], **kwargs: Any) -> list[list[float]]:
         """
@@ -109,6 +122,145 @@ class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
         chunk_embeddings = chunk_embeddings / np.linalg.norm(chunk_embeddings)
         return [chunk_embeddings.tolist()]
 
+    def embed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Embed a batch of texts, sending up to batch_size inputs per embeddings.create request.
+
+        Texts longer than max_tokens are chunked and combined by weighted average, same as embed().
+        A text whose every request failed gets an empty vector.
+        """
+        pieces, owners, _ = self._split_batch_inputs(texts)
+        piece_embeddings: list[list[float]] = []
+        for batch in batched(iter(pieces), self.batch_size):
+            piece_embeddings.extend(self._embed_batch_with_retry(list(batch), **kwargs))
+        return self._combine_piece_embeddings(len(texts), owners, pieces, piece_embeddings)
+
+    async def aembed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Embed a batch of texts asynchronously, see aembed_many().
+        """
+        return await self.aembed_many(texts, **kwargs)
+
+    async def aembed_many(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Embed many texts concurrently, returning vectors in input order.
+
+        Inputs are grouped into requests of batch_size, which run concurrently under
+        concurrent_requests in-flight requests and the requests/tokens per minute quota.
+        """
+        pieces, owners, piece_tokens = self._split_batch_inputs(texts)
+        requests = [
+            (pieces[start:start + self.batch_size], sum(piece_tokens[start:start + self.batch_size]))
+            for start in range(0, len(pieces), self.batch_size)
+        ]
+        results = await asyncio.gather(*[
+            self._aembed_batch_with_retry(batch, num_tokens=tokens, **kwargs)
+            for batch, tokens in requests
+        ])
+        piece_embeddings = [embedding for result in results for embedding in result]
+        return self._combine_piece_embeddings(len(texts), owners, pieces, piece_embeddings)
+
+    def _split_batch_inputs(self, texts: list[str]) -> tuple[list[str], list[int], list[int]]:
+        """
+        Chunk every text into max_tokens pieces.
+
+        Returns the pieces, the index of the text each piece belongs to, and each piece's token count.
+        """
+        tokenizer = get_tokenizer(self.encoding_name)
+        pieces: list[str] = []
+        owners: list[int] = []
+        piece_tokens: list[int] = []
+        for i, tokens in enumerate(tokenizer.encode_batch(texts)): # type: ignore
+            for chunk in batched(iter(tokens), self.max_tokens):
+                pieces.append(tokenizer.decode(list(chunk)))
+                owners.append(i)
+                piece_tokens.append(len(chunk))
+        return pieces, owners, piece_tokens
+
+    def _get_request_limits(self) -> tuple[asyncio.Semaphore, AsyncRateLimiter]:
+        """按事件循环创建并复用并发信号量与限流器"""
+        loop = asyncio.get_running_loop()
+        if self._limiter_loop is not loop or self._semaphore is None or self._rate_limiter is None:
+            self._limiter_loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrent_requests)
+            self._rate_limiter = AsyncRateLimiter(
+                requests_per_minute=self.requests_per_minute,
+                tokens_per_minute=self.tokens_per_minute,
+            )
+        return self._semaphore, self._rate_limiter
+
+    @staticmethod
+    def _combine_piece_embeddings(
+        num_texts: int,
+        owners: list[int],
+        pieces: list[str],
+        piece_embeddings: list[list[float]],
+    ) -> list[list[float]]:
+        """Combine piece embeddings back into one normalized vector per text."""
+        grouped_embeddings: list[list[list[float]]] = [[] for _ in range(num_texts)]
+        grouped_lens: list[list[int]] = [[] for _ in range(num_texts)]
+        for owner, piece, embedding in zip(owners, pieces, piece_embeddings):
+            if embedding:
+                grouped_embeddings[owner].append(embedding)
+                grouped_lens[owner].append(len(piece))
+
+        results: list[list[float]] = []
+        for embeddings, lens in zip(grouped_embeddings, grouped_lens):
+            if not embeddings:
+                results.append([])
+                continue
+            combined = np.average(embeddings, axis=0, weights=lens)
+            results.append((combined / np.linalg.norm(combined)).tolist())
+        return results
+
+    def _embed_batch_with_retry(
+        self, texts: list[str], **kwargs: Any
+    ) -> list[list[float]]:
+        try:
+            retryer = Retrying(
+                stop=stop_after_attempt(self.max_retries),
+                wait=wait_exponential_jitter(max=10),
+                retry=retry_if_exception_type(self.retry_error_types),
+            )
+            for attempt in retryer:
+                with attempt:
+                    response = self.sync_client.embeddings.create(  # type: ignore
+                        input=texts,
+                        model=self.model,
+                        **kwargs,  # type: ignore
+                    )
+                    data = sorted(response.data, key=lambda d: d.index)
+                    return [d.embedding or [] for d in data]
+        except RetryError:
+            # 重试用尽时该批次返回空向量（写入时向量为空），不中断同时进行的其他批次
+            return [[] for _ in texts]
+
+    async def _aembed_batch_with_retry(
+        self, texts: list[str], num_tokens: int = 0, **kwargs: Any
+    ) -> list[list[float]]:
+        semaphore, rate_limiter = self._get_request_limits()
+        try:
+            retryer = AsyncRetrying(
+                stop=stop_after_attempt(self.max_retries),
+                wait=wait_exponential_jitter(max=10),
+                retry=retry_if_exception_type(self.retry_error_types),
+            )
+            async for attempt in retryer:
+                with attempt:
+                    # 每次尝试（含重试）都占用一个并发位并计入配额
+                    async with semaphore:
+                        await rate_limiter.acquire(num_tokens)
+                        response = await self.async_client.embeddings.create(  # type: ignore
+                            input=texts,
+                            model=self.model,
+                            **kwargs,  # type: ignore
+                        )
+                    data = sorted(response.data, key=lambda d: d.index)
+                    return [d.embedding or [] for d in data]
+        except RetryError:
+            # 重试用尽时该批次返回空向量（写入时向量为空），不中断同时进行的其他批次
+            return [[] for _ in texts]
+
     def _embed_with_retry(
         self, text: str | tuple, **kwargs: Any
     ) -> tuple[list[float], int]:
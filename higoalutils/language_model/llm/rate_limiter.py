@@ -0,0 +1,79 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""按分钟配额的异步限流器（令牌桶），同时限制请求数与token数。"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    令牌桶限流器
+    requests_per_minute / tokens_per_minute 为 0 时表示不限制对应维度
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests_per_minute = max(0, requests_per_minute)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self._request_budget = float(self.requests_per_minute)
+        self._token_budget = float(self.tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """等待直到配额足够发起一次消耗 tokens 个token的请求"""
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+        # 超过单分钟配额的请求按满配额计，避免永久等待
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = max(
+                    self._wait_time(self._request_budget, 1, self.requests_per_minute),
+                    self._wait_time(self._token_budget, tokens, self.tokens_per_minute),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests_per_minute:
+                self._request_budget -= 1
+            if self.tokens_per_minute:
+                self._token_budget -= tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_budget = min(
+                float(self.requests_per_minute),
+                self._request_budget + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._token_budget = min(
+                float(self.tokens_per_minute),
+                self._token_budget + elapsed * self.tokens_per_minute / 60,
+            )
+
+    @staticmethod
+    def _wait_time(budget: float, cost: int, per_minute: int) -> float:
+        """距离预算足够支付 cost 还需等待的秒数"""
+        if not per_minute or budget >= cost:
+            return 0.0
+        return (cost - budget) * 60 / per_minute
@@ -14,7 +14,8 @@
 
 from dataclasses import dataclass
 from higoalutils.language_model.tokenizer.types import (
-    TextTokenizerDecoder, TextTokenizerEncoder, TextTokenizerCounter
+    TextTokenizerDecoder, TextTokenizerEncoder, TextTokenizerCounter,
+    TextTokenizerBatchEncoder, TextTokenizerBatchCounter
 )
 
 @dataclass(frozen=True)
@@ -26,4 +27,18 @@ class Tokenizer:
     encode: TextTokenizerEncoder
     """ Function to encode a string to a list of token ids"""
     count_tokens: TextTokenizerCounter
-    """ Function to count the number of tokens in a string"""
\ No newline at end of file
+    """ Function to count the number of tokens in a string"""
+    encode_batch: TextTokenizerBatchEncoder | None = None
+    """ Function to encode a list of strings in one call (defaults to encoding one by one)"""
+    count_tokens_batch: TextTokenizerBatchCounter | None = None
+    """ Function to count the tokens of a list of strings (defaults to encode_batch)"""
+
+    def __post_init__(self):
+        if self.encode_batch is None:
+            encode = self.encode
+            object.__setattr__(self, "encode_batch", lambda texts: [encode(text) for text in texts])
+        if self.count_tokens_batch is None:
+            encode_batch = self.encode_batch
+            object.__setattr__(
+                self, "count_tokens_batch", lambda texts: [len(ids) for ids in encode_batch(texts)]  # type: ignore
+            )
\ No newline at end of file
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""通义千问Tokenizer函数"""
+"""通义千问Tokenizer函数（首次使用时才导入 dashscope）"""
 
-from dashscope import get_tokenizer
+from functools import lru_cache
+from typing import Any
 
-# 获取Tokenizer对象（目前仅支持通义千问系列模型）
-dashscope_tokenizer = get_tokenizer('qwen-max')
+
+@lru_cache(maxsize=1)
+def load_dashscope_tokenizer() -> Any:
+    """加载通义千问 Tokenizer，进程内只加载一次"""
+    from dashscope import get_tokenizer
+
+    return get_tokenizer('qwen-max')
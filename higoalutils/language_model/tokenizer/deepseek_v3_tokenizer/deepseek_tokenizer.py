@@ -12,16 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""DeepSeek V3 Tokenizer."""
+"""DeepSeek V3 Tokenizer（首次使用时才导入 transformers 并加载词表）。"""
 
-import sys
-from pyprojroot import here
-sys.path.append(str(here()))
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
 
-import transformers 
+chat_tokenizer_dir = str(Path(__file__).resolve().parent)
 
-chat_tokenizer_dir = "higoalutils/language_model/tokenizer/deepseek_v3_tokenizer"
 
-deepseek_tokenizer = transformers.AutoTokenizer.from_pretrained( # type: ignore
-    chat_tokenizer_dir, trust_remote_code=True
-)
+@lru_cache(maxsize=1)
+def load_deepseek_tokenizer() -> Any:
+    """加载 DeepSeek V3 Tokenizer，进程内只加载一次"""
+    import transformers
+
+    return transformers.AutoTokenizer.from_pretrained(  # type: ignore
+        chat_tokenizer_dir, trust_remote_code=True
+    )
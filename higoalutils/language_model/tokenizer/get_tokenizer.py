@@ -14,31 +14,128 @@
 
 """A module containing tokenizer fuctions."""
 
-import tiktoken
+import threading
+from typing import Any, Callable
 
 from higoalutils.config.enums.model_enums import TokenizerType
 from higoalutils.language_model.tokenizer.base import Tokenizer
-from higoalutils.language_model.tokenizer.deepseek_v3_tokenizer.deepseek_tokenizer import deepseek_tokenizer
-from higoalutils.language_model.tokenizer.dashscope_tokenizer.dashscope_tokenizer import dashscope_tokenizer
+
+
+# 进程内的 Tokenizer 注册表：每种编码只创建一次
+_TOKENIZERS: dict[str, Tokenizer] = {}
+_TOKENIZERS_LOCK = threading.Lock()
+
+
+def _load_deepseek() -> Any:
+    from higoalutils.language_model.tokenizer.deepseek_v3_tokenizer.deepseek_tokenizer import load_deepseek_tokenizer
+    return load_deepseek_tokenizer()
+
+
+def _load_dashscope() -> Any:
+    from higoalutils.language_model.tokenizer.dashscope_tokenizer.dashscope_tokenizer import load_dashscope_tokenizer
+    return load_dashscope_tokenizer()
+
+
+def _load_tiktoken(encoding_name: str) -> Any:
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
+
+
+# 编码名 -> 后端加载函数。后端（transformers、dashscope 等）在首次编码时才导入与加载，
+# 未注册的编码名按 tiktoken 编码处理
+_BACKENDS: dict[str, Callable[[], Any]] = {
+    TokenizerType.DeepSeekTokenizer: _load_deepseek,
+    TokenizerType.DashScopeTokenizer: _load_dashscope,
+}
+
+
+def register_tokenizer_backend(encoding_name: str, loader: Callable[[], Any]) -> None:
+    """
+    注册（或替换）一个 Tokenizer 后端。loader 返回带 encode/decode 方法的编码器，
+    只会在该编码首次被使用时调用一次
+    """
+    with _TOKENIZERS_LOCK:
+        _BACKENDS[encoding_name] = loader
+        _TOKENIZERS.pop(encoding_name, None)
 
 
 def get_tokenizer(encoding_name: str) -> Tokenizer:
-    """返回统一封装的 Tokenizer 实例，包括 encode/decode/count_tokens 方法"""
-    if encoding_name == TokenizerType.DeepSeekTokenizer:
-        enc = deepseek_tokenizer
-    elif encoding_name == TokenizerType.DashScopeTokenizer:
-        enc = dashscope_tokenizer
-    else:
-        enc = tiktoken.get_encoding(encoding_name)
+    """返回统一封装的 Tokenizer 实例（按编码名缓存），包括 encode/decode/count_tokens 及批量方法"""
+    tokenizer = _TOKENIZERS.get(encoding_name)
+    if tokenizer is not None:
+        return tokenizer
+    with _TOKENIZERS_LOCK:
+        tokenizer = _TOKENIZERS.get(encoding_name)
+        if tokenizer is None:
+            tokenizer = _create_tokenizer(encoding_name)
+            _TOKENIZERS[encoding_name] = tokenizer
+    return tokenizer
+
+
+def _create_tokenizer(encoding_name: str) -> Tokenizer:
+    loader = _BACKENDS.get(encoding_name) or (lambda: _load_tiktoken(encoding_name))
+    backend = _LazyBackend(loader)
 
     def encode(text: str) -> list[int]:
-        return enc.encode(str(text))
+        return backend.get().encode(str(text))
 
     def decode(tokens: list[int]) -> str:
-        return enc.decode(tokens)
+        return backend.get().decode(tokens)
 
     def count_tokens(text: str) -> int:
         return len(encode(text))
 
-    return Tokenizer(encode=encode, decode=decode, count_tokens=count_tokens)
+    def encode_batch(texts: list[str]) -> list[list[int]]:
+        return backend.encode_batch(texts, encode)
+
+    return Tokenizer(
+        encode=encode,
+        decode=decode,
+        count_tokens=count_tokens,
+        encode_batch=encode_batch,
+    )
+
+
+class _LazyBackend:
+    """首次使用时才加载的编码器"""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self._loader = loader
+        self._enc: Any = None
+        self._encode_batch: Callable[[list[str]], list[list[int]]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._enc is None:
+            with self._lock:
+                if self._enc is None:
+                    self._enc = self._loader()
+        return self._enc
+
+    def encode_batch(self, texts: list[str], encode: Callable[[str], list[int]]) -> list[list[int]]:
+        if self._encode_batch is None:
+            self._encode_batch = _batch_encoder(self.get(), encode)
+        return self._encode_batch(texts)
+
+
+def _batch_encoder(enc: Any, encode):
+    """
+    选择编码器原生的批量接口：tiktoken 的 encode_batch（多线程），
+    HF fast tokenizer 的 __call__（Rust端批量）；都不支持时逐条编码
+    """
+    if type(enc).__module__.startswith("tiktoken") and hasattr(enc, "encode_batch"):
+        def encode_batch(texts: list[str]) -> list[list[int]]:
+            return enc.encode_batch([str(text) for text in texts])
+        return encode_batch
+
+    if getattr(enc, "is_fast", False) and callable(enc):
+        def encode_batch(texts: list[str]) -> list[list[int]]:
+            if not texts:
+                return []
+            # 与 enc.encode(text) 保持一致（同样添加special tokens）
+            return enc([str(text) for text in texts])["input_ids"]
+        return encode_batch
 
+    def encode_batch(texts: list[str]) -> list[list[int]]:
+        return [encode(text) for text in texts]
+    return encode_batch
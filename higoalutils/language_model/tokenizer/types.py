@@ -20,4 +20,8 @@ TextTokenizerEncoder = Callable[[str], list[int]]
 
 TextTokenizerDecoder = Callable[[list[int]], str]
 
-TextTokenizerCounter = Callable[[str], int]
\ No newline at end of file
+TextTokenizerCounter = Callable[[str], int]
+
+TextTokenizerBatchEncoder = Callable[[list[str]], list[list[int]]]
+
+TextTokenizerBatchCounter = Callable[[list[str]], list[int]]
\ No newline at end of file
@@ -0,0 +1,49 @@
+# Copyright 2025 HiGoal Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from higoalutils.cache.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(base_dir=str(tmp_path), model_name="test-model", max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_rewrite_is_not_evicted_in_same_batch(cache):
+    """同批次覆盖的key不应被LRU淘汰，否则其槽位会被新key复用"""
+    cache.set_many({"a": [1.0, 1.0], "b": [2.0, 2.0]})
+    cache.set_many({"a": [3.0, 3.0], "c": [4.0, 4.0]})
+
+    assert cache.get_many(["a", "b", "c"], 2) == {"a": [3.0, 3.0], "c": [4.0, 4.0]}
+
+
+def test_get_many_matches_dim(cache):
+    """同一key在不同维度下的向量互不干扰"""
+    cache.set_many({"a": [1.0, 1.0]})
+    cache.set_many({"a": [1.0, 2.0, 3.0]})
+
+    assert cache.get_many(["a"], 2) == {"a": [1.0, 1.0]}
+    assert cache.get_many(["a"], 3) == {"a": [1.0, 2.0, 3.0]}
+    assert cache.get_many(["a"], 4) == {}
+
+
+def test_dims_lists_stored_dimensions(cache):
+    assert cache.dims() == []
+    cache.set_many({"a": [1.0, 1.0], "b": [1.0, 2.0, 3.0]})
+
+    assert cache.dims() == [2, 3]